@@ -0,0 +1,104 @@
+"""
+Concurrency scaling benchmark of the sync and async modes against the local Bitget stand-in (see `mock_bitget.py`).
+
+Compares throughput at several concurrency levels for:
+- `async`: MyBitget(asynchrony=True), concurrent tasks on one event loop;
+- `sync-inline`: MyBitget(asynchrony=False, sync_workers=0), blocking calls inside the event loop (the legacy behaviour);
+- `sync-offload`: MyBitget(asynchrony=False), blocking calls on the bounded thread pool;
+- `sync-facade`: MyBitgetSync called from plain threads.
+For the event loop modes it also reports the maximum event loop lag, i.e., how long other tasks were stalled.
+Run: python -m benchmarks.bench_concurrency --latency 0.01 --concurrency 1,8,32
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+import sys
+import time
+import asyncio
+import os.path
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from my_bitget import MyBitget, MyBitgetSync, SingleFlight, RateLimiter, RetryPolicy, CircuitBreaker
+from benchmarks.mock_bitget import MockBitget
+
+
+CREDENTIALS = {
+    'api_key': 'bg_0123456789abcdef0123456789abcdef',
+    'secret_key': '0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef',
+    'passphrase': 'passphrase',
+}
+OPTIONS = {
+    'single_flight': SingleFlight(enabled=False),
+    'rate_limiter': RateLimiter(enabled=False),
+    'retry_policy': RetryPolicy(max_attempts=1),
+    'circuit_breaker': CircuitBreaker(enabled=False),
+}
+
+
+async def measure_loop(client: MyBitget, requests: int, concurrency: int) -> Tuple[float, float]:
+    """Returns (elapsed seconds, maximum event loop lag in seconds)."""
+    remaining = requests
+    max_lag = 0.0
+    done = False
+
+    async def heartbeat() -> None:
+        nonlocal max_lag
+        while not done:
+            started_at = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, time.perf_counter() - started_at - 0.001)
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await client.SPOT_get_balance()
+
+    heartbeat_task = asyncio.ensure_future(heartbeat())
+    started_at = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started_at
+    done = True
+    await heartbeat_task
+    return elapsed, max_lag
+
+
+def measure_facade(client: MyBitgetSync, requests: int, concurrency: int) -> float:
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: client.SPOT_get_balance(), range(requests)))
+    return time.perf_counter() - started_at
+
+
+def main(args: argparse.Namespace) -> None:
+    mock = MockBitget(latency=args.latency, jitter=args.jitter)
+    print(f'{"mode":<14} {"conc":>5} {"calls":>6} {"rps":>10} {"max loop lag ms":>16}')
+    for concurrency in [int(value) for value in args.concurrency.split(',')]:
+        clients = {
+            'async': MyBitget(**CREDENTIALS, asynchrony=True, httpx_client=httpx.AsyncClient(transport=mock.async_transport()), **OPTIONS),
+            'sync-inline': MyBitget(**CREDENTIALS, asynchrony=False, sync_workers=0, httpx_client=httpx.Client(transport=mock.transport()), **OPTIONS),
+            'sync-offload': MyBitget(**CREDENTIALS, asynchrony=False, sync_workers=max(concurrency, 1), httpx_client=httpx.Client(transport=mock.transport()), **OPTIONS),
+        }
+        for mode, client in clients.items():
+            elapsed, max_lag = asyncio.run(measure_loop(client, args.requests, concurrency))
+            print(f'{mode:<14} {concurrency:>5} {args.requests:>6} {args.requests / elapsed:>10.1f} {max_lag * 1e3:>16.2f}')
+        with MyBitgetSync(**CREDENTIALS, httpx_client=httpx.AsyncClient(transport=mock.async_transport()), **OPTIONS) as facade:
+            elapsed = measure_facade(facade, args.requests, concurrency)
+        print(f'{"sync-facade":<14} {concurrency:>5} {args.requests:>6} {args.requests / elapsed:>10.1f} {"-":>16}')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', default='1,8,32', help='Comma-separated concurrency levels.')
+    parser.add_argument('--requests', type=int, default=200, help='Number of calls per mode and concurrency level.')
+    parser.add_argument('--latency', type=float, default=0.01, help='Injected response latency in seconds.')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Injected random latency in seconds (up to).')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main(parse_args())
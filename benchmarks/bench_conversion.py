@@ -0,0 +1,74 @@
+"""
+Offline benchmark of batch USD to native conversion against the local Bitget stand-in (see `mock_bitget.py`).
+
+Converts the same rows (amounts across dozens of coins and chains) one by one with `SPOT_convert_usd_to_native`
+and at once with `SPOT_convert_usd_to_native_batch` (NumPy is used if installed), checks that the results agree,
+and reports the time and the number of HTTP requests of both ways.
+Run: python -m benchmarks.bench_conversion --rows 20000 --coins 40
+"""
+import sys
+import time
+import random
+import asyncio
+import os.path
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from my_bitget import MyBitget, RateLimiter
+from my_bitget.candles import get_numpy
+from benchmarks.mock_bitget import MockBitget
+
+
+async def main(rows: int, coins: int) -> None:
+    mock = MockBitget(coins=max(coins, 10))
+    client = MyBitget(
+        'key', 'secret', 'passphrase',
+        asynchrony=True,
+        rate_limiter=RateLimiter(enabled=False),
+        httpx_client=httpx.AsyncClient(transport=mock.async_transport()),
+        price_snapshot_ttl=60.0,
+    )
+    rnd = random.Random(0)
+    tickers = [rnd.choice(['BTC', 'ETH', 'USDC', 'BNB', 'SOL'] + [f'C{i:04d}' for i in range(coins - 5)]) for _ in range(rows)]
+    chains = [mock.get_chain(ticker) for ticker in tickers]
+    amounts = [round(rnd.uniform(1, 5000), 2) for _ in range(rows)]
+
+    await client.PUBLIC_get_price_snapshot()
+    # NumPy is imported on first use, so the import is kept out of the measurement
+    get_numpy()
+    requests_before = sum(mock.requests.values())
+    started_at = time.perf_counter()
+    single = [await client.SPOT_convert_usd_to_native(amount, ticker, chain) for amount, ticker, chain in zip(amounts, tickers, chains)]
+    single_time = time.perf_counter() - started_at
+    single_requests = sum(mock.requests.values()) - requests_before
+
+    client.metadata_cache.invalidate()
+    requests_before = sum(mock.requests.values())
+    started_at = time.perf_counter()
+    status, conversion = await client.SPOT_convert_usd_to_native_batch(amounts, tickers, chains, max_age=0)
+    batch_time = time.perf_counter() - started_at
+    batch_requests = sum(mock.requests.values()) - requests_before
+    assert status == 0, conversion
+    started_at = time.perf_counter()
+    await client.SPOT_convert_usd_to_native_batch(amounts, tickers, chains)
+    cached_time = time.perf_counter() - started_at
+
+    mismatches = sum(
+        1 for (single_status, value), native, error in zip(single, conversion.amounts, conversion.errors)
+        if (single_status == 0) != (error is None) or (error is None and abs(value - native) > 1e-12)
+    )
+    print(f'backend: {"numpy" if get_numpy() is not None else "decimal"}, rows: {rows}, coins: {coins}')
+    print(f'one by one  {single_time * 1000:9.1f} ms  {single_requests:6d} requests')
+    print(f'batch       {batch_time * 1000:9.1f} ms  {batch_requests:6d} requests  ({conversion.error_count} row errors, {mismatches} mismatches)')
+    print(f'batch warm  {cached_time * 1000:9.1f} ms       0 requests  (cached metadata and price snapshot)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--coins', type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.coins))
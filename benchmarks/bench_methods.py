@@ -0,0 +1,133 @@
+"""
+Offline benchmark of `MyBitget` methods against the local Bitget stand-in (see `mock_bitget.py`).
+
+Measures throughput and p50/p99 latency of every method in sync (asynchrony=False) and async modes
+at several concurrency levels. Caches, coalescing, rate limiting and retries are disabled by default,
+so the numbers show the cost of the request path itself.
+Run: python -m benchmarks.bench_methods --requests 200 --concurrency 1,8,32 --latency 0.005
+"""
+from typing import Any, Callable, Dict, List, Tuple
+
+import sys
+import time
+import asyncio
+import os.path
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from my_bitget import MyBitget, MetadataCache, SingleFlight, RateLimiter, RetryPolicy, CircuitBreaker
+from benchmarks.mock_bitget import MockBitget
+
+
+def get_cases(mock: MockBitget) -> Dict[str, Dict[str, Any]]:
+    chain = mock.get_chain('ETH')
+    return {
+        'PUBLIC_get_coin_info': {'ticker': 'ETH'},
+        'PUBLIC_get_chain_info': {'ticker': 'ETH', 'chain': chain},
+        'PUBLIC_get_symbol_info': {'ticker': 'ETH'},
+        'PUBLIC_get_ticker_info': {'ticker': 'ETH'},
+        'PUBLIC_get_price': {'ticker': 'ETH'},
+        'PUBLIC_get_price_snapshot': {'max_age': 0},
+        'SPOT_is_connected': {},
+        'SPOT_get_account_info': {},
+        'SPOT_get_balance': {},
+        'SPOT_convert_usd_to_native': {'amount': 100.0, 'ticker': 'ETH', 'chain': chain},
+        'SPOT_post_withdrawal': {'ticker': 'ETH', 'chain': chain, 'address': '0xB293cFf00bA3f110C839fBDB59186BD944B144D5', 'amount': 0.01},
+        'SPOT_get_withdrawal_records': {'time_start': '1700000000000'},
+        'SUBACCOUNT_get_subaccounts': {},
+        'SUBACCOUNT_get_snapshot': {},
+        'SUBACCOUNT_get_balance': {'subaccount_id': '6000000000'},
+        'SUBACCOUNT_transfer_to_main': {'subaccount_id': '6000000000', 'ticker': 'USDT', 'amount': '1'},
+    }
+
+
+def make_client(mock: MockBitget, asynchrony: bool, library_defaults: bool = False) -> MyBitget:
+    if asynchrony:
+        httpx_client = httpx.AsyncClient(transport=mock.async_transport())
+    else:
+        httpx_client = httpx.Client(transport=mock.transport())
+    kwargs = {}
+    if not library_defaults:
+        kwargs = {
+            'metadata_cache': MetadataCache(ttls={'coin': 0, 'chain': 0, 'symbol': 0}, default_ttl=0),
+            'price_snapshot_ttl': 0,
+            'subaccount_snapshot_ttl': 0,
+            'single_flight': SingleFlight(enabled=False),
+            'rate_limiter': RateLimiter(enabled=False),
+            'retry_policy': RetryPolicy(max_attempts=1),
+            'circuit_breaker': CircuitBreaker(enabled=False),
+        }
+    return MyBitget(
+        api_key='bg_0123456789abcdef0123456789abcdef',
+        secret_key='0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef',
+        passphrase='passphrase',
+        asynchrony=asynchrony,
+        httpx_client=httpx_client,
+        **kwargs,
+    )
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run_case(call: Callable[[], Any], requests: int, concurrency: int) -> Tuple[float, List[float], int]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started_at = time.perf_counter()
+            status, _ = await call()
+            latencies.append(time.perf_counter() - started_at)
+            if status != 0:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return time.perf_counter() - started_at, latencies, errors
+
+
+async def main(args: argparse.Namespace) -> None:
+    mock = MockBitget(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    cases = get_cases(mock)
+    methods = args.methods.split(',') if args.methods else list(cases)
+    print(f'{"method":<30} {"mode":<6} {"conc":>5} {"calls":>6} {"errors":>6} {"rps":>10} {"p50 ms":>9} {"p99 ms":>9}')
+    for mode in args.modes.split(','):
+        client = make_client(mock, asynchrony=(mode == 'async'), library_defaults=args.library_defaults)
+        for method in methods:
+            kwargs = cases[method]
+            call = lambda: getattr(client, method)(**kwargs)
+            await run_case(call, min(10, args.requests), 1)
+            for concurrency in [int(value) for value in args.concurrency.split(',')]:
+                elapsed, latencies, errors = await run_case(call, args.requests, concurrency)
+                print(
+                    f'{method:<30} {mode:<6} {concurrency:>5} {len(latencies):>6} {errors:>6} '
+                    f'{len(latencies) / elapsed:>10.1f} {percentile(latencies, 0.5) * 1e3:>9.2f} {percentile(latencies, 0.99) * 1e3:>9.2f}'
+                )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--methods', default='', help='Comma-separated methods (all by default).')
+    parser.add_argument('--modes', default='sync,async', help='Comma-separated modes: sync, async.')
+    parser.add_argument('--concurrency', default='1,8,32', help='Comma-separated concurrency levels.')
+    parser.add_argument('--requests', type=int, default=200, help='Number of calls per method, mode and concurrency level.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Injected response latency in seconds.')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Injected random latency in seconds (up to).')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with 503.')
+    parser.add_argument('--library-defaults', action='store_true', help='Keep caches, coalescing, rate limiting and retries enabled.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,117 @@
+"""
+Benchmark of the local order book on a synthetic recorded `books` stream (snapshot plus incremental updates with checksums).
+
+Compares the `OrderBook` (sorted price arrays with binary search) with a naive dict book sorted on every read,
+measures top-of-book and VWAP queries, and checks that a corrupted update is detected by the checksum.
+Run: python -m benchmarks.bench_orderbook
+"""
+from typing import Dict, List, Optional, Tuple
+
+import sys
+import time
+import random
+import timeit
+import os.path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from my_bitget import get_checksum, replay
+
+
+SYMBOL = 'BTCUSDT'
+
+
+class NaiveBook:
+    """Reference book: dicts of levels sorted on every read."""
+
+    def __init__(self, ):
+        self.bids: Dict[str, str] = {}
+        self.asks: Dict[str, str] = {}
+
+    def apply(self, data: dict) -> None:
+        for side, levels in ((self.bids, data.get('bids') or []), (self.asks, data.get('asks') or [])):
+            for price, size in levels:
+                if float(size) == 0:
+                    side.pop(price, None)
+                else:
+                    side[price] = size
+
+    def top(self, depth: int) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        bids = sorted(self.bids.items(), key=lambda level: -float(level[0]))[:depth]
+        asks = sorted(self.asks.items(), key=lambda level: float(level[0]))[:depth]
+        return bids, asks
+
+    def vwap(self, size: float) -> Optional[float]:
+        remaining, cost = size, 0.0
+        for price, amount in sorted(((float(price), float(amount)) for price, amount in self.asks.items())):
+            fill = min(amount, remaining)
+            cost += fill * price
+            remaining -= fill
+            if remaining <= 0:
+                return cost / size
+        return None
+
+
+def record_stream(levels: int = 400, updates: int = 20000, seed: int = 0) -> List[dict]:
+    """Generates a recorded stream: a snapshot and updates (new, changed and removed levels) with valid checksums."""
+    rnd = random.Random(seed)
+    reference = NaiveBook()
+    ticks = lambda count, start, step: [f'{(start + i * step) / 10:.1f}' for i in range(count)]
+    snapshot = {
+        'bids': [[price, f'{rnd.uniform(0.01, 5):.4f}'] for price in ticks(levels, 650000, -1)],
+        'asks': [[price, f'{rnd.uniform(0.01, 5):.4f}'] for price in ticks(levels, 650001, 1)],
+        'seq': 1,
+        'ts': '1700000000000',
+    }
+    reference.apply(snapshot)
+    snapshot['checksum'] = get_checksum(*reference.top(25))
+    messages = [{'action': 'snapshot', 'arg': {'instType': 'SPOT', 'channel': 'books', 'instId': SYMBOL}, 'data': [snapshot]}]
+    for seq in range(2, updates + 2):
+        data = {'bids': [], 'asks': [], 'seq': seq, 'pseq': seq - 1, 'ts': str(1700000000000 + seq)}
+        for _ in range(rnd.randint(1, 4)):
+            side = rnd.choice(('bids', 'asks'))
+            offset = rnd.randint(0, levels + 50)
+            price = f'{(650000 - offset if side == "bids" else 650001 + offset) / 10:.1f}'
+            size = '0' if rnd.random() < 0.3 else f'{rnd.uniform(0.01, 5):.4f}'
+            data[side].append([price, size])
+        reference.apply(data)
+        data['checksum'] = get_checksum(*reference.top(25))
+        messages.append({'action': 'update', 'arg': messages[0]['arg'], 'data': [data]})
+    return messages
+
+
+def main(levels: int = 400, updates: int = 20000) -> None:
+    messages = record_stream(levels, updates)
+
+    started_at = time.perf_counter()
+    book = replay(messages)[SYMBOL]
+    elapsed = time.perf_counter() - started_at
+    print(f'OrderBook replay   {updates / elapsed:10.0f} updates/s  (synced={book.synced}, mismatches={book.mismatches})')
+
+    naive = NaiveBook()
+    started_at = time.perf_counter()
+    for message in messages:
+        for data in message['data']:
+            naive.apply(data)
+            if 'checksum' in data and get_checksum(*naive.top(25)) != data['checksum']:
+                raise RuntimeError('Reference book is broken!')
+    elapsed = time.perf_counter() - started_at
+    print(f'naive replay       {updates / elapsed:10.0f} updates/s')
+
+    number = 20000
+    best = min(timeit.repeat(lambda: (book.best_bid(), book.best_ask()), number=number, repeat=5)) / number
+    print(f'OrderBook top      {best * 1e6:10.2f} us')
+    best = min(timeit.repeat(lambda: book.vwap('buy', 50.0), number=number, repeat=5)) / number
+    print(f'OrderBook vwap(50) {best * 1e6:10.2f} us')
+    best = min(timeit.repeat(lambda: naive.vwap(50.0), number=200, repeat=3)) / 200
+    print(f'naive vwap(50)     {best * 1e6:10.2f} us')
+    assert abs(book.vwap('buy', 50.0) - naive.vwap(50.0)) < 1e-6
+
+    corrupted = record_stream(levels, 100)
+    corrupted[50]['data'][0]['asks'].append(['65000.2', '9.9999'])
+    book = replay(corrupted)[SYMBOL]
+    print(f'corrupted stream   synced={book.synced}, mismatches={book.mismatches}')
+
+
+if __name__ == '__main__':
+    main()
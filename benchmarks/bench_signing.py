@@ -0,0 +1,75 @@
+"""
+Micro-benchmark of the per-request preparation overhead (body encoding, signing and headers).
+
+Compares the legacy request preparation (the body is encoded for the signature and encoded once again by httpx,
+the HMAC key and the headers are rebuilt on every call) with the current one (`MyBitget._httpx_attempt` path).
+Run: python -m benchmarks.bench_signing
+"""
+from typing import Callable
+
+import sys
+import hmac
+import json
+import time
+import base64
+import timeit
+import os.path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from my_bitget import MyBitget
+
+
+API_KEY = 'bg_0123456789abcdef0123456789abcdef'
+SECRET_KEY = '0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef'
+PASSPHRASE = 'passphrase'
+ENDPOINT = '/api/v2/spot/wallet/withdrawal'
+BODY = {
+    'coin': 'ETH',
+    'transferType': 'on_chain',
+    'address': '0xB293cFf00bA3f110C839fBDB59186BD944B144D5',
+    'chain': 'BASE',
+    'size': 0.01,
+}
+
+
+def legacy_prepare(method: str, endpoint: str, body: dict) -> dict:
+    timestamp = str(int(time.time() * 1000))
+    message = str(timestamp) + str.upper(method) + endpoint + json.dumps(body, separators=(',', ':'))
+    mac = hmac.new(bytes(SECRET_KEY, encoding='utf-8'), bytes(message, encoding='utf-8'), digestmod='sha256')
+    signature = str(base64.b64encode(mac.digest()), 'utf8')
+    headers = {
+        'ACCESS-KEY': API_KEY,
+        'ACCESS-SIGN': signature,
+        'ACCESS-PASSPHRASE': PASSPHRASE,
+        'ACCESS-TIMESTAMP': timestamp,
+        'locale': 'en-US',
+        'Content-Type': 'application/json',
+    }
+    # httpx encodes `json=body` once again (with default separators, so the sent bytes differ from the signed ones)
+    content = json.dumps(body).encode('utf-8')
+    return {'headers': headers, 'content': content}
+
+
+def current_prepare(client: MyBitget, method: str, endpoint: str, body: dict) -> dict:
+    payload = json.dumps(body, separators=(',', ':'))
+    content = payload.encode('utf-8')
+    headers = client._get_headers(method, endpoint, payload)
+    return {'headers': headers, 'content': content}
+
+
+def measure(name: str, func: Callable[[], dict], number: int, repeat: int) -> float:
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f'{name:<10} {best * 1e6:8.2f} us/request')
+    return best
+
+
+def main(number: int = 50000, repeat: int = 5) -> None:
+    client = MyBitget(api_key=API_KEY, secret_key=SECRET_KEY, passphrase=PASSPHRASE)
+    legacy = measure('legacy', lambda: legacy_prepare('POST', ENDPOINT, BODY), number, repeat)
+    current = measure('current', lambda: current_prepare(client, 'POST', ENDPOINT, BODY), number, repeat)
+    print(f'speedup    {legacy / current:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Startup benchmark of short-lived workers against the local Bitget stand-in (see `mock_bitget.py`) served over a local socket.
+
+Every run is a fresh interpreter which imports `my_bitget`, constructs `MyBitget` and makes one public and one signed request,
+and reports the import time, the construction time and the time to the first response, and also the time to the first
+response of a second client (another account) of the same process, which reuses the shared SSL context. Compares:
+- `lazy`: the default (httpx is imported and the httpx client is created by the first request);
+- `eager`: httpx imported with the package and the client created in the constructor (the legacy behaviour, emulated by `open`).
+Run: python -m benchmarks.bench_startup --runs 20
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Union
+
+import sys
+import statistics
+import threading
+import subprocess
+import os.path
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.mock_bitget import MockBitget
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = '''
+import sys
+import time
+started_at = time.perf_counter()
+sys.path.insert(0, {root!r})
+if {eager!r}:
+    import httpx
+import asyncio
+import my_bitget
+imported_at = time.perf_counter()
+client = my_bitget.MyBitget('key', 'secret', 'passphrase', asynchrony=True, rate_limiter=my_bitget.RateLimiter(enabled=False))
+if {eager!r}:
+    client.open()
+constructed_at = time.perf_counter()
+deferred = 'httpx' not in sys.modules
+client.host = {host!r}
+
+async def main():
+    async with client:
+        status, result = await client.PUBLIC_get_coin_info('BTC')
+        assert status == 0, result
+        first_at = time.perf_counter()
+        status, result = await client.SPOT_get_account_info()
+        assert status == 0, result
+    second_started_at = time.perf_counter()
+    async with my_bitget.MyBitget('key2', 'secret', 'passphrase', asynchrony=True, rate_limiter=client.rate_limiter) as second:
+        second.host = client.host
+        status, result = await second.PUBLIC_get_coin_info('ETH')
+        assert status == 0, result
+        return first_at, time.perf_counter() - second_started_at
+
+first_at, second = asyncio.run(main())
+print(imported_at - started_at, constructed_at - imported_at, first_at - constructed_at, second, deferred)
+'''
+
+
+def serve(mock: MockBitget) -> ThreadingHTTPServer:
+    """Serves the mock on a free local port in a background thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _handle(self, ) -> None:
+            content = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            request = httpx.Request(self.command, f'https://{mock.host}{self.path}', headers=dict(self.headers), content=content)
+            response = mock.handle(request)
+            self.send_response(response.status_code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(response.content)))
+            self.end_headers()
+            self.wfile.write(response.content)
+
+        do_GET = do_POST = _handle
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_worker(host: str, eager: bool) -> Dict[str, Union[float, bool]]:
+    output = subprocess.run(
+        [sys.executable, '-c', WORKER.format(root=ROOT, eager=eager, host=host)],
+        check=True, capture_output=True, text=True,
+    ).stdout.split()
+    return {
+        'import': float(output[0]),
+        'construct': float(output[1]),
+        'first': float(output[2]),
+        'second': float(output[3]),
+        'deferred': output[4] == 'True',
+    }
+
+
+def main(runs: int) -> None:
+    server = serve(MockBitget(coins=50, subaccounts=5))
+    host = f'http://127.0.0.1:{server.server_address[1]}'
+    print(f'runs: {runs} (medians, ms)')
+    print(f'{"mode":<6}{"import":>10}{"construct":>12}{"first request":>15}{"total":>10}{"2nd client":>12}  httpx deferred')
+    for mode, eager in (('lazy', False), ('eager', True)):
+        results = [run_worker(host, eager) for _ in range(runs)]
+        medians = {key: statistics.median(result[key] for result in results) * 1000 for key in ('import', 'construct', 'first', 'second')}
+        print(
+            f'{mode:<6}{medians["import"]:10.1f}{medians["construct"]:12.2f}{medians["first"]:15.1f}'
+            f'{medians["import"] + medians["construct"] + medians["first"]:10.1f}{medians["second"]:12.1f}'
+            f'  {all(result["deferred"] for result in results)}'
+        )
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+    main(args.runs)
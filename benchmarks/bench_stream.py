@@ -0,0 +1,71 @@
+"""
+Scenario benchmark of `TickerStream` against the local WebSocket stand-in (see `mock_stream.py`; requires `websockets`).
+
+Runs and checks the connection lifecycle:
+- subscribe: time until all tickers are subscribed and present in the `PriceBook`, and the ticker update throughput;
+- heartbeat: a silent connection is kept alive by ping/pong;
+- drop: the server closes the connection, the stream reconnects and resubscribes all tickers;
+- pong timeout: the server stops answering pings, the stream detects the dead connection and reconnects.
+Run: python -m benchmarks.bench_stream --tickers 200
+"""
+import sys
+import time
+import asyncio
+import os.path
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from my_bitget import TickerStream
+from benchmarks.mock_stream import MockStream, wait_for
+
+
+async def main(tickers: int, rounds: int) -> None:
+    mock = MockStream()
+    url = await mock.start()
+    names = [f'C{i:04d}' for i in range(tickers)]
+    stream = TickerStream(names, url=url, ping_interval=0.2, pong_timeout=0.2, reconnect_delay=0.05)
+    await stream.start()
+    try:
+        elapsed = await wait_for(lambda: len(mock.get_subscriptions()) == tickers)
+        await mock.publish_tickers()
+        elapsed += await wait_for(lambda: len(stream.book) == tickers)
+        print(f'subscribe     {tickers} tickers subscribed and priced in {elapsed * 1000:.1f} ms')
+
+        updates = stream.book.updates
+        started_at = time.perf_counter()
+        sent = await mock.publish_tickers(rounds)
+        await wait_for(lambda: stream.book.updates - updates >= sent, timeout=30.0)
+        print(f'throughput    {sent / (time.perf_counter() - started_at):10.0f} ticker updates/s')
+
+        pings = mock.pings
+        await asyncio.sleep(0.7)
+        assert stream.is_connected and stream.connects == 1 and mock.pings > pings
+        print(f'heartbeat     {mock.pings - pings} pings answered, connection kept ({stream.connects} connect)')
+
+        await mock.drop()
+        await wait_for(lambda: not stream.is_connected, timeout=1.0)
+        elapsed = await wait_for(lambda: stream.is_connected and len(mock.get_subscriptions()) == tickers)
+        updates = stream.book.updates
+        await mock.publish_tickers()
+        await wait_for(lambda: stream.book.updates - updates >= tickers)
+        print(f'drop          reconnected and resubscribed {tickers} tickers in {elapsed * 1000:.1f} ms ({stream.connects} connects)')
+
+        mock.answer_pings = False
+        started_at = time.perf_counter()
+        await wait_for(lambda: stream.connects == 3, timeout=5.0)
+        elapsed = time.perf_counter() - started_at
+        mock.answer_pings = True
+        await wait_for(lambda: stream.is_connected and len(mock.get_subscriptions()) == tickers)
+        print(f'pong timeout  dead connection replaced in {elapsed * 1000:.1f} ms ({stream.connects} connects)')
+    finally:
+        await stream.stop()
+        await mock.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.tickers, args.rounds))
@@ -0,0 +1,397 @@
+"""
+Local stand-in for the Bitget REST endpoints used by `MyBitget`, plugged into httpx as a transport.
+
+Payloads are generated once with realistic sizes (about 1500 coins, symbols and tickers, 200 subaccounts),
+and every request can be delayed (latency and jitter) or failed (error rate, 5xx responses or transport errors).
+"""
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+import json
+import time
+import random
+import asyncio
+import httpx
+
+
+class MockBitget:
+    host = 'api.bitget.com'
+
+    def __init__(
+            self,
+            coins: int = 1500,
+            subaccounts: int = 200,
+            withdrawal_records: int = 100,
+            history_records: int = 5000,
+            history_days: int = 180,
+            listing_days: int = 365,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            transport_error_rate: float = 0.0,
+            seed: int = 0,
+    ):
+        """
+        :param coins: Number of coins (and USDT symbols and tickers).
+        :param subaccounts: Number of subaccounts.
+        :param withdrawal_records: Number of withdrawal records returned per page.
+        :param history_records: Number of records of every paged history endpoint (deposits, bills and transfers).
+        :param history_days: Period in days (up to now) covered by the paged history records.
+        :param listing_days: Number of days (up to now) with candles of every symbol.
+        :param latency: Delay in seconds added to every response.
+        :param jitter: Random delay in seconds (up to) added to the latency.
+        :param error_rate: Share of requests answered with a 503 response.
+        :param transport_error_rate: Share of requests failed with a connection error.
+        :param seed: Random seed for payloads and injected failures.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.transport_error_rate = transport_error_rate
+        self.requests: Dict[str, int] = {}
+        self.orders: Dict[str, dict] = {}
+        self.withdrawals: Dict[str, dict] = {}
+        self.listed_at = int(time.time() * 1000) - listing_days * 24 * 60 * 60 * 1000
+        self._random = random.Random(seed)
+        self._payloads = self._build_payloads(coins, subaccounts, withdrawal_records)
+        self._history = self._build_history(history_records, history_days)
+        self._routes: Dict[str, Callable[[httpx.Request, dict], Tuple[int, bytes]]] = {
+            '/api/v2/spot/public/coins': self._coins,
+            '/api/v2/spot/public/symbols': self._symbols,
+            '/api/v2/spot/market/tickers': self._tickers,
+            '/api/v2/spot/market/history-candles': self._history_candles,
+            '/api/v2/spot/market/orderbook': self._orderbook,
+            '/api/v2/spot/account/info': self._static('account_info'),
+            '/api/v2/spot/account/assets': self._static('assets'),
+            '/api/v2/spot/wallet/withdrawal': self._withdrawal,
+            '/api/v2/spot/wallet/withdrawal-records': self._withdrawal_records,
+            '/api/v2/spot/wallet/deposit-records': self._records('deposits', 'orderId', 100),
+            '/api/v2/spot/account/bills': self._records('bills', 'billId', 500),
+            '/api/v2/spot/account/transferRecords': self._records('transfers', 'transferId', 500),
+            '/api/v2/user/virtual-subaccount-list': self._static('subaccounts'),
+            '/api/v2/spot/account/subaccount-assets': self._subaccount_assets,
+            '/api/v2/spot/wallet/subaccount-transfer': self._subaccount_transfer,
+            '/api/v2/spot/trade/place-order': self._place_order,
+            '/api/v2/spot/trade/batch-orders': self._batch_orders,
+            '/api/v2/spot/trade/cancel-order': self._cancel_order,
+            '/api/v2/spot/trade/batch-cancel-order': self._batch_cancel_order,
+            '/api/v2/spot/trade/orderInfo': self._order_info,
+            '/api/v2/spot/trade/unfilled-orders': self._unfilled_orders,
+        }
+
+    def get_chain(self, ticker: str) -> str:
+        """Returns the name of the first chain of the coin (useful for chain-specific methods)."""
+        return self._payloads['coins'][ticker]['chains'][0]['chain']
+
+    def transport(self, ) -> httpx.BaseTransport:
+        return _SyncTransport(self)
+
+    def async_transport(self, ) -> httpx.AsyncBaseTransport:
+        return _AsyncTransport(self)
+
+    def get_delay(self, ) -> float:
+        return self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests[path] = self.requests.get(path, 0) + 1
+        if self.transport_error_rate and self._random.random() < self.transport_error_rate:
+            raise httpx.ConnectError('Injected connection error', request=request)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._response(503, json.dumps({'code': '50001', 'msg': 'Injected error'}).encode())
+        route = self._routes.get(path)
+        if route is None:
+            return self._response(404, json.dumps({'code': '40404', 'msg': 'Request URL NOT FOUND'}).encode())
+        status_code, content = route(request, {key: values[0] for key, values in parse_qs(request.url.query.decode()).items()})
+        return self._response(status_code, content)
+
+    @staticmethod
+    def _response(status_code: int, content: bytes) -> httpx.Response:
+        return httpx.Response(status_code, content=content, headers={'Content-Type': 'application/json'})
+
+    @staticmethod
+    def _envelope(data) -> bytes:
+        return json.dumps({'code': '00000', 'msg': 'success', 'requestTime': int(time.time() * 1000), 'data': data}, separators=(',', ':')).encode()
+
+    def _build_payloads(self, coins: int, subaccounts: int, withdrawal_records: int) -> dict:
+        rnd = self._random
+        names = ['BTC', 'ETH', 'USDC', 'BNB', 'SOL'] + [f'C{i:04d}' for i in range(max(0, coins - 5))]
+        chain_names = ['ETH', 'ArbitrumOne', 'BASE', 'BEP20', 'Optimism', 'Polygon', 'zkSyncEra', 'C-Chain']
+        coin_list = []
+        for i, name in enumerate(names):
+            coin_list.append({
+                'coinId': str(i + 1),
+                'coin': name,
+                'transfer': 'true',
+                'chains': [
+                    {
+                        'chain': chain,
+                        'needTag': 'false',
+                        'withdrawable': 'true',
+                        'rechargeable': 'true',
+                        'withdrawFee': f'{rnd.uniform(0.0001, 1):.6f}',
+                        'extraWithdrawFee': '0',
+                        'depositConfirm': '12',
+                        'withdrawConfirm': '64',
+                        'minDepositAmount': '0.0001',
+                        'minWithdrawAmount': '0.001',
+                        'browserUrl': 'https://etherscan.io/tx/',
+                        'contractAddress': f'0x{rnd.getrandbits(160):040x}',
+                        'withdrawStep': '0',
+                        'withdrawMinScale': str(rnd.choice([4, 6, 8])),
+                        'congestion': 'normal',
+                    }
+                    for chain in rnd.sample(chain_names, rnd.randint(1, 5))
+                ],
+            })
+        symbol_list = [
+            {
+                'symbol': f'{coin["coin"]}USDT', 'baseCoin': coin['coin'], 'quoteCoin': 'USDT',
+                'minTradeAmount': '0', 'maxTradeAmount': '10000000000', 'takerFeeRate': '0.002', 'makerFeeRate': '0.002',
+                'pricePrecision': '4', 'quantityPrecision': '4', 'quotePrecision': '6', 'status': 'online',
+                'minTradeUSDT': '1', 'buyLimitPriceRatio': '0.05', 'sellLimitPriceRatio': '0.05',
+            }
+            for coin in coin_list
+        ]
+        ticker_list = []
+        for coin in coin_list:
+            price = rnd.uniform(0.01, 70000)
+            ticker_list.append({
+                'symbol': f'{coin["coin"]}USDT', 'high24h': f'{price * 1.05:.4f}', 'open': f'{price * 0.98:.4f}',
+                'lastPr': f'{price:.4f}', 'low24h': f'{price * 0.95:.4f}', 'quoteVolume': f'{rnd.uniform(1e3, 1e9):.2f}',
+                'baseVolume': f'{rnd.uniform(1, 1e6):.4f}', 'usdtVolume': f'{rnd.uniform(1e3, 1e9):.2f}',
+                'bidPr': f'{price * 0.9999:.4f}', 'askPr': f'{price * 1.0001:.4f}', 'bidSz': '1.5', 'askSz': '2.5',
+                'openUtc': f'{price:.4f}', 'ts': str(int(time.time() * 1000)), 'changeUtc24h': '0.01', 'change24h': '0.02',
+            })
+        uids = [str(6000000000 + i) for i in range(subaccounts)]
+        return {
+            'coins': {coin['coin']: coin for coin in coin_list},
+            'coins_all': self._envelope(coin_list),
+            'symbols': {symbol['symbol']: symbol for symbol in symbol_list},
+            'symbols_all': self._envelope(symbol_list),
+            'tickers': {ticker['symbol']: ticker for ticker in ticker_list},
+            'tickers_all': self._envelope(ticker_list),
+            'account_info': self._envelope({'userId': '5000000000', 'inviterId': None, 'ips': '', 'authorities': ['stow', 'wtrade'], 'parentId': 0, 'traderType': 'normal', 'channelCode': '', 'channel': '', 'regisTime': '1700000000000'}),
+            'assets': self._envelope([
+                {'coin': coin['coin'], 'available': f'{rnd.uniform(0, 1000):.8f}', 'frozen': '0', 'locked': '0', 'limitAvailable': '0', 'uTime': '1700000000000'}
+                for coin in coin_list[:20]
+            ]),
+            'withdrawal_records': self._envelope([
+                {'orderId': str(1200000000000000000 + i), 'tradeId': f'0x{rnd.getrandbits(256):064x}', 'coin': 'ETH', 'dest': 'on_chain', 'clientOid': None,
+                 'type': 'withdraw', 'tag': '', 'size': '0.01', 'fee': '-0.0001', 'status': rnd.choice(['success', 'pending']),
+                 'toAddress': f'0x{rnd.getrandbits(160):040x}', 'fromAddress': '', 'confirm': '12', 'chain': 'BASE',
+                 'cTime': '1700000000000', 'uTime': '1700000000000'}
+                for i in range(withdrawal_records)
+            ]),
+            'subaccounts': self._envelope({'endId': uids[-1] if uids else None, 'subAccountList': [
+                {'subAccountUid': uid, 'subAccountName': f'sub{uid}@virtual-bitget.com', 'status': 'normal', 'label': '', 'permList': ['read'], 'cTime': '1700000000000', 'uTime': '1700000000000'}
+                for uid in uids
+            ]}),
+            'subaccount_assets': [
+                {'id': str(100000 + i), 'userId': uid, 'assetsList': [
+                    {'coin': coin, 'available': f'{rnd.uniform(0, 100):.6f}', 'frozen': '0', 'locked': '0', 'uTime': '1700000000000'}
+                    for coin in ('USDT', 'USDC', 'ETH')
+                ]}
+                for i, uid in enumerate(uids)
+            ],
+        }
+
+    def _build_history(self, records: int, days: int) -> Dict[str, list]:
+        rnd = self._random
+        now = int(time.time() * 1000)
+        period = days * 24 * 60 * 60 * 1000
+
+        def build(id_field: str, extra: Callable[[], dict]) -> list:
+            # Newest first, as returned by Bitget
+            times = sorted((now - rnd.randrange(period) for _ in range(records)), reverse=True)
+            return [{id_field: str(1300000000000000000 - i), 'coin': 'USDT', 'size': f'{rnd.uniform(1, 1000):.4f}', 'cTime': str(ts), **extra()} for i, ts in enumerate(times)]
+
+        return {
+            'deposits': build('orderId', lambda: {'type': 'deposit', 'status': 'success', 'chain': 'BASE'}),
+            'bills': build('billId', lambda: {'groupType': rnd.choice(['deposit', 'withdraw', 'transfer']), 'businessType': 'deposit', 'balance': '100'}),
+            'transfers': build('transferId', lambda: {'fromType': 'spot', 'toType': 'usdt_futures', 'status': 'Successful'}),
+        }
+
+    @staticmethod
+    def _page(records: list, id_field: str, params: dict, max_limit: int) -> list:
+        start = int(params.get('startTime', 0))
+        end = int(params.get('endTime', 2 ** 62))
+        id_less_than = int(params['idLessThan']) if ('idLessThan' in params) else None
+        limit = min(int(params.get('limit', max_limit)), max_limit)
+        page = []
+        for record in records:
+            if start <= int(record['cTime']) <= end and (id_less_than is None or int(record[id_field]) < id_less_than):
+                page.append(record)
+                if len(page) == limit:
+                    break
+        return page
+
+    def _records(self, name: str, id_field: str, max_limit: int) -> Callable[[httpx.Request, dict], Tuple[int, bytes]]:
+        return lambda request, params: (200, self._envelope(self._page(self._history[name], id_field, params, max_limit)))
+
+    def _withdrawal_records(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        # Single page of withdrawals (the tracker looks them up by orderId)
+        if 'clientOid' in params:
+            record = self.withdrawals.get(params['clientOid'])
+            return 200, self._envelope([] if (record is None) else [record])
+        if 'idLessThan' in params:
+            return 200, self._envelope([])
+        return 200, self._payloads['withdrawal_records']
+
+    def _static(self, name: str) -> Callable[[httpx.Request, dict], Tuple[int, bytes]]:
+        return lambda request, params: (200, self._payloads[name])
+
+    def _coins(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        if 'coin' not in params:
+            return 200, self._payloads['coins_all']
+        coin = self._payloads['coins'].get(params['coin'])
+        return 200, self._envelope([] if (coin is None) else [coin])
+
+    def _symbols(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        if 'symbol' not in params:
+            return 200, self._payloads['symbols_all']
+        symbol = self._payloads['symbols'].get(params['symbol'])
+        return 200, self._envelope([] if (symbol is None) else [symbol])
+
+    def _tickers(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        if 'symbol' not in params:
+            return 200, self._payloads['tickers_all']
+        ticker = self._payloads['tickers'].get(params['symbol'])
+        if ticker is None:
+            return 400, json.dumps({'code': '40034', 'msg': 'Parameter does not exist'}).encode()
+        return 200, self._envelope([ticker])
+
+    def _orderbook(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        ticker = self._payloads['tickers'].get(params.get('symbol'))
+        if ticker is None:
+            return 400, json.dumps({'code': '40034', 'msg': 'Parameter does not exist'}).encode()
+        bid, ask = float(ticker['bidPr']), float(ticker['askPr'])
+        limit = min(int(params.get('limit', 100)), 150)
+        return 200, self._envelope({
+            'bids': [[f'{bid * (1 - i * 0.0001):.4f}', f'{1 + i % 7:.4f}'] for i in range(limit)],
+            'asks': [[f'{ask * (1 + i * 0.0001):.4f}', f'{1 + i % 5:.4f}'] for i in range(limit)],
+            'ts': str(int(time.time() * 1000)),
+        })
+
+    def _history_candles(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        # Deterministic candles (the price depends on the symbol and the candle time only), oldest first
+        steps = {'1min': 60_000, '5min': 300_000, '15min': 900_000, '1h': 3_600_000, '4h': 14_400_000, '1day': 86_400_000}
+        step = steps.get(params.get('granularity'))
+        if step is None or params.get('symbol') not in self._payloads['symbols']:
+            return 400, json.dumps({'code': '40034', 'msg': 'Parameter does not exist'}).encode()
+        limit = min(int(params.get('limit', 100)), 200)
+        last = int(params.get('endTime', time.time() * 1000)) // step * step
+        first = max(last - (limit - 1) * step, -(-self.listed_at // step) * step)
+        seed = sum(map(ord, params['symbol']))
+        candles = []
+        for ts in range(first, last + 1, step):
+            price = 100 + seed % 50 + (ts // step) % 97 / 10
+            candles.append([str(ts), f'{price:.4f}', f'{price * 1.01:.4f}', f'{price * 0.99:.4f}', f'{price + 0.05:.4f}', '12.5', f'{price * 12.5:.4f}', f'{price * 12.5:.4f}'])
+        return 200, self._envelope(candles)
+
+    def _withdrawal(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        body = json.loads(request.content or b'{}')
+        client_oid = body.get('clientOid')
+        if client_oid is not None and client_oid in self.withdrawals:
+            return 400, json.dumps({'code': '43118', 'msg': 'Duplicate clientOid'}).encode()
+        order_id = str(self._random.getrandbits(60))
+        if client_oid is not None:
+            self.withdrawals[client_oid] = {'orderId': order_id, 'clientOid': client_oid, 'coin': body.get('coin'), 'chain': body.get('chain'),
+                                            'size': body.get('size'), 'toAddress': body.get('address'), 'status': 'pending', 'cTime': str(int(time.time() * 1000))}
+        return 200, self._envelope({'orderId': order_id, 'clientOid': client_oid})
+
+    def _subaccount_assets(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        assets = self._payloads['subaccount_assets']
+        limit = int(params.get('limit', 10))
+        if 'idLessThan' in params:
+            id_less_than = int(params['idLessThan'])
+            assets = [subaccount for subaccount in assets if int(subaccount['id']) < id_less_than]
+        assets = sorted(assets, key=lambda subaccount: -int(subaccount['id']))[:limit]
+        return 200, self._envelope(assets)
+
+    def _subaccount_transfer(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        body = json.loads(request.content or b'{}')
+        return 200, self._envelope({'transferId': str(self._random.getrandbits(60)), 'clientOid': body.get('clientOid')})
+
+    def _new_order(self, symbol: str, order: dict) -> Tuple[Optional[dict], Optional[str]]:
+        # Orders with a non-positive size are rejected, like Bitget does for orders below the minimum amount
+        if symbol not in self._payloads['symbols']:
+            return None, 'Parameter symbol does not exist'
+        if float(order.get('size') or 0) <= 0:
+            return None, 'The order amount is below the minimum'
+        order_id = str(self._random.getrandbits(60))
+        self.orders[order_id] = {'orderId': order_id, 'clientOid': order.get('clientOid') or order_id, 'symbol': symbol, 'status': 'live', **order}
+        return self.orders[order_id], None
+
+    def _place_order(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        body = json.loads(request.content or b'{}')
+        order, error = self._new_order(body.get('symbol'), body)
+        if order is None:
+            return 400, json.dumps({'code': '43027', 'msg': error}).encode()
+        return 200, self._envelope({'orderId': order['orderId'], 'clientOid': order['clientOid']})
+
+    def _batch_orders(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        body = json.loads(request.content or b'{}')
+        if len(body.get('orderList') or []) > 50:
+            return 400, json.dumps({'code': '40020', 'msg': 'Parameter orderList error'}).encode()
+        success, failure = [], []
+        for item in body['orderList']:
+            order, error = self._new_order(body.get('symbol'), item)
+            if order is None:
+                failure.append({'orderId': '', 'clientOid': item.get('clientOid'), 'errorMsg': error, 'errorCode': '43027'})
+            else:
+                success.append({'orderId': order['orderId'], 'clientOid': order['clientOid']})
+        return 200, self._envelope({'successList': success, 'failureList': failure})
+
+    def _find_order(self, item: dict) -> Optional[dict]:
+        if item.get('orderId') in self.orders:
+            return self.orders[item['orderId']]
+        return next((order for order in self.orders.values() if item.get('clientOid') and order['clientOid'] == item['clientOid']), None)
+
+    def _cancel_order(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        order = self._find_order(json.loads(request.content or b'{}'))
+        if order is None:
+            return 400, json.dumps({'code': '43001', 'msg': 'The order does not exist'}).encode()
+        order['status'] = 'cancelled'
+        return 200, self._envelope({'orderId': order['orderId'], 'clientOid': order['clientOid']})
+
+    def _batch_cancel_order(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        success, failure = [], []
+        for item in json.loads(request.content or b'{}').get('orderList') or []:
+            order = self._find_order(item)
+            if order is None:
+                failure.append({**item, 'errorMsg': 'The order does not exist', 'errorCode': '43001'})
+            else:
+                order['status'] = 'cancelled'
+                success.append({'orderId': order['orderId'], 'clientOid': order['clientOid']})
+        return 200, self._envelope({'successList': success, 'failureList': failure})
+
+    def _order_info(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        order = self._find_order(params)
+        return 200, self._envelope([] if (order is None) else [order])
+
+    def _unfilled_orders(self, request: httpx.Request, params: dict) -> Tuple[int, bytes]:
+        symbol = params.get('symbol')
+        return 200, self._envelope([order for order in self.orders.values() if order['status'] == 'live' and symbol in (None, order['symbol'])])
+
+
+class _SyncTransport(httpx.BaseTransport):
+    def __init__(self, mock: MockBitget):
+        self._mock = mock
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self._mock.get_delay()
+        if delay:
+            time.sleep(delay)
+        return self._mock.handle(request)
+
+
+class _AsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, mock: MockBitget):
+        self._mock = mock
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self._mock.get_delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._mock.handle(request)
@@ -0,0 +1,115 @@
+"""
+Local stand-in for the Bitget public WebSocket API (used by stream benchmarks instead of wss://ws.bitget.com).
+
+Serves `subscribe`/`unsubscribe` ops with the Bitget event replies, answers `ping` with `pong`,
+pushes `ticker` messages for subscribed USDT pairs, and can drop all connections or stop answering pings
+to exercise reconnects and heartbeats. Requires the optional `websockets` package.
+"""
+from typing import Dict, Set, Tuple
+
+import json
+import time
+import random
+import asyncio
+
+import websockets
+
+
+class MockStream:
+    def __init__(self, seed: int = 0):
+        self.connections = 0
+        self.subscribes = 0
+        self.pings = 0
+        self.messages = 0
+        self.answer_pings = True
+        self._clients: Dict[object, Set[Tuple[str, str, str]]] = {}
+        self._random = random.Random(seed)
+        self._server = None
+
+    async def start(self, ) -> str:
+        """Starts serving on a free local port and returns the WebSocket URL."""
+        self._server = await websockets.serve(self._handle, '127.0.0.1', 0)
+        port = next(iter(self._server.sockets)).getsockname()[1]
+        return f'ws://127.0.0.1:{port}'
+
+    async def stop(self, ) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def clients(self, ) -> int:
+        return len(self._clients)
+
+    def get_subscriptions(self, ) -> Set[Tuple[str, str, str]]:
+        return set().union(*self._clients.values()) if self._clients else set()
+
+    async def drop(self, ) -> None:
+        """Closes all client connections (as if the server restarted)."""
+        for websocket in list(self._clients):
+            await websocket.close(code=1011, reason='Dropped by the stand-in')
+
+    async def publish_tickers(self, rounds: int = 1) -> int:
+        """Sends `rounds` ticker updates for every subscribed pair of every client and returns the number of messages."""
+        sent = 0
+        for _ in range(rounds):
+            for websocket, subscriptions in list(self._clients.items()):
+                for inst_type, channel, inst_id in list(subscriptions):
+                    if channel != 'ticker':
+                        continue
+                    price = self._random.uniform(1, 100000)
+                    message = {
+                        'action': 'snapshot',
+                        'arg': {'instType': inst_type, 'channel': channel, 'instId': inst_id},
+                        'data': [{
+                            'instId': inst_id,
+                            'lastPr': f'{price:.4f}',
+                            'bidPr': f'{price * 0.9999:.4f}',
+                            'askPr': f'{price * 1.0001:.4f}',
+                            'ts': str(int(time.time() * 1000)),
+                        }],
+                        'ts': int(time.time() * 1000),
+                    }
+                    try:
+                        await websocket.send(json.dumps(message))
+                    except websockets.ConnectionClosed:
+                        break
+                    sent += 1
+        self.messages += sent
+        return sent
+
+    async def _handle(self, websocket) -> None:
+        self.connections += 1
+        subscriptions: Set[Tuple[str, str, str]] = set()
+        self._clients[websocket] = subscriptions
+        try:
+            async for message in websocket:
+                if message == 'ping':
+                    self.pings += 1
+                    if self.answer_pings:
+                        await websocket.send('pong')
+                    continue
+                request = json.loads(message)
+                for arg in request.get('args') or []:
+                    key = (arg['instType'], arg['channel'], arg['instId'])
+                    if request.get('op') == 'subscribe':
+                        subscriptions.add(key)
+                        self.subscribes += 1
+                    elif request.get('op') == 'unsubscribe':
+                        subscriptions.discard(key)
+                    await websocket.send(json.dumps({'event': request.get('op'), 'arg': arg}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._clients.pop(websocket, None)
+
+
+async def wait_for(condition, timeout: float = 5.0, step: float = 0.01) -> float:
+    """Waits until the condition is true and returns the time it took (raises TimeoutError otherwise)."""
+    started_at = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - started_at > timeout:
+            raise asyncio.TimeoutError('Condition is not met!')
+        await asyncio.sleep(step)
+    return time.perf_counter() - started_at
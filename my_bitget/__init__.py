@@ -1 +1,21 @@
 from .mybitget import MyBitget
+from .cache import MetadataCache
+from .prices import PriceSnapshot
+from .candles import Candles, CandleStore
+from .singleflight import SingleFlight
+from .ratelimit import RateLimiter, TokenBucket
+from .retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from .pool import MyBitgetPool
+from .subaccounts import SubaccountSnapshot
+from .withdrawals import WithdrawalTracker
+from .payouts import WithdrawalJournal
+from .trading import OrderBatcher
+from .pagination import RecordsCursor, RecordsWindow
+from .stream import PriceBook, PublicStream, TickerStream
+from .orderbook import OrderBook, OrderBookStream, BookSide, get_checksum, replay
+from .endpoints import Endpoint, ENDPOINTS, ApiError
+from .decoding import BitgetResponse, get_decoder
+from .records import BalanceRecord, TickerRecord
+from .valuation import Conversion, Valuation
+from .metrics import Metrics, Histogram
+from .sync import MyBitgetSync
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import json
+import os
+import time
+
+
+class MetadataCache:
+    """
+    In-memory TTL cache for rarely changing exchange metadata (coins, chains, symbols).
+
+    Every entry belongs to a category (e.g., `coin`, `chain`, `symbol`), and each category has its own TTL.
+    The total number of entries is capped by `max_size`, the least recently used entries are evicted first.
+    The cache can be saved to and loaded from a JSON snapshot file, so a freshly started worker
+    can reuse metadata fetched by a previous process without requesting the API.
+    """
+
+    default_ttls = {
+        'coin': 600.0,
+        'coins': 600.0,
+        'chain': 600.0,
+        'symbol': 600.0,
+    }
+
+    def __init__(
+            self,
+            ttls: Optional[Dict[str, float]] = None,
+            default_ttl: float = 600.0,
+            max_size: int = 4096,
+            snapshot_path: Optional[str] = None,
+    ):
+        """
+        :param ttls: TTL in seconds for each category (overrides `default_ttls`).
+        :param default_ttl: TTL in seconds for categories which are not listed in `ttls`.
+        :param max_size: Maximum number of entries (the least recently used entries are evicted first).
+        :param snapshot_path: Path to the snapshot file (loaded on creation if it exists).
+        """
+        self.ttls = dict(self.default_ttls)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.snapshot_path = snapshot_path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[float, Any]]' = OrderedDict()
+        if snapshot_path is not None and os.path.exists(snapshot_path):
+            self.load(snapshot_path)
+
+    def __len__(self, ) -> int:
+        return len(self._entries)
+
+    def get(self, category: str, key: str) -> Optional[Any]:
+        """Returns the cached value (or None if the entry is missing or expired)."""
+        entry = self._entries.get((category, key))
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.time():
+                self._entries.move_to_end((category, key))
+                self.hits += 1
+                return value
+            del self._entries[(category, key)]
+        self.misses += 1
+        return None
+
+    def set(self, category: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores the value for the category's TTL (or for the given TTL)."""
+        if ttl is None:
+            ttl = self.ttls.get(category, self.default_ttl)
+        if ttl <= 0:
+            return
+        self._entries[(category, key)] = (time.time() + ttl, value)
+        self._entries.move_to_end((category, key))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, category: Optional[str] = None, key: Optional[str] = None) -> int:
+        """
+        Removes entries from the cache and returns the number of removed entries:
+        - no arguments: removes all entries;
+        - only category: removes all entries of the category;
+        - category and key: removes a single entry.
+        """
+        if category is None:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+        if key is not None:
+            return 1 if self._entries.pop((category, key), None) is not None else 0
+        keys = [entry_key for entry_key in self._entries if entry_key[0] == category]
+        for entry_key in keys:
+            del self._entries[entry_key]
+        return len(keys)
+
+    def save(self, path: Optional[str] = None) -> int:
+        """Saves all unexpired entries to the snapshot file and returns the number of saved entries."""
+        path = path or self.snapshot_path
+        if path is None:
+            raise ValueError('Snapshot path is not specified!')
+        now = time.time()
+        entries = [
+            [category, key, expires_at, value]
+            for (category, key), (expires_at, value) in self._entries.items()
+            if expires_at > now
+        ]
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': 1, 'entries': entries}, file, separators=(',', ':'))
+        os.replace(temp_path, path)
+        return len(entries)
+
+    def load(self, path: Optional[str] = None) -> int:
+        """Loads unexpired entries from the snapshot file and returns the number of loaded entries."""
+        path = path or self.snapshot_path
+        if path is None:
+            raise ValueError('Snapshot path is not specified!')
+        with open(path, 'r', encoding='utf-8') as file:
+            snapshot = json.load(file)
+        now = time.time()
+        count = 0
+        for category, key, expires_at, value in snapshot.get('entries', []):
+            if expires_at > now:
+                self._entries[(category, key)] = (expires_at, value)
+                count += 1
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return count
+
+    @property
+    def stats(self, ) -> Dict[str, int]:
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
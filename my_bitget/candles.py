@@ -0,0 +1,255 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import os
+import json
+import mmap
+import time
+import array
+import bisect
+import struct
+import asyncio
+
+
+# Candle duration in milliseconds by Bitget granularity
+granularities = {
+    '1min': 60_000,
+    '3min': 3 * 60_000,
+    '5min': 5 * 60_000,
+    '15min': 15 * 60_000,
+    '30min': 30 * 60_000,
+    '1h': 60 * 60_000,
+    '4h': 4 * 60 * 60_000,
+    '6h': 6 * 60 * 60_000,
+    '12h': 12 * 60 * 60_000,
+    '1day': 24 * 60 * 60_000,
+    '3day': 3 * 24 * 60 * 60_000,
+    '1week': 7 * 24 * 60 * 60_000,
+    '6Hutc': 6 * 60 * 60_000,
+    '12Hutc': 12 * 60 * 60_000,
+    '1Dutc': 24 * 60 * 60_000,
+    '3Dutc': 3 * 24 * 60 * 60_000,
+    '1Wutc': 7 * 24 * 60 * 60_000,
+}
+
+# Fixed-width little-endian record: timestamp, open, high, low, close, base volume, quote volume
+CANDLE_FORMAT = '<qdddddd'
+CANDLE_SIZE = struct.calcsize(CANDLE_FORMAT)
+CANDLE_FIELDS = ('ts', 'open', 'high', 'low', 'close', 'base_volume', 'quote_volume')
+
+_candle_struct = struct.Struct(CANDLE_FORMAT)
+_numpy: Any = None
+
+
+def get_numpy() -> Any:
+    """Returns the numpy module (imported on first use) or None if it is not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def get_dtype() -> Any:
+    numpy = get_numpy()
+    return numpy.dtype([(field, '<i8' if field == 'ts' else '<f8') for field in CANDLE_FIELDS])
+
+
+def parse_candle(candle: Sequence[str]) -> Tuple[int, float, float, float, float, float, float]:
+    """Converts a Bitget candle ([ts, open, high, low, close, baseVolume, usdtVolume, quoteVolume]) into a record tuple."""
+    return int(candle[0]), float(candle[1]), float(candle[2]), float(candle[3]), float(candle[4]), float(candle[5]), float(candle[7])
+
+
+class Candles:
+    """
+    Columnar candles: one array per field (ts, open, high, low, close, base_volume, quote_volume).
+    With NumPy the columns are zero-copy views of the memory-mapped cache file, otherwise they are `array` objects.
+    """
+
+    __slots__ = ('ts', 'open', 'high', 'low', 'close', 'base_volume', 'quote_volume', 'records')
+
+    def __init__(self, columns: Dict[str, Any], records: Any = None):
+        for field in CANDLE_FIELDS:
+            setattr(self, field, columns[field])
+        self.records = records
+
+    @classmethod
+    def from_buffer(cls, buffer: Any, start: int = 0, end: Optional[int] = None) -> 'Candles':
+        """Reads the records from start to end (indexes) of the buffer with fixed-width records."""
+        count = len(buffer) // CANDLE_SIZE
+        end = count if (end is None) else min(end, count)
+        start = min(start, end)
+        numpy = get_numpy()
+        if numpy is not None:
+            records = numpy.frombuffer(buffer, dtype=get_dtype(), count=end - start, offset=start * CANDLE_SIZE)
+            return cls({field: records[field] for field in CANDLE_FIELDS}, records)
+        columns = {field: array.array('q' if field == 'ts' else 'd') for field in CANDLE_FIELDS}
+        appends = [columns[field].append for field in CANDLE_FIELDS]
+        for record in _candle_struct.iter_unpack(memoryview(buffer)[start * CANDLE_SIZE:end * CANDLE_SIZE]):
+            for append, value in zip(appends, record):
+                append(value)
+        return cls(columns)
+
+    def __len__(self, ) -> int:
+        return len(self.ts)
+
+    def __repr__(self, ) -> str:
+        return f'Candles({len(self)})'
+
+    def to_rows(self, ) -> List[tuple]:
+        return list(zip(*[getattr(self, field) for field in CANDLE_FIELDS]))
+
+
+class _Timestamps:
+    """Sequence of record timestamps in a buffer (for binary search without decoding the whole buffer)."""
+
+    def __init__(self, buffer: Any):
+        self._buffer = buffer
+        self._count = len(buffer) // CANDLE_SIZE
+
+    def __len__(self, ) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> int:
+        return struct.unpack_from('<q', self._buffer, index * CANDLE_SIZE)[0]
+
+
+class CandleStore:
+    """
+    Cache of downloaded candles: a file of fixed-width records sorted by time for every symbol and granularity
+    (memory-mapped on read), and a JSON file with the time ranges already downloaded,
+    so only missing ranges are requested later. Without a directory the candles are kept in memory.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        :param directory: Cache directory (created if it does not exist; candles are kept in memory if not specified).
+        """
+        self.directory = directory
+        self._buffers: Dict[Tuple[str, str], bytes] = {}
+        self._ranges: Dict[Tuple[str, str], List[List[int]]] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get_lock(self, symbol: str, granularity: str) -> asyncio.Lock:
+        lock = self._locks.get((symbol, granularity))
+        if lock is None:
+            lock = self._locks[(symbol, granularity)] = asyncio.Lock()
+        return lock
+
+    def get_ranges(self, symbol: str, granularity: str) -> List[List[int]]:
+        """Returns the downloaded [start, end) time ranges (sorted and merged)."""
+        key = (symbol, granularity)
+        if key not in self._ranges:
+            ranges = []
+            if self.directory is not None and os.path.exists(self._get_path(symbol, granularity, 'json')):
+                with open(self._get_path(symbol, granularity, 'json'), 'r', encoding='utf-8') as file:
+                    ranges = json.load(file)['ranges']
+            self._ranges[key] = ranges
+        return self._ranges[key]
+
+    def get_missing(self, symbol: str, granularity: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """Returns the [start, end) time ranges which are not downloaded yet."""
+        missing = []
+        for range_start, range_end in self.get_ranges(symbol, granularity):
+            if range_end <= start:
+                continue
+            if range_start >= end:
+                break
+            if range_start > start:
+                missing.append((start, range_start))
+            start = max(start, range_end)
+        if start < end:
+            missing.append((start, end))
+        return missing
+
+    def write(self, symbol: str, granularity: str, records: Iterable[tuple], ranges: Iterable[Tuple[int, int]]) -> None:
+        """Merges the records (new values replace cached ones) and marks the time ranges as downloaded."""
+        records = sorted({record[0]: record for record in records}.values())
+        if records:
+            buffer = self._merge(self._read_buffer(symbol, granularity), records)
+            if self.directory is None:
+                self._buffers[(symbol, granularity)] = buffer
+            else:
+                path = self._get_path(symbol, granularity, 'candles')
+                with open(f'{path}.tmp', 'wb') as file:
+                    file.write(buffer)
+                os.replace(f'{path}.tmp', path)
+        merged = []
+        for range_start, range_end in sorted([*map(list, ranges), *self.get_ranges(symbol, granularity)]):
+            if merged and range_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], range_end)
+            else:
+                merged.append([range_start, range_end])
+        self._ranges[(symbol, granularity)] = merged
+        if self.directory is not None:
+            path = self._get_path(symbol, granularity, 'json')
+            with open(f'{path}.tmp', 'w', encoding='utf-8') as file:
+                json.dump({'ranges': merged}, file)
+            os.replace(f'{path}.tmp', path)
+
+    def read(self, symbol: str, granularity: str, start: Optional[int] = None, end: Optional[int] = None) -> Candles:
+        """Returns the cached candles opened in the [start, end) time range (all candles by default)."""
+        buffer = self._read_buffer(symbol, granularity)
+        timestamps = _Timestamps(buffer)
+        first = 0 if (start is None) else bisect.bisect_left(timestamps, start)
+        last = len(timestamps) if (end is None) else bisect.bisect_left(timestamps, end)
+        return Candles.from_buffer(buffer, first, last)
+
+    def clear(self, symbol: str, granularity: str) -> None:
+        self._buffers.pop((symbol, granularity), None)
+        self._ranges.pop((symbol, granularity), None)
+        if self.directory is not None:
+            for extension in ('candles', 'json'):
+                path = self._get_path(symbol, granularity, extension)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _get_path(self, symbol: str, granularity: str, extension: str) -> str:
+        return os.path.join(self.directory, f'{symbol}_{granularity}.{extension}')
+
+    def _read_buffer(self, symbol: str, granularity: str) -> Any:
+        if self.directory is None:
+            return self._buffers.get((symbol, granularity), b'')
+        path = self._get_path(symbol, granularity, 'candles')
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return b''
+        with open(path, 'rb') as file:
+            # The mapping stays valid after the file is closed (and after it is replaced by a newer version)
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _merge(buffer: Any, records: List[tuple]) -> bytes:
+        numpy = get_numpy()
+        if numpy is not None:
+            new = numpy.array(records, dtype=get_dtype())
+            if not len(buffer):
+                return new.tobytes()
+            old = numpy.frombuffer(buffer, dtype=get_dtype())
+            # New records go first, so numpy.unique keeps them for duplicated timestamps
+            merged = numpy.concatenate([new, old])
+            _, indexes = numpy.unique(merged['ts'], return_index=True)
+            return merged[indexes].tobytes()
+        merged = {record[0]: record for record in _candle_struct.iter_unpack(buffer)}
+        merged.update((record[0], record) for record in records)
+        return b''.join(_candle_struct.pack(*merged[ts]) for ts in sorted(merged))
+
+
+def split_range(start: int, end: int, step: int, limit: int) -> List[Tuple[int, int]]:
+    """Splits the [start, end) time range into chunks of at most limit candles (the newest chunk first)."""
+    chunks = []
+    chunk_end = end
+    while chunk_end > start:
+        chunk_start = max(start, chunk_end - step * limit)
+        chunks.append((chunk_start, chunk_end))
+        chunk_end = chunk_start
+    return chunks
+
+
+def get_closed_end(granularity: str, time_end: Optional[int] = None) -> int:
+    """Returns the end of the range with closed candles only (the current candle is never cached)."""
+    now = int(time.time() * 1000)
+    return min(now - granularities[granularity], now if (time_end is None) else int(time_end))
@@ -0,0 +1,84 @@
+from typing import Any, Callable, Mapping, Optional, Union
+
+import json
+
+
+JSONDecoder = Callable[[bytes], Any]
+
+
+def _get_orjson_decoder() -> Optional[JSONDecoder]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson.loads
+
+
+def _get_msgspec_decoder() -> Optional[JSONDecoder]:
+    try:
+        import msgspec
+    except ImportError:
+        return None
+    return msgspec.json.Decoder().decode
+
+
+def _get_json_decoder() -> Optional[JSONDecoder]:
+    return json.loads
+
+
+decoders = {
+    'orjson': _get_orjson_decoder,
+    'msgspec': _get_msgspec_decoder,
+    'json': _get_json_decoder,
+}
+
+
+def get_decoder(decoder: Optional[Union[str, JSONDecoder]] = None) -> JSONDecoder:
+    """
+    Returns the JSON decoder by its name (orjson, msgspec or json), or the fastest installed one if not specified.
+    A callable taking bytes is returned as is.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder is not None:
+        if decoder not in decoders:
+            raise ValueError(f'Unknown JSON decoder: {decoder}!')
+        result = decoders[decoder]()
+        if result is None:
+            raise ImportError(f'JSON decoder {decoder} is not installed!')
+        return result
+    for name in ('orjson', 'msgspec', 'json'):
+        result = decoders[name]()
+        if result is not None:
+            return result
+    return json.loads
+
+
+class BitgetResponse:
+    """Response decoded exactly once and carried through the request pipeline (shared by coalesced calls)."""
+
+    __slots__ = ('status_code', 'headers', 'content', 'data')
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes, data: Any):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.data = data
+
+    @classmethod
+    def decode(cls, status_code: int, headers: Mapping[str, str], content: bytes, decoder: JSONDecoder) -> 'BitgetResponse':
+        try:
+            data = decoder(content)
+        except Exception:
+            raise ValueError(f'Invalid JSON response (status {status_code}): {content[:200]!r}') from None
+        return cls(status_code, headers, content, data)
+
+    @property
+    def size(self, ) -> int:
+        return len(self.content)
+
+    def json(self, ) -> Any:
+        return self.data
+
+    def __repr__(self, ) -> str:
+        return f'BitgetResponse(status_code={self.status_code}, size={len(self.content)})'
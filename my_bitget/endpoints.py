@@ -0,0 +1,116 @@
+from typing import Any, Callable, Dict, Mapping, Optional
+
+
+def shape_raw(json: Any) -> Any:
+    """Returns the whole decoded response."""
+    return json
+
+
+def shape_data(json: Any) -> Any:
+    """Returns the `data` field of the decoded response."""
+    return json['data']
+
+
+# Bitget error codes with messages which are more useful than the original ones (the original code and message are kept)
+common_errors = {
+    '40006': 'Invalid API key',
+    '40012': 'Invalid API key or passphrase',
+    '40037': 'API key does not exist',
+    '40018': 'IP address is not whitelisted for the API key',
+    '429': 'Too many requests',
+}
+
+
+class ApiError(Exception):
+    """
+    Error response of Bitget to a request (returned by the failed calls instead of a plain Exception).
+    Unlike transport errors and timeouts it means that the request has been answered, so a 4xx error is a definite
+    rejection, while a 5xx error leaves the outcome of a POST request unknown.
+    """
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def is_rejection(self, ) -> bool:
+        return self.status_code < 500
+
+
+class Endpoint:
+    """
+    Declarative description of a Bitget REST endpoint: path, HTTP method, authentication,
+    rate-limit group, response shape and error mapping.
+    """
+
+    __slots__ = ('name', 'path', 'method', 'auth', 'group', 'shape', 'errors')
+
+    def __init__(
+            self,
+            name: str,
+            path: str,
+            method: str = 'GET',
+            auth: bool = True,
+            group: str = 'default',
+            shape: Callable[[Any], Any] = shape_raw,
+            errors: Optional[Mapping[str, str]] = None,
+    ):
+        """
+        :param name: Endpoint name (key in `ENDPOINTS`).
+        :param path: Request path (e.g., /api/v2/spot/public/coins).
+        :param method: HTTP method.
+        :param auth: Requires signed requests.
+        :param group: Rate-limit group (see `RateLimiter`).
+        :param shape: Function extracting the result from the decoded successful response.
+        :param errors: Messages by Bitget error codes (added to `common_errors`).
+        """
+        self.name = name
+        self.path = path
+        self.method = method
+        self.auth = auth
+        self.group = group
+        self.shape = shape
+        self.errors = {**common_errors, **errors} if errors else common_errors
+
+    def get_error(self, json: Any) -> str:
+        """Returns the error message of the decoded failed response."""
+        if not isinstance(json, dict) or 'msg' not in json:
+            return f'{json}'
+        code = str(json.get('code'))
+        if code in self.errors:
+            return f'{self.errors[code]} ({code}: {json["msg"]})'
+        return f'{json["msg"]}'
+
+    def __repr__(self, ) -> str:
+        return f'Endpoint({self.method} {self.path})'
+
+
+ENDPOINTS: Dict[str, Endpoint] = {endpoint.name: endpoint for endpoint in (
+    Endpoint('coins', '/api/v2/spot/public/coins', auth=False, group='public_coins'),
+    Endpoint('symbols', '/api/v2/spot/public/symbols', auth=False, group='public_market'),
+    Endpoint('tickers', '/api/v2/spot/market/tickers', auth=False, group='public_market'),
+    Endpoint('orderbook', '/api/v2/spot/market/orderbook', auth=False, group='public_market', shape=shape_data),
+    Endpoint('history_candles', '/api/v2/spot/market/history-candles', auth=False, group='public_candles', shape=shape_data),
+    Endpoint('account_info', '/api/v2/spot/account/info', group='account_info'),
+    Endpoint('account_assets', '/api/v2/spot/account/assets', group='account_assets'),
+    Endpoint('withdrawal', '/api/v2/spot/wallet/withdrawal', method='POST', group='withdrawal', shape=shape_data, errors={
+        '43012': 'Insufficient balance',
+    }),
+    Endpoint('withdrawal_records', '/api/v2/spot/wallet/withdrawal-records', group='withdrawal_records', shape=shape_data),
+    Endpoint('deposit_records', '/api/v2/spot/wallet/deposit-records', group='deposit_records', shape=shape_data),
+    Endpoint('account_bills', '/api/v2/spot/account/bills', group='account_bills', shape=shape_data),
+    Endpoint('transfer_records', '/api/v2/spot/account/transferRecords', group='transfer_records', shape=shape_data),
+    Endpoint('subaccount_list', '/api/v2/user/virtual-subaccount-list', group='subaccount_list', shape=shape_data),
+    Endpoint('subaccount_assets', '/api/v2/spot/account/subaccount-assets', group='subaccount_assets', shape=shape_data),
+    Endpoint('subaccount_transfer', '/api/v2/spot/wallet/subaccount-transfer', method='POST', group='subaccount_transfer', shape=shape_data, errors={
+        '43012': 'Insufficient balance',
+    }),
+    Endpoint('place_order', '/api/v2/spot/trade/place-order', method='POST', group='trade_place', shape=shape_data, errors={
+        '43012': 'Insufficient balance',
+    }),
+    Endpoint('batch_orders', '/api/v2/spot/trade/batch-orders', method='POST', group='trade_batch', shape=shape_data),
+    Endpoint('cancel_order', '/api/v2/spot/trade/cancel-order', method='POST', group='trade_cancel', shape=shape_data),
+    Endpoint('batch_cancel_order', '/api/v2/spot/trade/batch-cancel-order', method='POST', group='trade_batch_cancel', shape=shape_data),
+    Endpoint('order_info', '/api/v2/spot/trade/orderInfo', group='trade_query', shape=shape_data),
+    Endpoint('unfilled_orders', '/api/v2/spot/trade/unfilled-orders', group='trade_query', shape=shape_data),
+)}
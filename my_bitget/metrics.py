@@ -0,0 +1,182 @@
+from logging import Logger
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import bisect
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds (Prometheus style)."""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Returns the upper bound of the bucket containing the q-quantile (an estimate)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        total = 0
+        for i, count in enumerate(self.counts):
+            total += count
+            if total >= rank:
+                return self.bounds[i] if i < len(self.bounds) else float('inf')
+        return float('inf')
+
+    def snapshot(self, ) -> dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': dict(zip([*self.bounds, float('inf')], self.counts)),
+        }
+
+
+class Metrics:
+    """
+    Request instrumentation: per-endpoint latency histograms for every phase (queue, sign, network, decode, total),
+    response size histograms, status code counters and error counters, plus pre/post request hooks.
+    Metrics can be exported as a dict snapshot or as Prometheus text. A failed hook never changes the outcome
+    of the request: the error is counted in `hook_errors` and logged.
+    """
+
+    phases = ('queue', 'sign', 'network', 'decode', 'total')
+    latency_bounds = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    size_bounds = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+    def __init__(self, logger: Optional[Logger] = None):
+        """
+        :param logger: Logger object (used to log hook errors).
+        """
+        self.hook_errors = 0
+        self._logger = logger
+        self.pre_request_hooks: List[Callable[[str, str], Any]] = []
+        self.post_request_hooks: List[Callable[[str, str, Optional[int], Dict[str, float], Optional[BaseException]], Any]] = []
+        self._latencies: Dict[Tuple[str, str], Histogram] = {}
+        self._sizes: Dict[str, Histogram] = {}
+        self._statuses: Dict[Tuple[str, int], int] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+
+    def add_pre_request_hook(self, hook: Callable[[str, str], Any]) -> None:
+        """Adds the hook called with (endpoint, method) before every request."""
+        self.pre_request_hooks.append(hook)
+
+    def add_post_request_hook(self, hook: Callable[[str, str, Optional[int], Dict[str, float], Optional[BaseException]], Any]) -> None:
+        """Adds the hook called with (endpoint, method, status_code, timings, error) after every request."""
+        self.post_request_hooks.append(hook)
+
+    def before_request(self, endpoint: str, method: str) -> None:
+        for hook in self.pre_request_hooks:
+            try:
+                hook(endpoint, method)
+            except Exception:
+                self._on_hook_error('Pre-request', endpoint)
+
+    def after_request(
+            self,
+            endpoint: str,
+            method: str,
+            status_code: Optional[int],
+            timings: Dict[str, float],
+            size: Optional[int] = None,
+            error: Optional[BaseException] = None,
+    ) -> None:
+        for phase, value in timings.items():
+            histogram = self._latencies.get((endpoint, phase))
+            if histogram is None:
+                histogram = self._latencies[(endpoint, phase)] = Histogram(self.latency_bounds)
+            histogram.observe(value)
+        if size is not None:
+            histogram = self._sizes.get(endpoint)
+            if histogram is None:
+                histogram = self._sizes[endpoint] = Histogram(self.size_bounds)
+            histogram.observe(size)
+        if status_code is not None:
+            self._statuses[(endpoint, status_code)] = self._statuses.get((endpoint, status_code), 0) + 1
+        if error is not None:
+            key = (endpoint, type(error).__name__)
+            self._errors[key] = self._errors.get(key, 0) + 1
+        elif status_code is not None and status_code >= 400:
+            key = (endpoint, f'http_{status_code}')
+            self._errors[key] = self._errors.get(key, 0) + 1
+        for hook in self.post_request_hooks:
+            try:
+                hook(endpoint, method, status_code, timings, error)
+            except Exception:
+                self._on_hook_error('Post-request', endpoint)
+
+    def _on_hook_error(self, kind: str, endpoint: str) -> None:
+        self.hook_errors += 1
+        if self._logger is not None:
+            self._logger.exception(f'Metrics | {kind} hook for {endpoint} failed')
+
+    def get_latency(self, endpoint: str, phase: str = 'total') -> Optional[Histogram]:
+        return self._latencies.get((endpoint, phase))
+
+    def reset(self, ) -> None:
+        self._latencies.clear()
+        self._sizes.clear()
+        self._statuses.clear()
+        self._errors.clear()
+        self.hook_errors = 0
+
+    def snapshot(self, ) -> dict:
+        """Returns all metrics as a dict by endpoints."""
+        endpoints: Dict[str, dict] = {}
+        for (endpoint, phase), histogram in self._latencies.items():
+            endpoints.setdefault(endpoint, {}).setdefault('latency', {})[phase] = histogram.snapshot()
+        for endpoint, histogram in self._sizes.items():
+            endpoints.setdefault(endpoint, {})['size'] = histogram.snapshot()
+        for (endpoint, status_code), count in self._statuses.items():
+            endpoints.setdefault(endpoint, {}).setdefault('statuses', {})[status_code] = count
+        for (endpoint, error), count in self._errors.items():
+            endpoints.setdefault(endpoint, {}).setdefault('errors', {})[error] = count
+        return endpoints
+
+    def to_prometheus(self, prefix: str = 'bitget') -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        lines = [
+            f'# HELP {prefix}_request_duration_seconds Request phase duration in seconds.',
+            f'# TYPE {prefix}_request_duration_seconds histogram',
+        ]
+        for (endpoint, phase), histogram in sorted(self._latencies.items()):
+            lines.extend(self._format_histogram(f'{prefix}_request_duration_seconds', f'endpoint="{endpoint}",phase="{phase}"', histogram))
+        lines.extend([
+            f'# HELP {prefix}_response_size_bytes Response body size in bytes.',
+            f'# TYPE {prefix}_response_size_bytes histogram',
+        ])
+        for endpoint, histogram in sorted(self._sizes.items()):
+            lines.extend(self._format_histogram(f'{prefix}_response_size_bytes', f'endpoint="{endpoint}"', histogram))
+        lines.extend([
+            f'# HELP {prefix}_responses_total Responses by status code.',
+            f'# TYPE {prefix}_responses_total counter',
+        ])
+        for (endpoint, status_code), count in sorted(self._statuses.items()):
+            lines.append(f'{prefix}_responses_total{{endpoint="{endpoint}",code="{status_code}"}} {count}')
+        lines.extend([
+            f'# HELP {prefix}_errors_total Failed requests by error type.',
+            f'# TYPE {prefix}_errors_total counter',
+        ])
+        for (endpoint, error), count in sorted(self._errors.items()):
+            lines.append(f'{prefix}_errors_total{{endpoint="{endpoint}",error="{error}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _format_histogram(name: str, labels: str, histogram: Histogram) -> List[str]:
+        lines = []
+        total = 0
+        for bound, count in zip([*histogram.bounds, float('inf')], histogram.counts):
+            total += count
+            le = '+Inf' if bound == float('inf') else f'{bound:g}'
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {total}')
+        lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+        lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return lines
@@ -1,15 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from logging import Logger
-from typing import Optional, Union, Tuple
-from httpx import Client, AsyncClient, Response
+from typing import Any, AsyncIterator, Callable, Optional, Union, Tuple, Iterable, Dict, List, Sequence, TYPE_CHECKING
+from urllib.parse import urlencode
 
+import os
 import hmac
+import logging
+import hashlib
+import asyncio
 import time
 import json
-import httpx
 import base64
-import inspect
 
-from .utils import afh
+from .cache import MetadataCache
+from .candles import Candles, CandleStore, granularities, parse_candle, split_range, get_closed_end
+from .endpoints import Endpoint, ENDPOINTS, ApiError
+from .decoding import BitgetResponse, JSONDecoder, get_decoder
+from .metrics import Metrics
+from .orderbook import OrderBook
+from .pagination import RecordsCursor, paginate
+from .prices import PriceSnapshot
+from .records import BalanceRecord
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from .singleflight import SingleFlight
+from .stream import PriceBook
+from .payouts import WithdrawalJournal, get_client_oid, round_withdrawal
+from .subaccounts import SubaccountSnapshot
+from .trading import OrderBatcher
+from .transport import close_httpx_client, create_httpx_client, get_httpx
+from .withdrawals import WithdrawalTracker
+from .valuation import Conversion, Valuation, convert_usd_to_native, value_balances
+from .utils import afh, fan_out
+
+if TYPE_CHECKING:
+    import httpx
+    from httpx import Client, AsyncClient
 
 
 class MyBitget:
@@ -35,6 +62,21 @@ class MyBitget:
             proxy: Optional[str] = None,
             logger: Optional[Logger] = None,
             asynchrony: Optional[bool] = False,
+            metadata_cache: Optional[MetadataCache] = None,
+            price_snapshot_ttl: float = 5.0,
+            subaccount_snapshot_ttl: float = 5.0,
+            single_flight: Optional[SingleFlight] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            httpx_client: Optional[Union['Client', 'AsyncClient']] = None,
+            price_book: Optional[PriceBook] = None,
+            price_book_max_age: float = 5.0,
+            json_decoder: Optional[Union[str, JSONDecoder]] = None,
+            metrics: Optional[Metrics] = None,
+            sync_workers: int = 8,
+            executor: Optional[ThreadPoolExecutor] = None,
+            candle_store: Optional[CandleStore] = None,
     ):
         """
         MyBitget is a convenient library for interacting with Bitget API.
@@ -50,6 +92,21 @@ class MyBitget:
         :param proxy: HTTP/HTTPS proxy (e.g., user12345:abcdef@12.345.67.890:1234).
         :param logger: Logger object (used to log received responses).
         :param asynchrony: Enables asynchronous operations.
+        :param metadata_cache: Cache for coin, chain and symbol information (a default in-memory cache is created if not specified).
+        :param price_snapshot_ttl: Time in seconds during which the last all-tickers snapshot is reused for prices (0 disables reuse).
+        :param subaccount_snapshot_ttl: Time in seconds during which the last subaccount assets snapshot is reused for balances (0 disables reuse).
+        :param single_flight: Coalescing settings for concurrent identical GET requests (enabled for all endpoints if not specified).
+        :param rate_limiter: Client-side rate limiter (the limiter shared between all clients with the same API key if not specified).
+        :param retry_policy: Retry policy for failed requests (only GET requests are retried by default).
+        :param circuit_breaker: Circuit breaker (the breaker shared between all clients of the host and proxy if not specified).
+        :param httpx_client: External httpx client shared with other instances (proxy is ignored; must match asynchrony; never closed by the instance).
+        :param price_book: Local price book filled by `TickerStream` (used by `PUBLIC_get_price` while prices are fresh).
+        :param price_book_max_age: Time in seconds after which prices in the price book are considered stale.
+        :param json_decoder: JSON decoder name (orjson, msgspec or json) or callable (the fastest installed decoder if not specified).
+        :param metrics: Request instrumentation (latency histograms, sizes, status codes, errors and hooks; disabled if not specified).
+        :param sync_workers: Number of threads running blocking requests when asynchrony is disabled, so they do not block the event loop (0 runs them inline).
+        :param executor: External thread pool for blocking requests shared with other instances (sync_workers is ignored; never shut down by the instance).
+        :param candle_store: Cache of downloaded candles (an in-memory store is created if not specified).
         """
         self._api_key = api_key
         self._secret_key = secret_key
@@ -57,31 +114,77 @@ class MyBitget:
         self._proxy = proxy
         self._logger = logger
         self._asynchrony = asynchrony
-        self._httpx_client = self._get_httpx_client()
+        self._metadata_cache = metadata_cache if (metadata_cache is not None) else MetadataCache()
+        self._price_snapshot_ttl = price_snapshot_ttl
+        self._price_snapshot: Optional[PriceSnapshot] = None
+        self._subaccount_snapshot_ttl = subaccount_snapshot_ttl
+        self._subaccount_snapshot: Optional[SubaccountSnapshot] = None
+        self._price_book = price_book
+        self._price_book_max_age = price_book_max_age
+        self._main_user_id: Optional[str] = None
+        self._withdrawal_tracker: Optional[WithdrawalTracker] = None
+        self._order_batcher: Optional[OrderBatcher] = None
+        self._single_flight = single_flight if (single_flight is not None) else SingleFlight()
+        self._rate_limiter = rate_limiter if (rate_limiter is not None) else RateLimiter.shared(api_key)
+        self._retry_policy = retry_policy if (retry_policy is not None) else RetryPolicy()
+        self._circuit_breaker = circuit_breaker if (circuit_breaker is not None) else CircuitBreaker.shared(self.host, proxy)
+        # The fastest installed decoder is looked up (imported) by the first response
+        self._json_decoder = get_decoder(json_decoder) if (json_decoder is not None) else None
+        self._metrics = metrics
+        self._sync_workers = sync_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._candle_store = candle_store if (candle_store is not None) else CandleStore()
+        self._hmac = hmac.new(secret_key.encode('utf-8'), digestmod=hashlib.sha256)
+        self._headers = {
+            'ACCESS-KEY': api_key,
+            'ACCESS-PASSPHRASE': passphrase,
+            'locale': 'en-US',
+            'Content-Type': 'application/json',
+        }
+        # Public endpoints (see `Endpoint.auth`) are neither signed nor sent with the API key
+        self._public_headers = {
+            'locale': 'en-US',
+            'Content-Type': 'application/json',
+        }
+        # The own httpx client (and the httpx import) is deferred until the first request or `open`
+        self._httpx_client = httpx_client
+        self._owns_httpx_client = httpx_client is None
+        self._pid = os.getpid()
 
     async def PUBLIC_get_coin_info(self, ticker: str) -> Tuple[int, Union[dict, Exception]]:
         """
         Gets information about all coin chains (e.g., contract_address, withdraw_fee, min_withdraw_amount) by its ticker (e.g., BTC, ETH).
         Endpoint: https://www.bitget.com/api-doc/spot/market/Get-Coin-List
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        cached = self._metadata_cache.get('coin', ticker)
+        if cached is not None:
+            return 0, cached
+        status, result = await self._call('PUBLIC_get_coin_info', ENDPOINTS['coins'], {'coin': ticker})
+        if status == 0:
+            self._metadata_cache.set('coin', ticker, result)
+        return status, result
+
+    async def PUBLIC_get_coins_info(self, ) -> Tuple[int, Union[Dict[str, dict], Exception]]:
+        """
+        Gets information about all coins and their chains by a single (cached) request, as a dict by ticker
+        (every coin is also put into the metadata cache used by `PUBLIC_get_coin_info`).
+        Endpoint: https://www.bitget.com/api-doc/spot/market/Get-Coin-List
+        """
+        log_process = 'PUBLIC_get_coins_info'
         try:
-            endpoint = f'/api/v2/spot/public/coins'
-            method = f'GET'
-            body = f'?coin={ticker}'
-            response = await self._httpx_request(
-                endpoint=endpoint,
-                method=method,
-                body=body,
-            )
-            json = response.json()
-            if response.status_code == 200:
-                return 0, dict(json)
-            else:
-                if 'msg' in json:
-                    return -1, Exception(f'{log_process} | {json["msg"]}')
-                else:
-                    return -1, Exception(f'{log_process} | {json}')
+            cached = self._metadata_cache.get('coins', 'all')
+            if cached is not None:
+                return 0, cached
+            status, result = await self._call(log_process, ENDPOINTS['coins'])
+            if status != 0:
+                return status, result
+            coins = {}
+            for coin in result['data']:
+                coins[coin['coin']] = coin
+                self._metadata_cache.set('coin', coin['coin'], {**result, 'data': [coin]})
+            self._metadata_cache.set('coins', 'all', coins)
+            return 0, coins
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
@@ -90,13 +193,18 @@ class MyBitget:
         Gets information about specific coin's chain (e.g., contract_address, withdraw_fee, min_withdraw_amount)
         by its ticker (e.g., BTC, ETH) and chain name (e.g., ArbitrumOne, BEP20).
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'PUBLIC_get_chain_info'
         try:
+            cached = self._metadata_cache.get('chain', f'{ticker}:{chain}')
+            if cached is not None:
+                return 0, cached
             status, result = await self.PUBLIC_get_coin_info(ticker=ticker)
             if status == 0:
                 for chain_info in result['data'][0]['chains']:
                     if str(chain_info['chain']) == chain:
-                        return 0, dict(chain_info)
+                        result = dict(chain_info)
+                        self._metadata_cache.set('chain', f'{ticker}:{chain}', result)
+                        return 0, result
                 return -1, Exception(f'{log_process} | No such a chain!')
             else:
                 return -1, Exception(f'{log_process} | {result}')
@@ -108,57 +216,38 @@ class MyBitget:
         Gets common information about coin USDT pair trading on spot market (e.g., min_trade_amount, price_precision, min_trade_usdt).
         Endpoint: https://www.bitget.com/api-doc/spot/market/Get-Symbols
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
-        try:
-            endpoint = f'/api/v2/spot/public/symbols'
-            method = f'GET'
-            body = f'?symbol={ticker}USDT'
-            response = await self._httpx_request(
-                endpoint=endpoint,
-                method=method,
-                body=body,
-            )
-            json = response.json()
-            if response.status_code == 200:
-                return 0, dict(json)
-            else:
-                if 'msg' in json:
-                    return -1, Exception(f'{log_process} | {json["msg"]}')
-                else:
-                    return -1, Exception(f'{log_process} | {json}')
-        except Exception as e:
-            return -1, Exception(f'{log_process} | {e}')
+        cached = self._metadata_cache.get('symbol', ticker)
+        if cached is not None:
+            return 0, cached
+        status, result = await self._call('PUBLIC_get_symbol_info', ENDPOINTS['symbols'], {'symbol': f'{ticker}USDT'})
+        if status == 0:
+            self._metadata_cache.set('symbol', ticker, result)
+        return status, result
 
     async def PUBLIC_get_ticker_info(self, ticker: str) -> Tuple[int, Union[dict, Exception]]:
         """
         Gets market information about coin USDT pair trading on spot market (e.g., open_price, quote_volume, change_24h).
         Endpoint: https://www.bitget.com/api-doc/spot/market/Get-Tickers
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
-        try:
-            endpoint = f'/api/v2/spot/market/tickers'
-            method = f'GET'
-            body = f'?symbol={ticker}USDT'
-            response = await self._httpx_request(
-                endpoint=endpoint,
-                method=method,
-                body=body,
-            )
-            json = response.json()
-            if response.status_code == 200:
-                return 0, dict(json)
-            else:
-                if 'msg' in json:
-                    return -1, Exception(f'{log_process} | {json["msg"]}')
-                else:
-                    return -1, Exception(f'{log_process} | {json}')
-        except Exception as e:
-            return -1, Exception(f'{log_process} | {e}')
+        return await self._call('PUBLIC_get_ticker_info', ENDPOINTS['tickers'], {'symbol': f'{ticker}USDT'})
 
     async def PUBLIC_get_price(self, ticker: str) -> Tuple[int, Union[float, Exception]]:
-        """Gets the price (in USDT) of a specific coin by its ticker (e.g., BTC, ETH)"""
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        """
+        Gets the price (in USDT) of a specific coin by its ticker (e.g., BTC, ETH).
+        The price is read from the price book (see `TickerStream`) or from the last all-tickers snapshot
+        (see `PUBLIC_get_price_snapshot`) if they are fresh.
+        """
+        log_process = 'PUBLIC_get_price'
         try:
+            if self._price_book is not None:
+                price = self._price_book.get_price(ticker, self._price_book_max_age)
+                if price is not None:
+                    return 0, price
+            snapshot = self._price_snapshot
+            if snapshot is not None and snapshot.is_fresh(self._price_snapshot_ttl):
+                price = snapshot.get_price(ticker)
+                if price is not None:
+                    return 0, price
             status, result = await self.PUBLIC_get_ticker_info(ticker=ticker)
             if status == 0:
                 return 0, float(result['data'][0]['lastPr'])
@@ -167,90 +256,166 @@ class MyBitget:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def SPOT_is_connected(self, ) -> Tuple[int, Union[bool, Exception]]:
+    async def PUBLIC_get_price_snapshot(self, max_age: Optional[float] = None) -> Tuple[int, Union[PriceSnapshot, Exception]]:
         """
-        Checks the connection to the spot account.
-        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Account-Assets
+        Gets the snapshot of all spot tickers (last, bid and ask prices, volumes) by a single request.
+        The last snapshot is reused if it is not older than max_age seconds (price_snapshot_ttl by default).
+        Endpoint: https://www.bitget.com/api-doc/spot/market/Get-Tickers
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'PUBLIC_get_price_snapshot'
         try:
-            endpoint = f'/api/v2/spot/account/assets'
-            method = f'GET'
-            body = f''
-            response = await self._httpx_request(
-                endpoint=endpoint,
-                method=method,
-                body=body,
-            )
-            if response.status_code == 200:
-                return 0, True
-            else:
-                json = response.json()
-                if 'msg' in json:
-                    return -1, Exception(f'{log_process} | {json["msg"]}')
-                else:
-                    return -1, Exception(f'{log_process} | {json}')
+            max_age = self._price_snapshot_ttl if (max_age is None) else max_age
+            snapshot = self._price_snapshot
+            if snapshot is not None and snapshot.is_fresh(max_age):
+                return 0, snapshot
+            status, result = await self._call(log_process, ENDPOINTS['tickers'])
+            if status == 0:
+                snapshot = PriceSnapshot.from_json(result['data'])
+                self._price_snapshot = snapshot
+                return 0, snapshot
+            return status, result
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def SPOT_get_account_info(self, ) -> Tuple[int, Union[dict, Exception]]:
+    async def PUBLIC_get_prices(self, tickers: Optional[Iterable[str]] = None, max_age: Optional[float] = None) -> Tuple[int, Union[Dict[str, float], Exception]]:
         """
-        Gets common information about main account (e.g., user_id, ips, regis_time).
-        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Account-Info
+        Gets the prices (in USDT) of specific coins by their tickers (or of all coins with USDT pairs) by a single request.
+        The last snapshot is reused if it is not older than max_age seconds (price_snapshot_ttl by default).
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'PUBLIC_get_prices'
         try:
-            endpoint = f'/api/v2/spot/account/info'
-            method = f'GET'
-            body = ''
-            response = await self._httpx_request(
-                endpoint=endpoint,
-                method=method,
-                body=body,
-            )
-            json = response.json()
-            if response.status_code == 200:
-                return 0, dict(json)
+            status, result = await self.PUBLIC_get_price_snapshot(max_age=max_age)
+            if status == 0:
+                tickers = None if (tickers is None) else list(tickers)
+                prices = result.get_prices(tickers)
+                if tickers is not None:
+                    missing = [ticker for ticker in tickers if ticker not in prices]
+                    if missing:
+                        return -1, Exception(f'{log_process} | No prices for tickers: {", ".join(missing)}!')
+                return 0, prices
             else:
-                if 'msg' in json:
-                    return -1, Exception(f'{log_process} | {json["msg"]}')
-                else:
-                    return -1, Exception(f'{log_process} | {json}')
+                return -1, Exception(f'{log_process} | {result}')
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def SPOT_get_balance(self, ticker: Optional[str] = None) -> Tuple[int, Union[dict, Exception]]:
+    async def PUBLIC_get_orderbook(self, ticker: str, limit: int = 150) -> Tuple[int, Union[OrderBook, Exception]]:
         """
-        Gets the balance for a specific coin (or for all coins).
-        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Account-Assets
+        Gets the depth snapshot (at most limit levels of each side, 150 max) of coin USDT pair as a local `OrderBook`.
+        Use `OrderBookStream` to keep the book up to date with WebSocket updates.
+        Endpoint: https://www.bitget.com/api-doc/spot/market/Get-Orderbook
+        """
+        symbol = f'{ticker}USDT'
+        return await self._call(
+            'PUBLIC_get_orderbook', ENDPOINTS['orderbook'], {'symbol': symbol, 'type': 'step0', 'limit': limit},
+            shape=lambda data: OrderBook.from_rest(symbol, data),
+        )
+
+    async def PUBLIC_get_history_candles(
+            self,
+            ticker: str,
+            granularity: str = '1h',
+            end_time: Optional[Union[int, str]] = None,
+            limit: int = 200,
+    ) -> Tuple[int, Union[list, Exception]]:
+        """
+        Gets at most limit (200 max) candles of coin USDT pair opened before end_time (now by default).
+        Every candle is a list of strings: [ts, open, high, low, close, baseVolume, usdtVolume, quoteVolume].
+        Endpoint: https://www.bitget.com/api-doc/spot/market/Get-History-Candle-Data
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        return await self._call('PUBLIC_get_history_candles', ENDPOINTS['history_candles'], {
+            'symbol': f'{ticker}USDT',
+            'granularity': granularity,
+            'endTime': self.time if (end_time is None) else end_time,
+            'limit': limit,
+        })
+
+    async def PUBLIC_download_candles(
+            self,
+            ticker: str,
+            time_start: Union[int, str],
+            time_end: Optional[Union[int, str]] = None,
+            granularity: str = '1h',
+            concurrency: int = 8,
+    ) -> Tuple[int, Union[Candles, Exception]]:
+        """
+        Gets the closed candles of coin USDT pair opened between time_start and time_end (now by default) as columnar `Candles`.
+        Only the ranges missing in the candle store (see `CandleStore`) are downloaded: they are split into chunks of 200 candles
+        fetched with at most `concurrency` simultaneous requests (under the rate limit), and every batch of chunks is saved
+        to the store as soon as it is downloaded, so an interrupted download does not start over.
+        Endpoint: https://www.bitget.com/api-doc/spot/market/Get-History-Candle-Data
+        """
+        log_process = 'PUBLIC_download_candles'
         try:
-            endpoint = f'/api/v2/spot/account/assets'
-            method = f'GET'
-            body = f'' if (ticker is None) else f'?coin={ticker}'
-            response = await self._httpx_request(
-                endpoint=endpoint,
-                method=method,
-                body=body,
-            )
-            json = response.json()
-            if response.status_code == 200:
-                return 0, dict(json)
-            else:
-                if 'msg' in json:
-                    return -1, Exception(f'{log_process} | {json["msg"]}')
-                else:
-                    return -1, Exception(f'{log_process} | {json}')
+            if granularity not in granularities:
+                return -1, Exception(f'{log_process} | Unsupported granularity: {granularity}!')
+            symbol = f'{ticker}USDT'
+            step = granularities[granularity]
+            start = int(time_start)
+            end = get_closed_end(granularity, time_end)
+            store = self._candle_store
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+
+            async def fetch(chunk: Tuple[int, int]) -> Tuple[Tuple[int, int], Tuple[int, Any]]:
+                async with semaphore:
+                    return chunk, await self.PUBLIC_get_history_candles(ticker, granularity=granularity, end_time=chunk[1] - 1, limit=200)
+
+            async with store.get_lock(symbol, granularity):
+                chunks = [
+                    chunk
+                    for missing_start, missing_end in store.get_missing(symbol, granularity, start, end)
+                    for chunk in split_range(missing_start, missing_end, step, 200)
+                ]
+                batch_size = max(1, concurrency) * 16
+                for i in range(0, len(chunks), batch_size):
+                    records = []
+                    ranges = []
+                    error = None
+                    for (chunk_start, chunk_end), (status, result) in await asyncio.gather(*[fetch(chunk) for chunk in chunks[i:i + batch_size]]):
+                        if status != 0:
+                            error = result
+                            continue
+                        records.extend(record for record in map(parse_candle, result) if chunk_start <= record[0] < chunk_end)
+                        ranges.append((chunk_start, chunk_end))
+                    store.write(symbol, granularity, records, ranges)
+                    if error is not None:
+                        return -1, Exception(f'{log_process} | {error}')
+                return 0, store.read(symbol, granularity, start, end)
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
+    async def SPOT_is_connected(self, ) -> Tuple[int, Union[bool, Exception]]:
+        """
+        Checks the connection to the spot account.
+        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Account-Assets
+        """
+        status, result = await self._call('SPOT_is_connected', ENDPOINTS['account_assets'])
+        return (0, True) if (status == 0) else (status, result)
+
+    async def SPOT_get_account_info(self, ) -> Tuple[int, Union[dict, Exception]]:
+        """
+        Gets common information about main account (e.g., user_id, ips, regis_time).
+        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Account-Info
+        """
+        return await self._call('SPOT_get_account_info', ENDPOINTS['account_info'])
+
+    async def SPOT_get_balance(self, ticker: Optional[str] = None, typed: bool = False) -> Tuple[int, Union[dict, List[BalanceRecord], Exception]]:
+        """
+        Gets the balance for a specific coin (or for all coins).
+        If typed is True, returns the list of slotted `BalanceRecord` objects instead of the raw response.
+        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Account-Assets
+        """
+        if typed:
+            return await self._call('SPOT_get_balance', ENDPOINTS['account_assets'], {'coin': ticker}, shape=lambda json: [
+                BalanceRecord.from_json(asset) for asset in json['data']
+            ])
+        return await self._call('SPOT_get_balance', ENDPOINTS['account_assets'], {'coin': ticker})
+
     async def SPOT_convert_usd_to_native(self, amount: float, ticker: str, chain: str) -> Tuple[int, Union[float, Exception]]:
         """
         Converts USD amount to the native chain coin amount, rounded to the chain's tick_size value
         (e.g., 100 USD converts to 0.02857143 ETH for an ETH price of 3500 USD).
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'SPOT_convert_usd_to_native'
         try:
             status, result = await self.PUBLIC_get_price(ticker=ticker)
             if status == 0:
@@ -266,215 +431,928 @@ class MyBitget:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def SPOT_post_withdrawal(self, ticker: str, chain: str, address: str, amount: float) -> Tuple[int, Union[Tuple[str, str], Exception]]:
+    async def SPOT_convert_usd_to_native_batch(
+            self,
+            amounts: Sequence[Union[float, str]],
+            tickers: Union[str, Sequence[str]],
+            chains: Union[str, Sequence[str]],
+            rounding: str = 'nearest',
+            max_age: Optional[float] = None,
+    ) -> Tuple[int, Union[Conversion, Exception]]:
+        """
+        Converts many USD amounts to native chain coin amounts rounded to the chains' withdrawMinScale
+        (see `SPOT_convert_usd_to_native`). Chains are keys of `withdraw_native_chains` or Bitget chain names.
+        All prices come from one all-tickers snapshot (reused for max_age seconds) and all precisions from one coins request,
+        and the result (`Conversion`) holds arrays aligned with the input and per-row errors.
+        """
+        log_process = 'SPOT_convert_usd_to_native_batch'
+        try:
+            (snapshot_status, snapshot), (coins_status, coins) = await asyncio.gather(
+                self.PUBLIC_get_price_snapshot(max_age=max_age),
+                self.PUBLIC_get_coins_info(),
+            )
+            if snapshot_status != 0:
+                return -1, Exception(f'{log_process} | {snapshot}')
+            if coins_status != 0:
+                return -1, Exception(f'{log_process} | {coins}')
+            chains = self.withdraw_native_chains.get(chains, chains) if isinstance(chains, str) else [self.withdraw_native_chains.get(chain, chain) for chain in chains]
+            return 0, convert_usd_to_native(amounts, tickers, chains, snapshot.get_prices(), coins, rounding=rounding)
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def SPOT_value_balances(
+            self,
+            balances: Optional[Iterable[Union[dict, BalanceRecord]]] = None,
+            fields: Sequence[str] = ('available', 'frozen', 'locked'),
+            max_age: Optional[float] = None,
+    ) -> Tuple[int, Union[Valuation, Exception]]:
+        """
+        Values balances (from `SPOT_get_balance`, `SUBACCOUNT_get_balance` or the spot account balances if not specified)
+        in USDT with prices from one all-tickers snapshot. The result (`Valuation`) holds arrays aligned with the balances,
+        per-row errors and the total value.
+        """
+        log_process = 'SPOT_value_balances'
+        try:
+            if balances is None:
+                status, result = await self.SPOT_get_balance()
+                if status != 0:
+                    return -1, Exception(f'{log_process} | {result}')
+                balances = result['data']
+            status, result = await self.PUBLIC_get_price_snapshot(max_age=max_age)
+            if status != 0:
+                return -1, Exception(f'{log_process} | {result}')
+            return 0, value_balances(balances, result.get_prices(), fields=fields)
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def SPOT_post_withdrawal(
+            self,
+            ticker: str,
+            chain: str,
+            address: str,
+            amount: Union[float, str],
+            client_oid: Optional[str] = None,
+    ) -> Tuple[int, Union[Tuple[str, str], Exception]]:
         """
         Posts a withdrawal on the chain for a specific ticker and chain (withdrawals must be available for created API keys).
+        The optional client_oid is an idempotency key: Bitget rejects a second withdrawal with the same key.
+        Only an `ApiError` with `is_rejection` means that the withdrawal has not been created: after any other error
+        (e.g., a timeout) it may have been, so look it up by client_oid before posting it again.
         Endpoint: https://www.bitget.com/api-doc/spot/account/Wallet-Withdrawal
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        body = {
+            'coin': ticker,
+            'transferType': 'on_chain',
+            'address': address,
+            'chain': chain,
+            'size': amount,
+        }
+        if client_oid is not None:
+            body['clientOid'] = client_oid
+        withdrawal_timestamp = self.time
+        return await self._call('SPOT_post_withdrawal', ENDPOINTS['withdrawal'], body=body, shape=lambda data: (withdrawal_timestamp, data['orderId']))
+
+    async def SPOT_post_withdrawals(
+            self,
+            rows: Iterable[Tuple[str, str, str, Union[float, str, Decimal]]],
+            concurrency: int = 5,
+            journal_path: Optional[str] = None,
+            batch_id: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[int, Union[dict, Exception]]]:
+        """
+        Posts many withdrawals given by (ticker, chain, address, amount) rows (a list or any iterator), where chain is
+        a key of `withdraw_native_chains` (e.g., Arbitrum) or a Bitget chain name (e.g., ArbitrumOne).
+        Every row is validated locally against the chain rules from a single coins request (availability, minimum amount,
+        withdrawMinScale precision), so invalid rows never reach the API. Valid rows are posted with at most
+        `concurrency` simultaneous requests, each with an idempotency key (clientOid) derived from batch_id and the row.
+        Yields (status, report) for every row as soon as it is processed; the report contains index, ticker, chain, address,
+        amount (rounded), client_oid and withdrawal ((timestamp, order_id), see `withdrawal_tracker`) or error
+        (and `unknown`: True if the withdrawal may have been created despite the error, e.g., after a timeout).
+        With journal_path the progress is written to a JSONL journal: running the same batch again skips completed rows
+        and looks up rows interrupted while posting or with an unknown outcome (by clientOid) instead of posting them again.
+        Either journal_path or batch_id must be specified: the batch_id (the journal path by default) is what makes
+        the clientOids of a rerun match, so rerunning a batch without a journal is only safe with the same batch_id.
+        """
+        log_process = 'SPOT_post_withdrawals'
+        if journal_path is None and batch_id is None:
+            yield -1, Exception(f'{log_process} | Either journal_path or batch_id must be specified!')
+            return
+        journal = None
         try:
-            endpoint = f'/api/v2/spot/wallet/withdrawal'
-            method = f'POST'
-            body = {
-                'coin': ticker,
-                'transferType': 'on_chain',
-                'address': address,
-                'chain': chain,
-                'size': amount,
-            }
-            withdrawal_timestamp = self.time
-            response = await self._httpx_request(
-                endpoint=endpoint,
-                method=method,
-                body=body,
-            )
-            json = response.json()
-            if response.status_code == 200:
-                return 0, (withdrawal_timestamp, json['data']['orderId'])
-            else:
-                if 'msg' in json:
-                    return -1, Exception(f'{log_process} | {json["msg"]}')
+            status, result = await self.PUBLIC_get_coins_info()
+            if status != 0:
+                yield -1, Exception(f'{log_process} | {result}')
+                return
+            coins = result
+            if journal_path is not None:
+                journal = WithdrawalJournal(journal_path)
+            if batch_id is None:
+                batch_id = os.path.abspath(journal_path)
+
+            async def process(index: int, row: Tuple[str, str, str, Union[float, str, Decimal]]) -> Tuple[int, dict]:
+                ticker, chain, address, amount = row
+                chain = self.withdraw_native_chains.get(chain, chain)
+                client_oid = get_client_oid(batch_id, index, ticker, chain, address, str(amount))
+                report = {'index': index, 'ticker': ticker, 'chain': chain, 'address': address, 'amount': str(amount), 'client_oid': client_oid}
+                entry = None if (journal is None) else journal.get(client_oid)
+                if entry is not None and entry['state'] == 'done':
+                    return 0, {**report, 'amount': entry['amount'], 'withdrawal': tuple(entry['withdrawal']), 'resumed': True}
+                if entry is not None and entry['state'] == 'pending':
+                    # The previous run was interrupted while posting: the withdrawal may have been created
+                    status, result = await self._find_withdrawal(client_oid, entry['timestamp'])
+                    if status != 0:
+                        return -1, {**report, 'error': result}
+                    if result is not None:
+                        withdrawal = (entry['timestamp'], str(result['orderId']))
+                        journal.write({**entry, 'state': 'done', 'withdrawal': withdrawal})
+                        return 0, {**report, 'amount': entry['amount'], 'withdrawal': withdrawal, 'resumed': True}
+                chain_info = next((item for item in (coins.get(ticker) or {}).get('chains') or [] if str(item['chain']) == chain), None)
+                if chain_info is None:
+                    status, result = -1, Exception(f'No such coin or chain: {ticker} {chain}!')
+                elif not address:
+                    status, result = -1, Exception('Empty address!')
                 else:
-                    return -1, Exception(f'{log_process} | {json}')
+                    status, result = round_withdrawal(chain_info, amount)
+                if status != 0:
+                    if journal is not None:
+                        journal.write({'client_oid': client_oid, 'index': index, 'state': 'invalid', 'error': f'{result}'})
+                    return -1, {**report, 'error': Exception(f'{log_process} | {result}')}
+                report['amount'] = result
+                if journal is not None:
+                    journal.write({'client_oid': client_oid, 'index': index, 'state': 'pending', 'amount': result, 'timestamp': self.time})
+                status, result = await self.SPOT_post_withdrawal(ticker, chain, address, report['amount'], client_oid=client_oid)
+                if status != 0:
+                    if not (isinstance(result, ApiError) and result.is_rejection):
+                        # Timeouts, transport and server errors: the withdrawal may have been created, so the row stays
+                        # pending and is looked up by clientOid on the next run
+                        return -1, {**report, 'error': result, 'unknown': True}
+                    if journal is not None:
+                        journal.write({'client_oid': client_oid, 'index': index, 'state': 'failed', 'error': f'{result}'})
+                    return -1, {**report, 'error': result}
+                if journal is not None:
+                    journal.write({'client_oid': client_oid, 'index': index, 'state': 'done', 'amount': report['amount'], 'withdrawal': result})
+                return 0, {**report, 'withdrawal': result}
+
+            async def post(indexed_row: Tuple[int, Tuple[str, str, str, Union[float, str, Decimal]]]) -> AsyncIterator[Tuple[int, dict]]:
+                index, row = indexed_row
+                try:
+                    yield await process(index, row)
+                except Exception as e:
+                    yield -1, {'index': index, 'error': Exception(f'{log_process} | {e}')}
+
+            reports = fan_out(enumerate(rows), post, concurrency, buffer=max(1, concurrency) * 2)
+            try:
+                async for item in reports:
+                    yield item
+            finally:
+                await reports.aclose()
         except Exception as e:
-            return -1, Exception(f'{log_process} | {e}')
+            yield -1, Exception(f'{log_process} | {e}')
+        finally:
+            if journal is not None:
+                journal.close()
 
     async def SPOT_check_withdrawal(self, time_start: str, order_id: str) -> Tuple[int, Union[bool, Exception]]:
         """
         Checks if the withdrawal is completed by its withdrawal_id (the withdrawal_id is returned after posting the withdrawal on the chain).
         Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Withdraw-Record
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'SPOT_check_withdrawal'
         try:
-            endpoint = f'/api/v2/spot/wallet/withdrawal-records'
-            method = f'GET'
-            body = f'?startTime={time_start}&endTime={self.time}&orderId={order_id}'
-            response = await self._httpx_request(
-                endpoint=endpoint,
-                method=method,
-                body=body,
-            )
-            json = response.json()
-            if response.status_code == 200:
-                status = json['data'][0]['status']
+            status, result = await self._call(log_process, ENDPOINTS['withdrawal_records'], {
+                'startTime': time_start,
+                'endTime': self.time,
+                'orderId': order_id,
+            })
+            if status == 0:
+                records = [record for record in result or [] if str(record.get('orderId')) == str(order_id)]
+                if not records:
+                    return -1, Exception(f'{log_process} | No such withdrawal!')
+                status = records[0]['status']
                 if status in ['success']:
                     return 0, True
                 elif status in ['pending']:
                     return 0, False
                 else:
                     return -1, Exception(f'{log_process} | Wrong status!')
+            return status, result
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def SPOT_get_withdrawal_records(
+            self,
+            time_start: str,
+            time_end: Optional[str] = None,
+            id_less_than: Optional[str] = None,
+            limit: int = 100,
+    ) -> Tuple[int, Union[List[dict], Exception]]:
+        """
+        Gets a page of withdrawal records (newest first) posted between time_start and time_end (now by default);
+        older pages are requested by passing the orderId of the last record as id_less_than.
+        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Withdraw-Record
+        """
+        status, result = await self._call('SPOT_get_withdrawal_records', ENDPOINTS['withdrawal_records'], {
+            'startTime': time_start,
+            'endTime': self.time if (time_end is None) else time_end,
+            'limit': limit,
+            'idLessThan': id_less_than,
+        })
+        return (0, list(result or [])) if (status == 0) else (status, result)
+
+    async def SPOT_wait_withdrawal(self, withdrawal: Tuple[str, str], timeout: Optional[float] = None) -> Tuple[int, Union[dict, Exception]]:
+        """
+        Waits until the withdrawal is completed by the (timestamp, order_id) tuple returned by `SPOT_post_withdrawal`
+        and returns its withdrawal record. All waiting withdrawals are checked together by the shared `withdrawal_tracker`.
+        """
+        log_process = 'SPOT_wait_withdrawal'
+        try:
+            status, result = await self.withdrawal_tracker.wait(withdrawal, timeout=timeout)
+            if status == 0:
+                return 0, result
             else:
-                if 'msg' in json:
-                    return -1, Exception(f'{log_process} | {json["msg"]}')
-                else:
-                    return -1, Exception(f'{log_process} | {json}')
+                return -1, Exception(f'{log_process} | {result}')
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
+    async def SPOT_iter_withdrawal_records(
+            self,
+            time_start: Optional[Union[int, str]] = None,
+            time_end: Optional[Union[int, str]] = None,
+            ticker: Optional[str] = None,
+            cursor: Optional[RecordsCursor] = None,
+            concurrency: int = 4,
+    ) -> AsyncIterator[Tuple[int, Union[dict, Exception]]]:
+        """
+        Yields (0, record) for all withdrawal records posted between time_start and time_end (now by default),
+        see `_iter_records` for windows, concurrency and resuming with a cursor.
+        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Withdraw-Record
+        """
+        async for item in self._iter_records(
+                'SPOT_iter_withdrawal_records', ENDPOINTS['withdrawal_records'], 'orderId', 100, {'coin': ticker},
+                time_start, time_end, cursor, concurrency,
+        ):
+            yield item
+
+    async def SPOT_iter_deposit_records(
+            self,
+            time_start: Optional[Union[int, str]] = None,
+            time_end: Optional[Union[int, str]] = None,
+            ticker: Optional[str] = None,
+            cursor: Optional[RecordsCursor] = None,
+            concurrency: int = 4,
+    ) -> AsyncIterator[Tuple[int, Union[dict, Exception]]]:
+        """
+        Yields (0, record) for all deposit records between time_start and time_end (now by default),
+        see `_iter_records` for windows, concurrency and resuming with a cursor.
+        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Deposit-Record
+        """
+        async for item in self._iter_records(
+                'SPOT_iter_deposit_records', ENDPOINTS['deposit_records'], 'orderId', 100, {'coin': ticker},
+                time_start, time_end, cursor, concurrency,
+        ):
+            yield item
+
+    async def SPOT_iter_bills(
+            self,
+            time_start: Optional[Union[int, str]] = None,
+            time_end: Optional[Union[int, str]] = None,
+            ticker: Optional[str] = None,
+            group_type: Optional[str] = None,
+            business_type: Optional[str] = None,
+            cursor: Optional[RecordsCursor] = None,
+            concurrency: int = 4,
+    ) -> AsyncIterator[Tuple[int, Union[dict, Exception]]]:
+        """
+        Yields (0, record) for all account bills between time_start and time_end (now by default),
+        optionally filtered by group_type (e.g., deposit, withdraw, transfer) and business_type,
+        see `_iter_records` for windows, concurrency and resuming with a cursor.
+        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Account-Bills
+        """
+        async for item in self._iter_records(
+                'SPOT_iter_bills', ENDPOINTS['account_bills'], 'billId', 500,
+                {'coin': ticker, 'groupType': group_type, 'businessType': business_type},
+                time_start, time_end, cursor, concurrency,
+        ):
+            yield item
+
+    async def SPOT_iter_transfer_records(
+            self,
+            ticker: str,
+            time_start: Optional[Union[int, str]] = None,
+            time_end: Optional[Union[int, str]] = None,
+            from_type: Optional[str] = None,
+            cursor: Optional[RecordsCursor] = None,
+            concurrency: int = 4,
+    ) -> AsyncIterator[Tuple[int, Union[dict, Exception]]]:
+        """
+        Yields (0, record) for all transfer records of a specific coin between time_start and time_end (now by default),
+        optionally filtered by the source account type from_type (e.g., spot, usdt_futures),
+        see `_iter_records` for windows, concurrency and resuming with a cursor.
+        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Transfer-Record
+        """
+        async for item in self._iter_records(
+                'SPOT_iter_transfer_records', ENDPOINTS['transfer_records'], 'transferId', 500,
+                {'coin': ticker, 'fromType': from_type},
+                time_start, time_end, cursor, concurrency,
+        ):
+            yield item
+
     async def SUBACCOUNT_get_subaccounts(self, ) -> Tuple[int, Union[list, Exception]]:
         """
         Gets the names of all subaccounts created under the main Bitget account.
         Endpoint: https://www.bitget.com/api-doc/common/vsubaccount/Get-Virtual-Subaccount-List
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'SUBACCOUNT_get_subaccounts'
+        status, result = await self._call(log_process, ENDPOINTS['subaccount_list'], shape=lambda data: [
+            subaccount['subAccountUid'] for subaccount in data['subAccountList']
+        ])
+        if status == 0 and not result:
+            return -1, Exception(f'{log_process} | Empty subaccounts list!')
+        return status, result
+
+    async def SUBACCOUNT_get_snapshot(self, max_age: Optional[float] = None) -> Tuple[int, Union[SubaccountSnapshot, Exception]]:
+        """
+        Gets the assets of all subaccounts (walking through all pages) and indexes them by subaccount id and coin.
+        The last snapshot is reused if it is not older than max_age seconds (subaccount_snapshot_ttl by default).
+        Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Subaccount-Assets
+        """
+        log_process = 'SUBACCOUNT_get_snapshot'
         try:
-            endpoint = f'/api/v2/user/virtual-subaccount-list'
-            method = f'GET'
-            body = f''
-            response = await self._httpx_request(
-                endpoint=endpoint,
-                method=method,
-                body=body,
-            )
-            json = response.json()
-            if response.status_code == 200:
-                subaccounts = []
-                for subaccount in json['data']['subAccountList']:
-                    subaccounts.append(subaccount['subAccountUid'])
-                if subaccounts:
-                    return 0, subaccounts
-                else:
-                    return -1, Exception(f'{log_process} | Empty subaccounts list!')
-            else:
-                if 'msg' in json:
-                    return -1, Exception(f'{log_process} | {json["msg"]}')
-                else:
-                    return -1, Exception(f'{log_process} | {json}')
+            max_age = self._subaccount_snapshot_ttl if (max_age is None) else max_age
+            snapshot = self._subaccount_snapshot
+            if snapshot is not None and snapshot.is_fresh(max_age):
+                return 0, snapshot
+            limit = 50
+            data = []
+            id_less_than = None
+            while True:
+                status, result = await self._call(log_process, ENDPOINTS['subaccount_assets'], {'limit': limit, 'idLessThan': id_less_than})
+                if status != 0:
+                    return status, result
+                page = result or []
+                data.extend(page)
+                if len(page) < limit or 'id' not in page[-1]:
+                    snapshot = SubaccountSnapshot.from_json(data)
+                    self._subaccount_snapshot = snapshot
+                    return 0, snapshot
+                id_less_than = min(int(subaccount['id']) for subaccount in page)
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def SUBACCOUNT_get_balance(self, subaccount_id: str, ticker: Optional[str] = None) -> Tuple[int, Union[list, Exception]]:
+    async def SUBACCOUNT_get_balance(
+            self,
+            subaccount_id: str,
+            ticker: Optional[str] = None,
+            max_age: Optional[float] = None,
+    ) -> Tuple[int, Union[list, Exception]]:
         """
         Gets the balance for a specific coin (or for all coins) in a specific subaccount.
+        Balances are taken from the snapshot of all subaccounts, which is reused if it is not older than max_age seconds
+        (subaccount_snapshot_ttl by default), so lookups of many subaccounts do not walk all pages every time.
         Endpoint: https://www.bitget.com/api-doc/spot/account/Get-Subaccount-Assets
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'SUBACCOUNT_get_balance'
         try:
-            endpoint = f'/api/v2/spot/account/subaccount-assets'
-            method = f'GET'
-            body = f''
-            response = await self._httpx_request(
-                endpoint=endpoint,
-                method=method,
-                body=body,
-            )
-            json = response.json()
-            if response.status_code == 200:
-                for subaccount in json['data']:
-                    if str(subaccount['userId']) == subaccount_id:
-                        assets: list = subaccount['assetsList']
-                        if ticker is None:
-                            return 0, assets
-                        else:
-                            for asset in assets:
-                                if asset['coin'] == ticker:
-                                    return 0, [asset]
+            status, result = await self.SUBACCOUNT_get_snapshot(max_age=max_age)
+            if status == 0:
+                if ticker is None:
+                    assets = result.get_assets(subaccount_id)
+                    if assets is not None:
+                        return 0, assets
+                else:
+                    asset = result.get_asset(subaccount_id, ticker)
+                    if asset is not None:
+                        return 0, [asset]
                 return -1, Exception(f'{log_process} | No such data in response!')
             else:
-                if 'msg' in json:
-                    return -1, Exception(f'{log_process} | {json["msg"]}')
-                else:
-                    return -1, Exception(f'{log_process} | {json}')
+                return -1, Exception(f'{log_process} | {result}')
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def SUBACCOUNT_transfer_to_main(self, subaccount_id: str, ticker: str, amount: float) -> Tuple[int, Union[str, Exception]]:
+    async def SUBACCOUNT_transfer_to_main(self, subaccount_id: str, ticker: str, amount: Union[float, str]) -> Tuple[int, Union[str, Exception]]:
         """
         Transfers coins from a subaccount to the main account for a specific coin from a specific subaccount.
         Endpoint: https://www.bitget.com/api-doc/spot/account/Sub-Transfer
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'SUBACCOUNT_transfer_to_main'
         try:
-            status, result = await self.SPOT_get_account_info()
+            status, result = await self._get_main_user_id()
             if status == 0:
-                endpoint = f'/api/v2/spot/wallet/subaccount-transfer'
-                method = f'POST'
                 body = {
                     'fromType': 'spot',
                     'toType': 'spot',
                     'amount': amount,
                     'coin': ticker,
                     'fromUserId': int(subaccount_id),
-                    'toUserId': result['data']['userId'],
+                    'toUserId': result,
                 }
-                response = await self._httpx_request(
-                    endpoint=endpoint,
-                    method=method,
-                    body=body,
-                )
-                json = response.json()
-                if response.status_code == 200:
-                    return 0, json['data']['transferId']
-                else:
-                    if 'msg' in json:
-                        return -1, Exception(f'{log_process} | {json["msg"]}')
-                    else:
-                        return -1, Exception(f'{log_process} | {json}')
+                status, result = await self._call(log_process, ENDPOINTS['subaccount_transfer'], body=body)
+                if status != 0:
+                    return status, result
+                # Balances changed, so the cached subaccount snapshot is stale
+                self._subaccount_snapshot = None
+                return 0, result['transferId']
             else:
                 return -1, Exception(f'{log_process} | {result}')
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    def _get_httpx_client(self, ) -> Union[Client, AsyncClient]:
-        if self._asynchrony:
-            httpx_client = httpx.AsyncClient(proxy=self.proxy)
-        else:
-            httpx_client = httpx.Client(proxy=self.proxy)
-        return httpx_client
+    async def SUBACCOUNT_sweep_to_main(
+            self,
+            tickers: Optional[Iterable[str]] = None,
+            min_amount: float = 0.0,
+            subaccount_ids: Optional[Iterable[str]] = None,
+            concurrency: int = 5,
+    ) -> Tuple[int, Union[List[dict], Exception]]:
+        """
+        Transfers all available balances (or balances of specific coins) greater than min_amount
+        from all subaccounts (or from specific subaccounts) to the main account.
+        Assets are fetched once for all subaccounts, and transfers are posted with at most `concurrency` simultaneous requests.
+        Returns a report with a dict for every transfer (subaccount_id, ticker, amount, status and transfer_id or error).
+        """
+        log_process = 'SUBACCOUNT_sweep_to_main'
+        try:
+            status, result = await self._get_main_user_id()
+            if status != 0:
+                return -1, Exception(f'{log_process} | {result}')
+            # Transfers are sized by the balances, so they are always fetched fresh
+            status, result = await self.SUBACCOUNT_get_snapshot(max_age=0)
+            if status != 0:
+                return -1, Exception(f'{log_process} | {result}')
+            balances = list(result.iter_balances(tickers=tickers, min_amount=min_amount, subaccount_ids=subaccount_ids))
+            semaphore = asyncio.Semaphore(max(1, concurrency))
 
-    async def _httpx_request(self, method: str, endpoint: str, body: Union[str, dict]) -> Response:
-        timestamp = self.time
-        signature = self._get_signature(timestamp, method, endpoint, body)
-        headers = {
-            'ACCESS-KEY': self._api_key,
-            'ACCESS-SIGN': signature,
-            'ACCESS-PASSPHRASE': self._passphrase,
-            'ACCESS-TIMESTAMP': timestamp,
-            'locale': 'en-US',
-            'Content-Type': 'application/json',
+            async def transfer(subaccount_id: str, ticker: str, amount: str) -> dict:
+                async with semaphore:
+                    transfer_status, transfer_result = await self.SUBACCOUNT_transfer_to_main(
+                        subaccount_id=subaccount_id,
+                        ticker=ticker,
+                        amount=amount,
+                    )
+                report = {'subaccount_id': subaccount_id, 'ticker': ticker, 'amount': amount, 'status': transfer_status}
+                if transfer_status == 0:
+                    report['transfer_id'] = transfer_result
+                else:
+                    report['error'] = transfer_result
+                return report
+
+            return 0, list(await asyncio.gather(*[transfer(*balance) for balance in balances]))
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def TRADE_place_order(
+            self,
+            ticker: str,
+            side: str,
+            size: Union[float, str],
+            price: Optional[Union[float, str]] = None,
+            order_type: Optional[str] = None,
+            force: str = 'gtc',
+            client_oid: Optional[str] = None,
+    ) -> Tuple[int, Union[dict, Exception]]:
+        """
+        Places a spot order for coin USDT pair: side is buy or sell, order_type is limit (default if price is specified)
+        or market, force is gtc, post_only, fok or ioc (limit orders only). Size is in base coin (in USDT for market buys).
+        Returns {'orderId': ..., 'clientOid': ...}.
+        Endpoint: https://www.bitget.com/api-doc/spot/trade/Place-Order
+        """
+        body = {
+            'symbol': f'{ticker}USDT',
+            **self._get_order(side, size, price, order_type, force, client_oid),
         }
-        if isinstance(body, str):
-            response = await afh(
-                self._httpx_client.request, self._asynchrony,
-                method=method, url=(self.host + endpoint + body), headers=headers,
+        return await self._call('TRADE_place_order', ENDPOINTS['place_order'], body=body)
+
+    async def TRADE_submit_order(
+            self,
+            ticker: str,
+            side: str,
+            size: Union[float, str],
+            price: Optional[Union[float, str]] = None,
+            order_type: Optional[str] = None,
+            force: str = 'gtc',
+            client_oid: Optional[str] = None,
+    ) -> Tuple[int, Union[dict, Exception]]:
+        """
+        Places a spot order like `TRADE_place_order`, but through the shared `order_batcher`: orders of the same symbol
+        submitted at about the same time are coalesced into `batch-orders` requests, and every caller gets its own result.
+        """
+        log_process = 'TRADE_submit_order'
+        try:
+            return await self.order_batcher.submit(ticker, self._get_order(side, size, price, order_type, force, client_oid))
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def TRADE_place_orders(self, ticker: str, orders: List[dict]) -> Tuple[int, Union[dict, Exception]]:
+        """
+        Places many spot orders for coin USDT pair by batch requests (50 orders per request).
+        Every order is a Bitget order dict (side, orderType, force, price, size, clientOid).
+        Returns {'successList': [...], 'failureList': [...], 'errors': [...]} for all orders: orders of a failed batch request
+        are in the failure list (the request errors are in `errors`), and the call fails only if no batch request succeeded.
+        Endpoint: https://www.bitget.com/api-doc/spot/trade/Batch-Place-Orders
+        """
+        return await self._call_batches('TRADE_place_orders', ENDPOINTS['batch_orders'], ticker, orders)
+
+    async def TRADE_cancel_order(
+            self,
+            ticker: str,
+            order_id: Optional[str] = None,
+            client_oid: Optional[str] = None,
+    ) -> Tuple[int, Union[dict, Exception]]:
+        """
+        Cancels a spot order of coin USDT pair by its order_id or client_oid.
+        Endpoint: https://www.bitget.com/api-doc/spot/trade/Cancel-Order
+        """
+        body = {'symbol': f'{ticker}USDT'}
+        if order_id is not None:
+            body['orderId'] = order_id
+        if client_oid is not None:
+            body['clientOid'] = client_oid
+        return await self._call('TRADE_cancel_order', ENDPOINTS['cancel_order'], body=body)
+
+    async def TRADE_cancel_orders(
+            self,
+            ticker: str,
+            order_ids: Iterable[str] = (),
+            client_oids: Iterable[str] = (),
+    ) -> Tuple[int, Union[dict, Exception]]:
+        """
+        Cancels many spot orders of coin USDT pair by their order ids and/or client order ids by batch requests (50 orders per request).
+        Returns {'successList': [...], 'failureList': [...], 'errors': [...]} for all orders like `TRADE_place_orders`.
+        Endpoint: https://www.bitget.com/api-doc/spot/trade/Batch-Cancel-Orders
+        """
+        orders = [{'orderId': order_id} for order_id in order_ids] + [{'clientOid': client_oid} for client_oid in client_oids]
+        return await self._call_batches('TRADE_cancel_orders', ENDPOINTS['batch_cancel_order'], ticker, orders)
+
+    async def TRADE_get_order(self, order_id: Optional[str] = None, client_oid: Optional[str] = None) -> Tuple[int, Union[dict, Exception]]:
+        """
+        Gets information about a spot order (e.g., status, priceAvg, baseVolume) by its order_id or client_oid.
+        Endpoint: https://www.bitget.com/api-doc/spot/trade/Get-Order-Info
+        """
+        log_process = 'TRADE_get_order'
+        status, result = await self._call(log_process, ENDPOINTS['order_info'], {'orderId': order_id, 'clientOid': client_oid})
+        if status == 0:
+            if result:
+                return 0, result[0]
+            else:
+                return -1, Exception(f'{log_process} | No such order!')
+        return status, result
+
+    async def TRADE_get_open_orders(self, ticker: Optional[str] = None) -> Tuple[int, Union[list, Exception]]:
+        """
+        Gets unfilled spot orders of coin USDT pair (or of all pairs).
+        Endpoint: https://www.bitget.com/api-doc/spot/trade/Get-Unfilled-Orders
+        """
+        return await self._call('TRADE_get_open_orders', ENDPOINTS['unfilled_orders'], {'symbol': None if (ticker is None) else f'{ticker}USDT'})
+
+    def open(self, ) -> 'MyBitget':
+        """
+        Creates the own httpx client in advance (otherwise it is created by the first request).
+        In a forked process the client inherited from the parent is abandoned without closing
+        (its connections belong to the parent) and a new one is created.
+        """
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            if self._owns_executor:
+                self._executor = None
+            if self._owns_httpx_client:
+                self._httpx_client = None
+        if self._httpx_client is None:
+            self._httpx_client = create_httpx_client(self._asynchrony, self.proxy)
+        return self
+
+    async def aclose(self, ) -> None:
+        """
+        Sends the queued orders, closes the own httpx client and stops the own worker threads
+        (an external client and thread pool are left open). The instance can still be used: the next request opens a new client.
+        """
+        if self._order_batcher is not None:
+            await self._order_batcher.close()
+        if self._owns_httpx_client and self._httpx_client is not None and self._pid == os.getpid():
+            httpx_client, self._httpx_client = self._httpx_client, None
+            await close_httpx_client(httpx_client)
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self, ) -> 'MyBitget':
+        return self.open()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _get_main_user_id(self, ) -> Tuple[int, Union[str, Exception]]:
+        if self._main_user_id is None:
+            status, result = await self.SPOT_get_account_info()
+            if status != 0:
+                return status, result
+            self._main_user_id = result['data']['userId']
+        return 0, self._main_user_id
+
+    async def _call(
+            self,
+            process: str,
+            endpoint: Endpoint,
+            params: Optional[dict] = None,
+            body: Optional[dict] = None,
+            shape: Optional[Callable[[Any], Any]] = None,
+    ) -> Tuple[int, Any]:
+        """
+        Sends the request described by the endpoint (see `ENDPOINTS`) and returns the shaped result
+        or the mapped Bitget error prefixed with the process (method) name.
+        The optional shape is applied to the endpoint result, so an unexpected response (e.g., null data)
+        is returned as an error as well.
+        """
+        try:
+            if endpoint.method == 'GET':
+                query = {key: value for key, value in params.items() if value is not None} if params else None
+                payload = f'?{urlencode(query)}' if query else ''
+            else:
+                payload = body if (body is not None) else {}
+            response = await self._httpx_request(method=endpoint.method, endpoint=endpoint.path, body=payload, auth=endpoint.auth)
+            if response.status_code == 200:
+                result = endpoint.shape(response.data)
+                return 0, result if (shape is None) else shape(result)
+            else:
+                return -1, ApiError(f'{process} | {endpoint.get_error(response.data)}', response.status_code)
+        except Exception as e:
+            return -1, Exception(f'{process} | {e}')
+
+    async def _iter_records(
+            self,
+            process: str,
+            endpoint: Endpoint,
+            id_field: str,
+            limit: int,
+            params: dict,
+            time_start: Optional[Union[int, str]],
+            time_end: Optional[Union[int, str]],
+            cursor: Optional[RecordsCursor],
+            concurrency: int,
+    ) -> AsyncIterator[Tuple[int, Union[dict, Exception]]]:
+        """
+        Walks through the paged records endpoint: the period is split into time windows (see `RecordsCursor`)
+        fetched concurrently by at most `concurrency` workers, and every window is paged with `idLessThan`.
+        Records are yielded as (0, record) while pages arrive (in no particular order between windows),
+        and the first failed request yields (-1, error) and stops the iteration.
+        Pass a cursor (e.g., `RecordsCursor.create(time_start)` or a restored one) to resume an interrupted export;
+        time_start and time_end are ignored in that case.
+        """
+        if cursor is None:
+            if time_start is None:
+                yield -1, Exception(f'{process} | Either time_start or cursor must be specified!')
+                return
+            cursor = RecordsCursor.create(time_start, time_end)
+
+        async def fetch(start: int, end: int, id_less_than: Optional[str], page_limit: int) -> Tuple[int, Any]:
+            return await self._call(process, endpoint, {
+                **params,
+                'startTime': start,
+                'endTime': end,
+                'limit': page_limit,
+                'idLessThan': id_less_than,
+            })
+
+        async for item in paginate(fetch, cursor, id_field, limit=limit, concurrency=concurrency):
+            yield item
+
+    async def _call_batches(self, process: str, endpoint: Endpoint, ticker: str, orders: List[dict]) -> Tuple[int, Union[dict, Exception]]:
+        """
+        Sends the orders by batch requests of 50 orders (concurrently) and merges their success and failure lists.
+        Orders of a failed batch request are put into the failure list with the request error (also listed in `errors`
+        with the batch index), so orders placed by other batches are never hidden. Fails only if every batch failed.
+        """
+        symbol = f'{ticker}USDT'
+        batches = [orders[i:i + 50] for i in range(0, len(orders), 50)]
+        results = await asyncio.gather(*[self._call(process, endpoint, body={'symbol': symbol, 'orderList': batch}) for batch in batches])
+        merged = {'successList': [], 'failureList': [], 'errors': []}
+        for index, (batch, (status, result)) in enumerate(zip(batches, results)):
+            if status != 0:
+                merged['errors'].append({'batch': index, 'error': result})
+                for order in batch:
+                    failure = {key: order[key] for key in ('orderId', 'clientOid') if key in order}
+                    failure.update({'errorMsg': str(result), 'errorCode': None})
+                    merged['failureList'].append(failure)
+                continue
+            merged['successList'].extend(result.get('successList') or [])
+            merged['failureList'].extend(result.get('failureList') or [])
+        if batches and len(merged['errors']) == len(batches):
+            return -1, merged['errors'][0]['error']
+        return 0, merged
+
+    @staticmethod
+    def _get_order(
+            side: str,
+            size: Union[float, str],
+            price: Optional[Union[float, str]],
+            order_type: Optional[str],
+            force: str,
+            client_oid: Optional[str],
+    ) -> dict:
+        order_type = order_type or ('market' if (price is None) else 'limit')
+        order = {'side': side, 'orderType': order_type, 'force': force, 'size': str(size)}
+        if order_type == 'limit':
+            order['price'] = str(price)
+        if client_oid is not None:
+            order['clientOid'] = client_oid
+        return order
+
+    async def _find_withdrawal(self, client_oid: str, time_start: str) -> Tuple[int, Union[Optional[dict], Exception]]:
+        """Looks up the withdrawal record posted after time_start by its clientOid (returns None if there is no such withdrawal)."""
+        status, result = await self._call('SPOT_find_withdrawal', ENDPOINTS['withdrawal_records'], {
+            'startTime': int(time_start) - 60_000,
+            'endTime': self.time,
+            'clientOid': client_oid,
+        })
+        if status != 0:
+            return status, result
+        return 0, next((record for record in result or [] if record.get('clientOid') == client_oid), None)
+
+    async def _httpx_request(self, method: str, endpoint: str, body: Union[str, dict], auth: bool = True) -> BitgetResponse:
+        if method == 'GET' and isinstance(body, str) and self._single_flight.is_enabled(endpoint):
+            # Signed responses belong to the account, so they are only shared between calls with the same API key
+            # (a single-flight instance may be shared by clients of different accounts, e.g., in `MyBitgetPool`)
+            return await self._single_flight.do(
+                (self.host, endpoint, body, self._api_key if auth else None),
+                lambda: self._httpx_send(method=method, endpoint=endpoint, body=body, auth=auth),
             )
+        return await self._httpx_send(method=method, endpoint=endpoint, body=body, auth=auth)
+
+    async def _httpx_send(self, method: str, endpoint: str, body: Union[str, dict], auth: bool = True) -> BitgetResponse:
+        metrics = self._metrics
+        timings = None
+        if metrics is not None:
+            metrics.before_request(endpoint, method)
+            timings = {'queue': 0.0, 'sign': 0.0, 'network': 0.0}
+            started_at = time.perf_counter()
+        try:
+            result = await self._httpx_send_with_retries(method=method, endpoint=endpoint, body=body, auth=auth, timings=timings)
+        except Exception as e:
+            if metrics is not None:
+                timings['total'] = time.perf_counter() - started_at
+                metrics.after_request(endpoint, method, None, timings, error=e)
+            raise
+        if metrics is not None:
+            timings['total'] = time.perf_counter() - started_at
+            metrics.after_request(endpoint, method, result.status_code, timings, size=result.size)
+        return result
+
+    async def _httpx_send_with_retries(
+            self,
+            method: str,
+            endpoint: str,
+            body: Union[str, dict],
+            auth: bool,
+            timings: Optional[Dict[str, float]],
+    ) -> BitgetResponse:
+        # The body is encoded once: the same string is signed and sent (also on retries)
+        if isinstance(body, str):
+            url = self.host + endpoint + body
+            payload = body
+            content = None
         else:
-            response = await afh(
-                self._httpx_client.request, self._asynchrony,
-                method=method, url=(self.host + endpoint), headers=headers, json=body,
+            url = self.host + endpoint
+            payload = json.dumps(body, separators=(',', ':'))
+            content = payload.encode('utf-8')
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self._circuit_breaker.allow():
+                raise CircuitOpenError(f'Circuit breaker for {self.host} is open (retry in {self._circuit_breaker.retry_in:.1f}s)!')
+            # In the half-open state only the trial request is allowed, so this request holds the trial slot
+            trial = self._circuit_breaker.state == CircuitBreaker.HALF_OPEN
+            try:
+                response = await self._httpx_attempt(method=method, endpoint=endpoint, url=url, payload=payload, content=content, auth=auth, timings=timings)
+            except get_httpx().TransportError:
+                self._circuit_breaker.record_failure()
+                if self._retry_policy.can_retry(method, attempt):
+                    await asyncio.sleep(self._retry_policy.get_delay(attempt))
+                    continue
+                raise
+            except BaseException:
+                # Cancelled (e.g., by a timeout) or failed before a response: the host is not to blame
+                if trial:
+                    self._circuit_breaker.release()
+                raise
+            if response.status_code >= 500:
+                self._circuit_breaker.record_failure()
+            else:
+                self._circuit_breaker.record_success()
+            if response.status_code in self._retry_policy.statuses and self._retry_policy.can_retry(method, attempt):
+                await asyncio.sleep(self._retry_policy.get_delay(attempt, response.headers.get('Retry-After')))
+                continue
+            if timings is None:
+                result = BitgetResponse.decode(response.status_code, response.headers, response.content, self.json_decoder)
+            else:
+                decode_started_at = time.perf_counter()
+                result = BitgetResponse.decode(response.status_code, response.headers, response.content, self.json_decoder)
+                timings['decode'] = time.perf_counter() - decode_started_at
+            self._log_debug(result.data)
+            return result
+
+    async def _httpx_attempt(
+            self,
+            method: str,
+            endpoint: str,
+            url: str,
+            payload: str,
+            content: Optional[bytes],
+            auth: bool,
+            timings: Optional[Dict[str, float]],
+    ) -> 'httpx.Response':
+        if timings is None:
+            await self._rate_limiter.acquire(endpoint)
+            headers = self._get_headers(method, endpoint, payload) if auth else self._public_headers
+            return await afh(
+                self.httpx_client.request, self._asynchrony,
+                method=method, url=url, headers=headers, content=content, executor=self.executor,
             )
-        self._log_debug(response.json())
+        started_at = time.perf_counter()
+        await self._rate_limiter.acquire(endpoint)
+        queued_at = time.perf_counter()
+        headers = self._get_headers(method, endpoint, payload) if auth else self._public_headers
+        signed_at = time.perf_counter()
+        response = await afh(
+            self.httpx_client.request, self._asynchrony,
+            method=method, url=url, headers=headers, content=content, executor=self.executor,
+        )
+        timings['queue'] += queued_at - started_at
+        timings['sign'] += signed_at - queued_at
+        timings['network'] += time.perf_counter() - signed_at
         return response
 
-    def _get_signature(self, timestamp: str, method: str, endpoint: str, body: Union[str, dict]) -> str:
-        message = str(timestamp) + str.upper(method) + endpoint + (json.dumps(body, separators=(',', ':')) if isinstance(body, dict) else body)
-        mac = hmac.new(bytes(self._secret_key, encoding='utf-8'), bytes(message, encoding='utf-8'), digestmod='sha256')
-        signature = str(base64.b64encode(mac.digest()), 'utf8')
+    def _get_headers(self, method: str, endpoint: str, payload: str) -> Dict[str, str]:
+        timestamp = self.time
+        headers = self._headers.copy()
+        headers['ACCESS-SIGN'] = self._get_signature(timestamp, method, endpoint, payload)
+        headers['ACCESS-TIMESTAMP'] = timestamp
+        return headers
+
+    def _get_signature(self, timestamp: str, method: str, endpoint: str, payload: str) -> str:
+        mac = self._hmac.copy()
+        mac.update(f'{timestamp}{method.upper()}{endpoint}{payload}'.encode('utf-8'))
+        signature = base64.b64encode(mac.digest()).decode('ascii')
         return signature
 
-    def _log_debug(self, message: str) -> None:
-        if self._logger is not None:
-            self._logger.debug(f'{self.name} | {message}')
+    def _log_debug(self, message: Any) -> None:
+        # Formatting is deferred to the logger and skipped entirely unless DEBUG is enabled
+        if self._logger is not None and self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('%s | %s', self.name, message)
+
+    @property
+    def metadata_cache(self, ) -> MetadataCache:
+        return self._metadata_cache
+
+    @property
+    def single_flight(self, ) -> SingleFlight:
+        return self._single_flight
+
+    @property
+    def rate_limiter(self, ) -> RateLimiter:
+        return self._rate_limiter
+
+    @property
+    def circuit_breaker(self, ) -> CircuitBreaker:
+        return self._circuit_breaker
+
+    @property
+    def withdrawal_tracker(self, ) -> WithdrawalTracker:
+        if self._withdrawal_tracker is None:
+            self._withdrawal_tracker = WithdrawalTracker(self, logger=self._logger)
+        return self._withdrawal_tracker
+
+    @property
+    def order_batcher(self, ) -> OrderBatcher:
+        if self._order_batcher is None:
+            self._order_batcher = OrderBatcher(self)
+        return self._order_batcher
+
+    @property
+    def candle_store(self, ) -> CandleStore:
+        return self._candle_store
+
+    @property
+    def metrics(self, ) -> Optional[Metrics]:
+        return self._metrics
+
+    @property
+    def httpx_client(self, ) -> Union['Client', 'AsyncClient']:
+        """httpx client used for requests (the own client is created on the first use and recreated in a forked process)."""
+        if self._httpx_client is None or self._pid != os.getpid():
+            self.open()
+        return self._httpx_client
+
+    @property
+    def json_decoder(self, ) -> JSONDecoder:
+        if self._json_decoder is None:
+            self._json_decoder = get_decoder()
+        return self._json_decoder
+
+    @property
+    def executor(self, ) -> Optional[ThreadPoolExecutor]:
+        if self._executor is None and not self._asynchrony and self._sync_workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=self._sync_workers, thread_name_prefix='my-bitget')
+        return self._executor
 
     @property
     def time(self, ) -> str:
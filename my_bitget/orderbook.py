@@ -0,0 +1,314 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import json
+import time
+import zlib
+import bisect
+import asyncio
+
+from .stream import PublicStream
+
+
+def get_checksum(bids: List[Tuple[str, str]], asks: List[Tuple[str, str]], depth: int = 25) -> int:
+    """
+    Returns the Bitget order book checksum: signed CRC32 of the first `depth` bid and ask levels
+    interleaved as "bid_price:bid_size:ask_price:ask_size:..." (prices and sizes as sent by Bitget).
+    """
+    parts = []
+    for i in range(depth):
+        if i < len(bids):
+            parts.append(f'{bids[i][0]}:{bids[i][1]}')
+        if i < len(asks):
+            parts.append(f'{asks[i][0]}:{asks[i][1]}')
+    checksum = zlib.crc32(':'.join(parts).encode('utf-8'))
+    return checksum - (1 << 32) if (checksum >= 1 << 31) else checksum
+
+
+class BookSide:
+    """
+    One side of the order book: a sorted array of price keys (negated prices for bids, so the best level is always first)
+    and a dict of levels by key. Lookups are O(log n) binary searches and size changes of existing levels are O(1),
+    while new and removed levels shift the array (O(n) memmove, which is cheap for the depth of a real book).
+    """
+
+    __slots__ = ('descending', '_keys', '_levels')
+
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self._keys: List[float] = []
+        self._levels: Dict[float, Tuple[float, float, str, str]] = {}
+
+    def __len__(self, ) -> int:
+        return len(self._keys)
+
+    def clear(self, ) -> None:
+        self._keys = []
+        self._levels = {}
+
+    def update(self, price: str, size: str) -> None:
+        """Sets the size of the price level (a zero size removes the level)."""
+        value = float(price)
+        key = -value if self.descending else value
+        amount = float(size)
+        if amount == 0:
+            if self._levels.pop(key, None) is not None:
+                del self._keys[bisect.bisect_left(self._keys, key)]
+            return
+        if key not in self._levels:
+            bisect.insort(self._keys, key)
+        self._levels[key] = (value, amount, price, size)
+
+    def best(self, ) -> Optional[Tuple[float, float]]:
+        """Returns (price, size) of the best level or None if the side is empty."""
+        if not self._keys:
+            return None
+        level = self._levels[self._keys[0]]
+        return level[0], level[1]
+
+    def top(self, depth: int) -> List[Tuple[float, float]]:
+        """Returns (price, size) of the best `depth` levels."""
+        return [self._levels[key][:2] for key in self._keys[:depth]]
+
+    def top_raw(self, depth: int) -> List[Tuple[str, str]]:
+        """Returns (price, size) strings (as sent by Bitget) of the best `depth` levels."""
+        return [self._levels[key][2:] for key in self._keys[:depth]]
+
+    def get_size(self, price: float) -> float:
+        level = self._levels.get(-price if self.descending else price)
+        return 0.0 if (level is None) else level[1]
+
+    def vwap(self, size: float) -> Optional[float]:
+        """Returns the average price of filling `size` from the best levels, or None if the side is not deep enough."""
+        remaining = size
+        cost = 0.0
+        for key in self._keys:
+            price, amount = self._levels[key][:2]
+            fill = amount if (amount < remaining) else remaining
+            cost += fill * price
+            remaining -= fill
+            if remaining <= 0:
+                return cost / size
+        return None
+
+
+class OrderBook:
+    """
+    Local order book of one symbol maintained from a depth snapshot and incremental updates.
+    Every update is checked against the sequence numbers and the checksum sent by Bitget;
+    a broken book is marked as not synced (and ignores updates) until the next snapshot.
+    """
+
+    checksum_depth = 25
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.synced = False
+        self.seq: Optional[int] = None
+        self.ts: Optional[int] = None
+        self.updated_at: Optional[float] = None
+        self.snapshots = 0
+        self.updates = 0
+        self.mismatches = 0
+
+    @classmethod
+    def from_rest(cls, symbol: str, data: dict) -> 'OrderBook':
+        """Creates the book from a REST depth snapshot (not synced: it has no sequence number to continue from)."""
+        book = cls(symbol)
+        book.apply_snapshot(data)
+        book.synced = False
+        return book
+
+    def apply_message(self, message: dict) -> bool:
+        """Applies a WebSocket `books` message (snapshot or update) and returns False if the book is broken."""
+        ok = True
+        for data in message.get('data') or []:
+            if message.get('action') == 'update':
+                ok = self.apply_update(data) and ok
+            else:
+                self.apply_snapshot(data)
+        return ok
+
+    def apply_snapshot(self, data: dict) -> bool:
+        self.bids.clear()
+        self.asks.clear()
+        for price, size in data.get('bids') or []:
+            self.bids.update(price, size)
+        for price, size in data.get('asks') or []:
+            self.asks.update(price, size)
+        self.snapshots += 1
+        self._set_state(data)
+        self.synced = self.verify(data.get('checksum'))
+        if not self.synced:
+            self.mismatches += 1
+        return self.synced
+
+    def apply_update(self, data: dict) -> bool:
+        """Applies an incremental update; returns False (and marks the book as not synced) on a gap or checksum mismatch."""
+        if not self.synced:
+            return False
+        pseq = data.get('pseq')
+        if pseq is not None and self.seq is not None and int(pseq) != self.seq:
+            self.mismatches += 1
+            self.synced = False
+            return False
+        for price, size in data.get('bids') or []:
+            self.bids.update(price, size)
+        for price, size in data.get('asks') or []:
+            self.asks.update(price, size)
+        self.updates += 1
+        self._set_state(data)
+        if not self.verify(data.get('checksum')):
+            self.mismatches += 1
+            self.synced = False
+            return False
+        return True
+
+    def verify(self, checksum: Optional[Union[int, str]]) -> bool:
+        """Checks the book against the checksum sent by Bitget (missing checksums are not checked)."""
+        if checksum is None:
+            return True
+        depth = self.checksum_depth
+        return get_checksum(self.bids.top_raw(depth), self.asks.top_raw(depth), depth) == int(checksum)
+
+    def best_bid(self, ) -> Optional[Tuple[float, float]]:
+        return self.bids.best()
+
+    def best_ask(self, ) -> Optional[Tuple[float, float]]:
+        return self.asks.best()
+
+    @property
+    def mid(self, ) -> Optional[float]:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    @property
+    def spread(self, ) -> Optional[float]:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def vwap(self, side: str, size: float) -> Optional[float]:
+        """Returns the average price of a market order (side is buy or sell) of `size` coins, or None if the book is not deep enough."""
+        return (self.asks if side == 'buy' else self.bids).vwap(size)
+
+    @property
+    def age(self, ) -> Optional[float]:
+        return None if (self.updated_at is None) else time.monotonic() - self.updated_at
+
+    def _set_state(self, data: dict) -> None:
+        if data.get('seq') is not None:
+            self.seq = int(data['seq'])
+        if data.get('ts') is not None:
+            self.ts = int(data['ts'])
+        self.updated_at = time.monotonic()
+
+    def __repr__(self, ) -> str:
+        return f'OrderBook({self.symbol}, bid={self.best_bid()}, ask={self.best_ask()}, synced={self.synced})'
+
+
+def replay(messages: Iterable[Union[str, dict]], books: Optional[Dict[str, OrderBook]] = None) -> Dict[str, OrderBook]:
+    """
+    Applies recorded `books` messages (dicts or JSON lines, e.g., written by `OrderBookStream(recorder=...)`)
+    to the books by symbol (created if missing) and returns the books.
+    """
+    books = {} if (books is None) else books
+    for message in messages:
+        if isinstance(message, str):
+            if not message.strip():
+                continue
+            message = json.loads(message)
+        symbol = (message.get('arg') or {}).get('instId')
+        if symbol is None:
+            continue
+        book = books.get(symbol)
+        if book is None:
+            book = books[symbol] = OrderBook(symbol)
+        book.apply_message(message)
+    return books
+
+
+class OrderBookStream(PublicStream):
+    """
+    Streams the `books` channel (full depth with incremental updates) of spot USDT pairs into local `OrderBook` objects.
+    Books are resubscribed (which makes Bitget send a new snapshot) on a sequence gap or checksum mismatch.
+    If a `MyBitget` client is passed, books are filled from REST depth snapshots before the stream is synced.
+    """
+
+    quote = 'USDT'
+
+    def __init__(
+            self,
+            tickers: Iterable[str] = (),
+            client: Any = None,
+            channel: str = 'books',
+            recorder: Optional[Callable[[dict], Any]] = None,
+            **kwargs: Any,
+    ):
+        """
+        :param tickers: Tickers (e.g., BTC, ETH) subscribed on start.
+        :param client: Asynchronous `MyBitget` client used for initial REST snapshots (not used if not specified).
+        :param channel: Depth channel (books for incremental updates; books1, books5 or books15 for snapshots only).
+        :param recorder: Function called with every received depth message (e.g., to record streams for `replay`).
+        :param kwargs: `PublicStream` parameters.
+        """
+        super().__init__(**kwargs)
+        self.client = client
+        self.channel = channel
+        self.recorder = recorder
+        self.books: Dict[str, OrderBook] = {}
+        self.resyncs = 0
+        self._resyncing: Dict[str, asyncio.Task] = {}
+        for ticker in tickers:
+            symbol = f'{ticker}{self.quote}'
+            self.books[symbol] = OrderBook(symbol)
+            self._subscriptions[('SPOT', self.channel, symbol)] = self._on_books
+
+    def get_book(self, ticker: str) -> Optional[OrderBook]:
+        return self.books.get(f'{ticker}{self.quote}')
+
+    async def start(self, ) -> None:
+        if self.client is not None:
+            await self.load_snapshots()
+        await super().start()
+
+    async def load_snapshots(self, ) -> None:
+        """Fills the books which are not synced yet from REST depth snapshots."""
+        for symbol, book in list(self.books.items()):
+            if book.synced:
+                continue
+            status, result = await self.client.PUBLIC_get_orderbook(symbol[:-len(self.quote)])
+            if status == 0 and not book.synced:
+                self.books[symbol] = result
+            elif status != 0:
+                self._log_debug(f'REST snapshot of {symbol} failed: {result}')
+
+    async def add_tickers(self, tickers: Iterable[str]) -> None:
+        for ticker in tickers:
+            symbol = f'{ticker}{self.quote}'
+            self.books.setdefault(symbol, OrderBook(symbol))
+            await self.subscribe(self.channel, symbol, self._on_books)
+
+    async def resync(self, symbol: str) -> None:
+        """Resubscribes the symbol to receive a new snapshot."""
+        self.resyncs += 1
+        self._log_debug(f'Resync of {symbol}')
+        await self.unsubscribe(self.channel, symbol)
+        await self.subscribe(self.channel, symbol, self._on_books)
+
+    def _on_books(self, message: dict, data: List[dict]) -> None:
+        if self.recorder is not None:
+            self.recorder(message)
+        symbol = message['arg']['instId']
+        book = self.books.get(symbol)
+        if book is None:
+            return
+        if message.get('action') != 'update':
+            self._resyncing.pop(symbol, None)
+        # Updates of a broken book (or of a book filled from REST) are ignored and trigger a single resync
+        if not book.apply_message(message) and symbol not in self._resyncing:
+            self._resyncing[symbol] = asyncio.ensure_future(self.resync(symbol))
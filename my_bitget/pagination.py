@@ -0,0 +1,131 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union
+
+import json
+import time
+
+from .utils import fan_out
+
+
+DAY = 24 * 60 * 60 * 1000
+
+# Records fetcher: (start_time, end_time, id_less_than, limit) -> (status, page)
+RecordsFetcher = Callable[[int, int, Optional[str], int], Awaitable[Tuple[int, Any]]]
+
+
+class RecordsWindow:
+    """Time window of a records export with the id of the last consumed record (records are returned newest first)."""
+
+    __slots__ = ('start', 'end', 'id_less_than', 'done')
+
+    def __init__(self, start: int, end: int, id_less_than: Optional[str] = None, done: bool = False):
+        self.start = start
+        self.end = end
+        self.id_less_than = id_less_than
+        self.done = done
+
+    def __repr__(self, ) -> str:
+        return f'RecordsWindow({self.start}-{self.end}, id_less_than={self.id_less_than}, done={self.done})'
+
+
+class RecordsCursor:
+    """
+    Resumable position of a records export: the requested period split into time windows
+    (Bitget limits every records query to 90 days), each with the id of the last record yielded to the caller.
+    The cursor is updated in place while records are consumed, so an interrupted export can be saved (`to_dict`, `save`)
+    and continued later by passing the restored cursor to the same method.
+    """
+
+    def __init__(self, windows: List[RecordsWindow]):
+        self.windows = windows
+
+    @classmethod
+    def create(
+            cls,
+            time_start: Union[int, str],
+            time_end: Optional[Union[int, str]] = None,
+            window: int = 7 * DAY,
+    ) -> 'RecordsCursor':
+        """
+        :param time_start: Start of the period (timestamp in milliseconds).
+        :param time_end: End of the period (timestamp in milliseconds, now if not specified).
+        :param window: Window size in milliseconds (at most 90 days).
+        """
+        time_start = int(time_start)
+        time_end = int(time.time() * 1000) if (time_end is None) else int(time_end)
+        window = max(1, min(int(window), 90 * DAY))
+        windows = []
+        end = time_end
+        while end >= time_start:
+            start = max(time_start, end - window + 1)
+            windows.append(RecordsWindow(start, end))
+            end = start - 1
+        return cls(windows)
+
+    @property
+    def done(self, ) -> bool:
+        return all(window.done for window in self.windows)
+
+    @property
+    def pending(self, ) -> List[RecordsWindow]:
+        return [window for window in self.windows if not window.done]
+
+    def to_dict(self, ) -> dict:
+        return {'windows': [[window.start, window.end, window.id_less_than, window.done] for window in self.windows]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RecordsCursor':
+        return cls([RecordsWindow(*window) for window in data['windows']])
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path: str) -> 'RecordsCursor':
+        with open(path, 'r', encoding='utf-8') as file:
+            return cls.from_dict(json.load(file))
+
+
+async def paginate(
+        fetch: RecordsFetcher,
+        cursor: RecordsCursor,
+        id_field: str,
+        limit: int = 100,
+        concurrency: int = 4,
+        buffer: int = 8,
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Walks through all pages (with `idLessThan`) of all pending windows of the cursor and yields (0, record)
+    as pages arrive. Windows are fetched concurrently by at most `concurrency` workers, and at most `buffer` pages
+    wait for the caller, so memory usage does not depend on the length of the history.
+    On the first failed request yields (-1, error) and stops; the cursor keeps the position of the last yielded record.
+    """
+    windows = cursor.pending
+
+    async def walk(window: RecordsWindow) -> AsyncIterator[Tuple[RecordsWindow, Optional[list], Any]]:
+        id_less_than = window.id_less_than
+        while True:
+            status, result = await fetch(window.start, window.end, id_less_than, limit)
+            if status != 0:
+                yield window, None, result
+                return
+            page = result or []
+            last = len(page) < limit or id_field not in page[-1]
+            yield window, page, last
+            if last:
+                return
+            id_less_than = page[-1][id_field]
+
+    pages = fan_out(windows, walk, min(max(1, concurrency), len(windows)), buffer=max(1, buffer))
+    try:
+        async for window, page, value in pages:
+            if page is None:
+                yield -1, value
+                return
+            for record in page:
+                window.id_less_than = record.get(id_field, window.id_less_than)
+                yield 0, record
+            if value:
+                window.done = True
+    finally:
+        await pages.aclose()
@@ -0,0 +1,86 @@
+from decimal import Decimal, InvalidOperation, ROUND_DOWN
+from typing import Any, Dict, Optional, Tuple, Union
+
+import os
+import json
+import hashlib
+
+
+def get_client_oid(batch_id: str, index: int, ticker: str, chain: str, address: str, amount: str) -> str:
+    """
+    Returns the idempotency key (clientOid) of a withdrawal row: the same row of the same batch always gets the same key,
+    so a resubmitted row is rejected by Bitget instead of being sent twice.
+    """
+    return hashlib.sha256(f'{batch_id}:{index}:{ticker}:{chain}:{address}:{amount}'.encode('utf-8')).hexdigest()[:32]
+
+
+def round_withdrawal(chain_info: dict, amount: Union[float, str, Decimal]) -> Tuple[int, Union[str, Exception]]:
+    """
+    Validates the withdrawal amount against the chain rules (withdrawable, minWithdrawAmount, withdrawStep)
+    and rounds it down to withdrawMinScale decimals. Returns the rounded amount as a string.
+    """
+    if str(chain_info.get('withdrawable', 'true')).lower() != 'true':
+        return -1, Exception(f'Withdrawals on {chain_info.get("chain")} are suspended!')
+    try:
+        value = Decimal(str(amount))
+    except InvalidOperation:
+        return -1, Exception(f'Invalid amount: {amount}!')
+    scale = int(chain_info.get('withdrawMinScale') or 0)
+    value = value.quantize(Decimal(1).scaleb(-scale), rounding=ROUND_DOWN)
+    step = Decimal(str(chain_info.get('withdrawStep') or 0))
+    if step > 0:
+        value = (value / step).to_integral_value(rounding=ROUND_DOWN) * step
+    minimum = Decimal(str(chain_info.get('minWithdrawAmount') or 0))
+    if value <= 0 or value < minimum:
+        return -1, Exception(f'Amount {value} is less than the minimum withdrawal amount {minimum}!')
+    return 0, f'{value:f}'
+
+
+class WithdrawalJournal:
+    """
+    Append-only JSONL journal of a bulk withdrawal: a `pending` entry is written before every withdrawal is posted
+    and a final entry (`done`, `failed` or `invalid`) after it, so an interrupted batch can be resumed
+    without sending any row twice. `failed` is written only for definite rejections by Bitget: after a timeout or
+    a transport error the row stays `pending` and is looked up by clientOid on resume. Entries are keyed by the row clientOid.
+    """
+
+    final_states = ('done', 'failed', 'invalid')
+
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        :param path: Journal file path (created if it does not exist).
+        :param fsync: Forces every entry to disk before the withdrawal is posted.
+        """
+        self.path = path
+        self.fsync = fsync
+        self.entries: Dict[str, dict] = {}
+        self._file: Optional[Any] = None
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # The last line may be cut by a crash
+                        continue
+                    self.entries[entry['client_oid']] = entry
+
+    def get(self, client_oid: str) -> Optional[dict]:
+        return self.entries.get(client_oid)
+
+    def write(self, entry: dict) -> None:
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.entries[entry['client_oid']] = entry
+
+    def close(self, ) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+from logging import Logger
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from .cache import MetadataCache
+from .mybitget import MyBitget
+from .transport import close_httpx_client, create_httpx_client, get_httpx
+from .utils import fan_out
+
+if TYPE_CHECKING:
+    from httpx import Client, AsyncClient
+
+
+class MyBitgetPool:
+    """
+    Pool of many Bitget accounts (API keys) working through shared connection pools.
+
+    Accounts using the same proxy share one httpx client (TLS sessions, keep-alive connections),
+    and all accounts share one metadata cache. When asynchrony is disabled, they also share one thread pool
+    for blocking requests. `MyBitget` instances are created lazily on the first use,
+    so startup time and memory do not depend on the number of accounts which are never used.
+    """
+
+    def __init__(
+            self,
+            accounts: Iterable[dict],
+            asynchrony: bool = True,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 30.0,
+            http2: bool = False,
+            timeout: float = 10.0,
+            logger: Optional[Logger] = None,
+            metadata_cache: Optional[MetadataCache] = None,
+            sync_workers: Optional[int] = None,
+            **client_kwargs: Any,
+    ):
+        """
+        :param accounts: Credential sets (dicts with `api_key`, `secret_key`, `passphrase` and optional `proxy` and `name` keys; the API key is used as the name by default).
+        :param asynchrony: Enables asynchronous operations.
+        :param max_connections: Maximum number of connections for each proxy.
+        :param max_keepalive_connections: Maximum number of idle keep-alive connections for each proxy.
+        :param keepalive_expiry: Time in seconds after which idle keep-alive connections are closed.
+        :param http2: Enables HTTP/2 (requires the `h2` package).
+        :param timeout: Request timeout in seconds.
+        :param logger: Logger object (used to log received responses).
+        :param metadata_cache: Metadata cache shared by all accounts (a default in-memory cache is created if not specified).
+        :param sync_workers: Number of threads shared by all accounts for blocking requests when asynchrony is disabled (max_connections if not specified).
+        :param client_kwargs: Other `MyBitget` parameters applied to every account.
+        """
+        self._asynchrony = asynchrony
+        self._limits = {
+            'max_connections': max_connections,
+            'max_keepalive_connections': max_keepalive_connections,
+            'keepalive_expiry': keepalive_expiry,
+        }
+        self._http2 = http2
+        self._timeout = timeout
+        self._logger = logger
+        self._metadata_cache = metadata_cache if (metadata_cache is not None) else MetadataCache()
+        self._client_kwargs = client_kwargs
+        self._sync_workers = max_connections if (sync_workers is None) else sync_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._accounts: Dict[str, Tuple[str, str, str, Optional[str]]] = {}
+        for account in accounts:
+            name = str(account.get('name', account['api_key']))
+            self._accounts[name] = (account['api_key'], account['secret_key'], account['passphrase'], account.get('proxy'))
+        self._clients: Dict[str, MyBitget] = {}
+        self._httpx_clients: Dict[Optional[str], Union['Client', 'AsyncClient']] = {}
+
+    def __len__(self, ) -> int:
+        return len(self._accounts)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._accounts
+
+    @property
+    def names(self, ) -> List[str]:
+        return list(self._accounts)
+
+    def get(self, name: str) -> MyBitget:
+        """Returns the client of the account by its name (the client is created on the first call)."""
+        client = self._clients.get(name)
+        if client is None:
+            api_key, secret_key, passphrase, proxy = self._accounts[name]
+            client = MyBitget(
+                api_key=api_key,
+                secret_key=secret_key,
+                passphrase=passphrase,
+                proxy=proxy,
+                logger=self._logger,
+                asynchrony=self._asynchrony,
+                metadata_cache=self._metadata_cache,
+                httpx_client=self._get_httpx_client(proxy),
+                executor=self._get_executor(),
+                **self._client_kwargs,
+            )
+            self._clients[name] = client
+        return client
+
+    async def map(
+            self,
+            method: str,
+            *args: Any,
+            names: Optional[Iterable[str]] = None,
+            concurrency: int = 10,
+            **kwargs: Any,
+    ) -> AsyncIterator[Tuple[str, Tuple[int, Any]]]:
+        """
+        Calls the method (e.g., `SPOT_get_balance`) with the same arguments on many accounts (all accounts by default)
+        with at most `concurrency` simultaneous calls, and yields (name, (status, result)) as each account completes.
+        """
+        async def call(name: str) -> AsyncIterator[Tuple[str, Tuple[int, Any]]]:
+            try:
+                result = await getattr(self.get(name), method)(*args, **kwargs)
+            except Exception as e:
+                result = (-1, Exception(f'{method} | {e}'))
+            yield name, result
+
+        results = fan_out(self._accounts if (names is None) else list(names), call, concurrency)
+        try:
+            async for item in results:
+                yield item
+        finally:
+            await results.aclose()
+
+    async def gather(
+            self,
+            method: str,
+            *args: Any,
+            names: Optional[Iterable[str]] = None,
+            concurrency: int = 10,
+            **kwargs: Any,
+    ) -> Dict[str, Tuple[int, Any]]:
+        """Same as `map`, but collects all results into a dict by account names."""
+        return {name: result async for name, result in self.map(method, *args, names=names, concurrency=concurrency, **kwargs)}
+
+    async def aclose(self, ) -> None:
+        """Closes all clients (sending their queued orders), the shared connection pools and the shared thread pool."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        for httpx_client in self._httpx_clients.values():
+            await close_httpx_client(httpx_client)
+        self._httpx_clients.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self, ) -> 'MyBitgetPool':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _get_executor(self, ) -> Optional[ThreadPoolExecutor]:
+        if self._executor is None and not self._asynchrony and self._sync_workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=self._sync_workers, thread_name_prefix='my-bitget-pool')
+        return self._executor
+
+    def _get_httpx_client(self, proxy: Optional[str]) -> Union['Client', 'AsyncClient']:
+        httpx_client = self._httpx_clients.get(proxy)
+        if httpx_client is None:
+            httpx_client = create_httpx_client(
+                self._asynchrony,
+                f'http://{proxy}' if proxy else None,
+                limits=get_httpx().Limits(**self._limits),
+                http2=self._http2,
+                timeout=self._timeout,
+            )
+            self._httpx_clients[proxy] = httpx_client
+        return httpx_client
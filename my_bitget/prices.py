@@ -0,0 +1,71 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import time
+
+from .records import TickerRecord
+
+
+class PriceSnapshot:
+    """
+    Indexed snapshot of all spot tickers fetched by a single unfiltered `/api/v2/spot/market/tickers` request.
+    Records are indexed by symbol (e.g., BTCUSDT), prices of USDT pairs can be read by ticker (e.g., BTC).
+    """
+
+    quote = 'USDT'
+
+    def __init__(self, records: Iterable[TickerRecord], created_at: Optional[float] = None):
+        self._records: Dict[str, TickerRecord] = {record.symbol: record for record in records}
+        self.created_at = time.monotonic() if (created_at is None) else created_at
+
+    @classmethod
+    def from_json(cls, data: List[dict]) -> 'PriceSnapshot':
+        records = []
+        for item in data:
+            try:
+                records.append(TickerRecord.from_json(item))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return cls(records)
+
+    def __len__(self, ) -> int:
+        return len(self._records)
+
+    def __iter__(self, ) -> Iterator[TickerRecord]:
+        return iter(self._records.values())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._records
+
+    @property
+    def age(self, ) -> float:
+        return time.monotonic() - self.created_at
+
+    def is_fresh(self, max_age: float) -> bool:
+        return self.age <= max_age
+
+    def get(self, symbol: str) -> Optional[TickerRecord]:
+        """Returns the ticker record by its symbol (e.g., BTCUSDT)."""
+        return self._records.get(symbol)
+
+    def get_price(self, ticker: str) -> Optional[float]:
+        """Returns the last price (in USDT) of a coin by its ticker (e.g., BTC), or None if there is no such pair."""
+        record = self._records.get(f'{ticker}{self.quote}')
+        if record is None or record.last <= 0:
+            return None
+        return record.last
+
+    def get_prices(self, tickers: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Returns the last prices (in USDT) by tickers (all USDT pairs if tickers are not specified)."""
+        if tickers is None:
+            suffix_length = len(self.quote)
+            return {
+                symbol[:-suffix_length]: record.last
+                for symbol, record in self._records.items()
+                if symbol.endswith(self.quote) and record.last > 0
+            }
+        prices = {}
+        for ticker in tickers:
+            price = self.get_price(ticker)
+            if price is not None:
+                prices[ticker] = price
+        return prices
@@ -0,0 +1,255 @@
+from typing import Dict, List, Optional
+
+import heapq
+import asyncio
+import itertools
+import threading
+import time
+
+from .endpoints import ENDPOINTS
+
+
+class TokenBucket:
+    """
+    Token bucket with a fair waiting queue: requests wait in FIFO order within the same priority,
+    and requests with a lower priority value are served first.
+    The bucket is thread-safe and may be shared by clients running on different event loops (e.g., several `MyBitgetSync`):
+    every waiter is woken on its own loop.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        :param rate: Number of tokens added per second.
+        :param capacity: Maximum number of tokens (equals to rate, but not less than 1, if not specified).
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity) if (capacity is not None) else max(1.0, self.rate)
+        self.requests = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_queue_depth = 0
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        # Waiters are [priority, counter, future, loop] entries
+        self._waiters: List[list] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self, ) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, priority: int = 1) -> float:
+        """Waits for a token and returns the waiting time in seconds."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.requests += 1
+            self._refill()
+            if not self._waiters and self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            entry = [priority, next(self._counter), loop.create_future(), loop]
+            heapq.heappush(self._waiters, entry)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        started_at = time.monotonic()
+        try:
+            while True:
+                with self._lock:
+                    if self._waiters[0] is entry:
+                        self._refill()
+                        if self._tokens >= 1:
+                            self._tokens -= 1
+                            heapq.heappop(self._waiters)
+                            break
+                        delay, future = (1 - self._tokens) / self.rate, None
+                    else:
+                        if entry[2].done():
+                            entry[2] = loop.create_future()
+                        delay, future = None, entry[2]
+                if future is None:
+                    await asyncio.sleep(delay)
+                else:
+                    await future
+        except BaseException:
+            with self._lock:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+            raise
+        finally:
+            self._wake_head()
+        waited = time.monotonic() - started_at
+        with self._lock:
+            self.delayed += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def _refill(self, ) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _wake_head(self, ) -> None:
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    return
+                entry = self._waiters[0]
+            future, loop = entry[2], entry[3]
+            if future.done():
+                return
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+            if loop is running_loop:
+                future.set_result(None)
+                return
+            try:
+                loop.call_soon_threadsafe(_set_pending_result, future)
+                return
+            except RuntimeError:
+                # The loop of the waiter is closed, so it will never take its token
+                with self._lock:
+                    if entry in self._waiters:
+                        self._waiters.remove(entry)
+                        heapq.heapify(self._waiters)
+
+    @property
+    def stats(self, ) -> dict:
+        return {
+            'rate': self.rate,
+            'requests': self.requests,
+            'delayed': self.delayed,
+            'queue_depth': len(self._waiters),
+            'max_queue_depth': self.max_queue_depth,
+            'total_wait': self.total_wait,
+            'max_wait': self.max_wait,
+            'avg_wait': (self.total_wait / self.delayed) if self.delayed else 0.0,
+        }
+
+
+def _set_pending_result(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class RateLimiter:
+    """
+    Client-side request scheduler with a token bucket for each endpoint group and a total bucket for all requests.
+    Requests wait in a queue instead of failing, and high priority requests (e.g., withdrawals) jump ahead of others.
+    Limiters are usually shared between all clients with the same API key (see `RateLimiter.shared`).
+    Rate limits: https://www.bitget.com/api-doc/common/limits
+    """
+
+    # Requests per second for each endpoint group
+    default_limits = {
+        'default': 10.0,
+        'public_coins': 3.0,
+        'public_market': 20.0,
+        'public_candles': 20.0,
+        'account_info': 1.0,
+        'account_assets': 10.0,
+        'subaccount_list': 5.0,
+        'subaccount_assets': 10.0,
+        'subaccount_transfer': 10.0,
+        'withdrawal': 5.0,
+        'withdrawal_records': 10.0,
+        'deposit_records': 10.0,
+        'account_bills': 10.0,
+        'transfer_records': 20.0,
+        'trade_place': 10.0,
+        'trade_batch': 5.0,
+        'trade_cancel': 10.0,
+        'trade_batch_cancel': 10.0,
+        'trade_query': 20.0,
+    }
+
+    # Endpoint groups by endpoint path (declared in the endpoint registry)
+    default_groups = {endpoint.path: endpoint.group for endpoint in ENDPOINTS.values()}
+
+    # Lower value means higher priority
+    default_priorities = {
+        'withdrawal': 0,
+        'subaccount_transfer': 0,
+    }
+
+    _shared: Dict[str, 'RateLimiter'] = {}
+
+    def __init__(
+            self,
+            limits: Optional[Dict[str, float]] = None,
+            groups: Optional[Dict[str, str]] = None,
+            priorities: Optional[Dict[str, int]] = None,
+            total_rate: Optional[float] = 20.0,
+            enabled: bool = True,
+    ):
+        """
+        :param limits: Requests per second for endpoint groups (overrides `default_limits`).
+        :param groups: Endpoint groups by endpoint path (overrides `default_groups`).
+        :param priorities: Priorities of endpoint groups (overrides `default_priorities`, the default priority is 1).
+        :param total_rate: Requests per second for all endpoints together (None disables the total limit).
+        :param enabled: Enables rate limiting.
+        """
+        self.limits = dict(self.default_limits)
+        if limits:
+            self.limits.update(limits)
+        self.groups = dict(self.default_groups)
+        if groups:
+            self.groups.update(groups)
+        self.priorities = dict(self.default_priorities)
+        if priorities:
+            self.priorities.update(priorities)
+        self.enabled = enabled
+        self._total_bucket = TokenBucket(total_rate) if (total_rate is not None) else None
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    @classmethod
+    def shared(cls, key: str) -> 'RateLimiter':
+        """
+        Returns the limiter shared between all clients with the same key (e.g., API key),
+        also by clients running on different event loops and threads.
+        """
+        limiter = cls._shared.get(key)
+        if limiter is None:
+            # setdefault keeps the first limiter if clients with the same key are created by several threads at once
+            limiter = cls._shared.setdefault(key, cls())
+        return limiter
+
+    def get_group(self, endpoint: str) -> str:
+        return self.groups.get(endpoint, 'default')
+
+    def get_bucket(self, group: str) -> TokenBucket:
+        bucket = self._buckets.get(group)
+        if bucket is None:
+            # setdefault keeps a single bucket when several threads create it at once
+            bucket = self._buckets.setdefault(group, TokenBucket(self.limits.get(group, self.limits['default'])))
+        return bucket
+
+    async def acquire(self, endpoint: str, priority: Optional[int] = None) -> float:
+        """Waits until the request to the endpoint is allowed and returns the waiting time in seconds."""
+        if not self.enabled:
+            return 0.0
+        group = self.get_group(endpoint)
+        if priority is None:
+            priority = self.priorities.get(group, 1)
+        waited = await self.get_bucket(group).acquire(priority)
+        if self._total_bucket is not None:
+            waited += await self._total_bucket.acquire(priority)
+        return waited
+
+    @property
+    def queue_depth(self, ) -> int:
+        depth = sum(bucket.queue_depth for bucket in self._buckets.values())
+        if self._total_bucket is not None:
+            depth += self._total_bucket.queue_depth
+        return depth
+
+    @property
+    def stats(self, ) -> Dict[str, dict]:
+        stats = {group: bucket.stats for group, bucket in self._buckets.items()}
+        if self._total_bucket is not None:
+            stats['total'] = self._total_bucket.stats
+        return stats
@@ -0,0 +1,58 @@
+class TickerRecord:
+    """Compact record of a single spot ticker (parsed from the `/api/v2/spot/market/tickers` response)."""
+
+    __slots__ = ('symbol', 'last', 'bid', 'ask', 'base_volume', 'quote_volume', 'timestamp')
+
+    def __init__(self, symbol: str, last: float, bid: float, ask: float, base_volume: float, quote_volume: float, timestamp: int):
+        self.symbol = symbol
+        self.last = last
+        self.bid = bid
+        self.ask = ask
+        self.base_volume = base_volume
+        self.quote_volume = quote_volume
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'TickerRecord':
+        return cls(
+            symbol=data['symbol'],
+            last=float(data['lastPr'] or 0),
+            bid=float(data.get('bidPr') or 0),
+            ask=float(data.get('askPr') or 0),
+            base_volume=float(data.get('baseVolume') or 0),
+            quote_volume=float(data.get('quoteVolume') or 0),
+            timestamp=int(data.get('ts') or 0),
+        )
+
+    def __repr__(self, ) -> str:
+        return f'TickerRecord(symbol={self.symbol!r}, last={self.last}, bid={self.bid}, ask={self.ask})'
+
+
+class BalanceRecord:
+    """Compact record of a single coin balance (parsed from the `/api/v2/spot/account/assets` response)."""
+
+    __slots__ = ('coin', 'available', 'frozen', 'locked', 'timestamp')
+
+    def __init__(self, coin: str, available: float, frozen: float, locked: float, timestamp: int):
+        self.coin = coin
+        self.available = available
+        self.frozen = frozen
+        self.locked = locked
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'BalanceRecord':
+        return cls(
+            coin=data['coin'],
+            available=float(data.get('available') or 0),
+            frozen=float(data.get('frozen') or 0),
+            locked=float(data.get('locked') or 0),
+            timestamp=int(data.get('uTime') or 0),
+        )
+
+    @property
+    def total(self, ) -> float:
+        return self.available + self.frozen + self.locked
+
+    def __repr__(self, ) -> str:
+        return f'BalanceRecord(coin={self.coin!r}, available={self.available}, frozen={self.frozen}, locked={self.locked})'
@@ -0,0 +1,166 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+import random
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised when requests to the host are blocked by the open circuit breaker."""
+
+
+class RetryPolicy:
+    """
+    Retry policy for the request pipeline: exponential backoff with full jitter, limited to safe cases.
+    By default only GET requests are retried (on transport errors, timeouts, 429 and 5xx responses),
+    so POST requests (e.g., withdrawals) are never sent twice.
+    """
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            backoff_base: float = 0.5,
+            backoff_max: float = 10.0,
+            jitter: bool = True,
+            methods: Iterable[str] = ('GET', ),
+            statuses: Iterable[int] = (429, 500, 502, 503, 504),
+            respect_retry_after: bool = True,
+    ):
+        """
+        :param max_attempts: Maximum number of attempts (1 disables retries).
+        :param backoff_base: Delay in seconds before the first retry (doubled for every next retry).
+        :param backoff_max: Maximum delay in seconds between attempts.
+        :param jitter: Randomizes delays between 0 and the exponential delay.
+        :param methods: HTTP methods which are allowed to be retried.
+        :param statuses: Response status codes which are retried.
+        :param respect_retry_after: Uses the Retry-After header of the response as the delay (if present).
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.methods = {method.upper() for method in methods}
+        self.statuses = set(statuses)
+        self.respect_retry_after = respect_retry_after
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        return attempt < self.max_attempts and method.upper() in self.methods
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Returns the delay in seconds before the next attempt (attempt is the number of the failed attempt)."""
+        if self.respect_retry_after and retry_after:
+            delay = self.parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def parse_retry_after(value: str) -> Optional[float]:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        # HTTP dates are rare, so email.utils is imported only for them (it is slow to import)
+        from email.utils import parsedate_to_datetime
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker: after `failure_threshold` consecutive failures (transport errors and 5xx responses)
+    the circuit opens and requests fail fast for `recovery_timeout` seconds. After that a single trial request
+    is allowed (half-open state): its success closes the circuit, and its failure opens it again.
+    A trial which ends without a result (e.g., is cancelled) frees the slot by `release`, and a trial running longer
+    than `trial_timeout` seconds is considered lost, so the circuit can never get stuck in the half-open state.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    _shared: Dict[Tuple[str, Optional[str]], 'CircuitBreaker'] = {}
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, enabled: bool = True, trial_timeout: float = 30.0):
+        """
+        :param failure_threshold: Number of consecutive failures which opens the circuit.
+        :param recovery_timeout: Time in seconds before a trial request is allowed.
+        :param enabled: Enables the circuit breaker.
+        :param trial_timeout: Time in seconds after which an unfinished trial request no longer blocks a new trial.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.trial_timeout = trial_timeout
+        self.enabled = enabled
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started_at = 0.0
+
+    @classmethod
+    def shared(cls, host: str, proxy: Optional[str] = None) -> 'CircuitBreaker':
+        """
+        Returns the circuit breaker shared between all clients working with the host through the same proxy
+        (a dead proxy must not block the accounts using other proxies).
+        """
+        key = (host, proxy)
+        breaker = cls._shared.get(key)
+        if breaker is None:
+            breaker = cls._shared.setdefault(key, cls())
+        return breaker
+
+    def allow(self, ) -> bool:
+        """Checks if a request is allowed (counts rejected requests)."""
+        if not self.enabled or self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN:
+            now = time.monotonic()
+            if not self._trial_in_flight or now - self._trial_started_at >= self.trial_timeout:
+                self._trial_in_flight = True
+                self._trial_started_at = now
+                return True
+        self.rejected += 1
+        return False
+
+    def release(self, ) -> None:
+        """Frees the trial slot of the half-open circuit when the trial request ended without a result (e.g., was cancelled)."""
+        if self.state == self.HALF_OPEN:
+            self._trial_in_flight = False
+
+    def record_success(self, ) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self, ) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opened += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    @property
+    def retry_in(self, ) -> float:
+        """Time in seconds until a trial request is allowed (0 if the circuit is not open)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    @property
+    def stats(self, ) -> dict:
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'opened': self.opened,
+            'rejected': self.rejected,
+        }
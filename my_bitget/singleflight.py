@@ -0,0 +1,70 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical requests: while a request with some key is in flight,
+    all other callers with the same key wait for it and get the same result instead of sending their own request.
+    `MyBitget` keys requests by host, endpoint, query and (for signed endpoints) API key, so one instance
+    can be shared by clients of different accounts.
+    """
+
+    def __init__(
+            self,
+            enabled: bool = True,
+            endpoints: Optional[Iterable[str]] = None,
+            exclude: Optional[Iterable[str]] = None,
+    ):
+        """
+        :param enabled: Enables coalescing.
+        :param endpoints: Endpoints for which coalescing is enabled (all endpoints if not specified).
+        :param exclude: Endpoints for which coalescing is disabled.
+        """
+        self.enabled = enabled
+        self.endpoints = None if (endpoints is None) else set(endpoints)
+        self.exclude = set() if (exclude is None) else set(exclude)
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    def is_enabled(self, endpoint: str) -> bool:
+        if not self.enabled or endpoint in self.exclude:
+            return False
+        return self.endpoints is None or endpoint in self.endpoints
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Awaits the in-flight call with the same key, or starts a new one."""
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done_task: self._on_done(key, done_task))
+        else:
+            self.coalesced += 1
+        # Shielding keeps the shared call alive when one of the waiting callers is cancelled
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Marks the exception as retrieved in case all waiting callers were cancelled
+            task.exception()
+
+    @property
+    def in_flight(self, ) -> int:
+        return len(self._in_flight)
+
+    @property
+    def stats(self, ) -> Dict[str, int]:
+        return {
+            'calls': self.calls,
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._in_flight),
+        }
@@ -0,0 +1,246 @@
+from logging import Logger
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import json
+import time
+import asyncio
+
+
+class PriceBook:
+    """
+    Local in-memory book of the latest ticker prices (filled by `TickerStream`).
+    Every update replaces an immutable tuple in a dict, so readers never need a lock.
+    """
+
+    quote = 'USDT'
+
+    def __init__(self, ):
+        self._prices: Dict[str, Tuple[float, float, float, float]] = {}
+        self.updates = 0
+
+    def __len__(self, ) -> int:
+        return len(self._prices)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._prices
+
+    def update(self, symbol: str, last: float, bid: float = 0.0, ask: float = 0.0) -> None:
+        self._prices[symbol] = (last, bid, ask, time.monotonic())
+        self.updates += 1
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[Tuple[float, float, float, float]]:
+        """Returns (last, bid, ask, updated_at) by symbol (e.g., BTCUSDT), or None if missing or older than max_age seconds."""
+        entry = self._prices.get(symbol)
+        if entry is None or (max_age is not None and time.monotonic() - entry[3] > max_age):
+            return None
+        return entry
+
+    def get_price(self, ticker: str, max_age: Optional[float] = None) -> Optional[float]:
+        """Returns the last price (in USDT) by ticker (e.g., BTC), or None if missing or older than max_age seconds."""
+        entry = self.get(f'{ticker}{self.quote}', max_age)
+        if entry is None or entry[0] <= 0:
+            return None
+        return entry[0]
+
+    def clear(self, ) -> None:
+        self._prices = {}
+
+
+class PublicStream:
+    """
+    Client of Bitget public WebSocket channels with heartbeats, reconnects and resubscription.
+    Requires the optional `websockets` package.
+    WebSocket API: https://www.bitget.com/api-doc/common/websocket-intro
+    """
+
+    url = 'wss://ws.bitget.com/v2/ws/public'
+    max_args_per_request = 50
+
+    def __init__(
+            self,
+            url: Optional[str] = None,
+            ping_interval: float = 25.0,
+            pong_timeout: float = 10.0,
+            reconnect_delay: float = 1.0,
+            max_reconnect_delay: float = 30.0,
+            logger: Optional[Logger] = None,
+    ):
+        """
+        :param url: WebSocket URL (e.g., a local stand-in server for tests).
+        :param ping_interval: Time in seconds without messages after which a ping is sent.
+        :param pong_timeout: Time in seconds to wait for any message after a ping before reconnecting.
+        :param reconnect_delay: Delay in seconds before the first reconnect (doubled for every next failed attempt).
+        :param max_reconnect_delay: Maximum delay in seconds between reconnects.
+        :param logger: Logger object (used to log connection events).
+        """
+        self.url = url or self.url
+        self.ping_interval = ping_interval
+        self.pong_timeout = pong_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._logger = logger
+        self.connects = 0
+        self.messages = 0
+        self._received_at = 0.0
+        self._subscriptions: Dict[Tuple[str, str, str], Callable[[dict, List[dict]], Any]] = {}
+        self._websocket = None
+        self._task: Optional[asyncio.Task] = None
+        self._connected: Optional[asyncio.Event] = None
+
+    @property
+    def is_connected(self, ) -> bool:
+        return self._connected is not None and self._connected.is_set()
+
+    async def subscribe(self, channel: str, inst_id: str, handler: Callable[[dict, List[dict]], Any], inst_type: str = 'SPOT') -> None:
+        """Subscribes the handler (called with the message and its data list) to the channel (e.g., ticker, books)."""
+        key = (inst_type, channel, inst_id)
+        self._subscriptions[key] = handler
+        if self._websocket is not None and self.is_connected:
+            await self._send_op('subscribe', [key])
+
+    async def unsubscribe(self, channel: str, inst_id: str, inst_type: str = 'SPOT') -> None:
+        key = (inst_type, channel, inst_id)
+        if self._subscriptions.pop(key, None) is not None and self._websocket is not None and self.is_connected:
+            await self._send_op('unsubscribe', [key])
+
+    async def start(self, ) -> None:
+        """Starts the background connection task (returns immediately)."""
+        if self._task is None or self._task.done():
+            self._connected = asyncio.Event()
+            self._task = asyncio.ensure_future(self.run())
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        if self._connected is None:
+            return False
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self, ) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self, ) -> None:
+        """Keeps the connection alive forever: connects, resubscribes and reads messages until cancelled."""
+        try:
+            import websockets
+        except ImportError as e:
+            raise ImportError('PublicStream requires the `websockets` package (pip install websockets)!') from e
+        if self._connected is None:
+            self._connected = asyncio.Event()
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self.url, ping_interval=None, close_timeout=1) as websocket:
+                    self._websocket = websocket
+                    self.connects += 1
+                    if self._subscriptions:
+                        await self._send_op('subscribe', list(self._subscriptions))
+                    self._connected.set()
+                    self._log_debug(f'Connected to {self.url}')
+                    delay = self.reconnect_delay
+                    await self._read(websocket)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._log_debug(f'Connection to {self.url} lost: {e}')
+            finally:
+                self._websocket = None
+                self._connected.clear()
+            await asyncio.sleep(delay)
+            delay = min(self.max_reconnect_delay, delay * 2)
+
+    async def _read(self, websocket) -> None:
+        # Timeouts are watched by a separate task instead of wait_for around every recv: wait_for may turn a cancellation
+        # into a timeout (Python < 3.12), which would keep a stopped stream running, and it costs a task per message
+        self._received_at = time.monotonic()
+        heartbeat = asyncio.ensure_future(self._heartbeat(websocket))
+        try:
+            async for message in websocket:
+                self._received_at = time.monotonic()
+                if message == 'pong':
+                    continue
+                self.messages += 1
+                self._dispatch(json.loads(message))
+        finally:
+            heartbeat.cancel()
+        raise ConnectionError('Connection closed!')
+
+    async def _heartbeat(self, websocket) -> None:
+        """Sends a ping after ping_interval seconds without messages and closes the connection if nothing comes in pong_timeout seconds."""
+        while True:
+            idle = time.monotonic() - self._received_at
+            if idle < self.ping_interval:
+                await asyncio.sleep(self.ping_interval - idle)
+                continue
+            sent_at = time.monotonic()
+            await websocket.send('ping')
+            await asyncio.sleep(self.pong_timeout)
+            if self._received_at < sent_at:
+                self._log_debug('No pong received!')
+                await websocket.close()
+                return
+
+    def _dispatch(self, message: dict) -> None:
+        if 'event' in message:
+            if message['event'] == 'error':
+                self._log_debug(f'Error event: {message}')
+            return
+        arg = message.get('arg') or {}
+        handler = self._subscriptions.get((arg.get('instType'), arg.get('channel'), arg.get('instId')))
+        if handler is not None:
+            handler(message, message.get('data') or [])
+
+    async def _send_op(self, op: str, keys: Iterable[Tuple[str, str, str]]) -> None:
+        keys = list(keys)
+        for i in range(0, len(keys), self.max_args_per_request):
+            args = [
+                {'instType': inst_type, 'channel': channel, 'instId': inst_id}
+                for inst_type, channel, inst_id in keys[i:i + self.max_args_per_request]
+            ]
+            await self._websocket.send(json.dumps({'op': op, 'args': args}))
+
+    def _log_debug(self, message: str) -> None:
+        if self._logger is not None:
+            self._logger.debug(f'BitgetStream | {message}')
+
+
+class TickerStream(PublicStream):
+    """
+    Streams spot tickers (USDT pairs) into a local `PriceBook`.
+    Pass the book to `MyBitget(price_book=...)` to make `PUBLIC_get_price` read fresh prices from it.
+    """
+
+    def __init__(self, tickers: Iterable[str] = (), book: Optional[PriceBook] = None, **kwargs: Any):
+        """
+        :param tickers: Tickers (e.g., BTC, ETH) subscribed on start.
+        :param book: Price book to fill (a new book is created if not specified).
+        :param kwargs: `PublicStream` parameters.
+        """
+        super().__init__(**kwargs)
+        self.book = book if (book is not None) else PriceBook()
+        for ticker in tickers:
+            self._subscriptions[('SPOT', 'ticker', f'{ticker}{self.book.quote}')] = self._on_ticker
+
+    async def add_tickers(self, tickers: Iterable[str]) -> None:
+        for ticker in tickers:
+            await self.subscribe('ticker', f'{ticker}{self.book.quote}', self._on_ticker)
+
+    def _on_ticker(self, message: dict, data: List[dict]) -> None:
+        for item in data:
+            try:
+                self.book.update(
+                    symbol=item.get('instId') or message['arg']['instId'],
+                    last=float(item['lastPr']),
+                    bid=float(item.get('bidPr') or 0),
+                    ask=float(item.get('askPr') or 0),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
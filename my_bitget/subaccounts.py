@@ -0,0 +1,70 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import time
+
+
+class SubaccountSnapshot:
+    """
+    Snapshot of the assets of all subaccounts (fetched once from `/api/v2/spot/account/subaccount-assets`),
+    indexed by subaccount user id and coin.
+    """
+
+    def __init__(self, assets: Dict[str, Dict[str, dict]], created_at: Optional[float] = None):
+        self._assets = assets
+        self.created_at = time.monotonic() if (created_at is None) else created_at
+
+    @classmethod
+    def from_json(cls, data: Iterable[dict]) -> 'SubaccountSnapshot':
+        assets: Dict[str, Dict[str, dict]] = {}
+        for subaccount in data:
+            coins = assets.setdefault(str(subaccount['userId']), {})
+            for asset in subaccount.get('assetsList') or []:
+                coins[asset['coin']] = asset
+        return cls(assets)
+
+    def __len__(self, ) -> int:
+        return len(self._assets)
+
+    def __contains__(self, subaccount_id: str) -> bool:
+        return str(subaccount_id) in self._assets
+
+    @property
+    def age(self, ) -> float:
+        return time.monotonic() - self.created_at
+
+    def is_fresh(self, max_age: float) -> bool:
+        return self.age <= max_age
+
+    @property
+    def subaccount_ids(self, ) -> List[str]:
+        return list(self._assets)
+
+    def get_assets(self, subaccount_id: str) -> Optional[List[dict]]:
+        """Returns all assets of the subaccount (or None if there is no such subaccount)."""
+        coins = self._assets.get(str(subaccount_id))
+        return None if (coins is None) else list(coins.values())
+
+    def get_asset(self, subaccount_id: str, ticker: str) -> Optional[dict]:
+        coins = self._assets.get(str(subaccount_id))
+        return None if (coins is None) else coins.get(ticker)
+
+    def get_available(self, subaccount_id: str, ticker: str) -> float:
+        asset = self.get_asset(subaccount_id, ticker)
+        return 0.0 if (asset is None) else float(asset.get('available') or 0)
+
+    def iter_balances(
+            self,
+            tickers: Optional[Iterable[str]] = None,
+            min_amount: float = 0.0,
+            subaccount_ids: Optional[Iterable[str]] = None,
+    ) -> Iterator[Tuple[str, str, str]]:
+        """Yields (subaccount_id, ticker, available) for all available balances greater than min_amount."""
+        tickers = None if (tickers is None) else set(tickers)
+        subaccount_ids = self._assets if (subaccount_ids is None) else [str(subaccount_id) for subaccount_id in subaccount_ids]
+        for subaccount_id in subaccount_ids:
+            for ticker, asset in self._assets.get(subaccount_id, {}).items():
+                if tickers is not None and ticker not in tickers:
+                    continue
+                available = asset.get('available') or '0'
+                if float(available) > min_amount:
+                    yield subaccount_id, ticker, available
@@ -0,0 +1,99 @@
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+import asyncio
+import inspect
+import functools
+import threading
+
+from .mybitget import MyBitget
+
+
+class MyBitgetSync:
+    """
+    Synchronous facade of `MyBitget`: the same methods (PUBLIC_, SPOT_, SUBACCOUNT_, ...) as plain blocking calls,
+    so no event loop is required in the calling code.
+
+    The facade owns an asynchronous `MyBitget` client running on a private event loop in a background thread.
+    Calls from many threads are multiplexed on that loop, so they run concurrently and never block each other.
+    Asynchronous generators (e.g., `SPOT_iter_withdrawal_records`, `SPOT_post_withdrawals`) become blocking iterators:
+    every item is fetched on the loop, and breaking out of the loop closes the underlying generator.
+    """
+
+    method_prefixes = ('PUBLIC_', 'SPOT_', 'SUBACCOUNT_', 'TRADE_')
+
+    def __init__(self, *args: Any, timeout: Optional[float] = None, **kwargs: Any):
+        """
+        :param args: `MyBitget` parameters (asynchrony is always enabled).
+        :param timeout: Maximum time in seconds to wait for every call (no limit if not specified).
+        :param kwargs: `MyBitget` parameters (asynchrony is always enabled).
+        """
+        kwargs['asynchrony'] = True
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='my-bitget-sync', daemon=True)
+        self._thread.start()
+        self._client = MyBitget(*args, **kwargs)
+
+    @property
+    def client(self, ) -> MyBitget:
+        """Underlying asynchronous client (its coroutines must be run on the facade loop)."""
+        return self._client
+
+    def run(self, coroutine) -> Any:
+        """Runs the coroutine on the facade loop and waits for its result."""
+        if self._loop.is_closed():
+            raise RuntimeError('MyBitgetSync is closed!')
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(self.timeout)
+
+    def close(self, ) -> None:
+        """Closes the connections and stops the background loop."""
+        if self._loop.is_closed():
+            return
+        self.run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self, ) -> 'MyBitgetSync':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @classmethod
+    def _wrap(cls, name: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self: 'MyBitgetSync', *args: Any, **kwargs: Any) -> Any:
+            return self.run(getattr(self._client, name)(*args, **kwargs))
+        return wrapper
+
+    @classmethod
+    def _wrap_iterator(cls, name: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self: 'MyBitgetSync', *args: Any, **kwargs: Any) -> Iterator[Any]:
+            iterator = getattr(self._client, name)(*args, **kwargs)
+            try:
+                while True:
+                    try:
+                        item = self.run(_next(iterator))
+                    except StopAsyncIteration:
+                        return
+                    yield item
+            finally:
+                if not self._loop.is_closed():
+                    self.run(iterator.aclose())
+        return wrapper
+
+
+async def _next(iterator: AsyncIterator[Any]) -> Any:
+    # run_coroutine_threadsafe accepts coroutines only, not the awaitable returned by __anext__
+    return await iterator.__anext__()
+
+
+for _name, _method in inspect.getmembers(MyBitget, inspect.iscoroutinefunction):
+    if _name.startswith(MyBitgetSync.method_prefixes):
+        setattr(MyBitgetSync, _name, MyBitgetSync._wrap(_name, _method))
+
+for _name, _method in inspect.getmembers(MyBitget, inspect.isasyncgenfunction):
+    if _name.startswith(MyBitgetSync.method_prefixes):
+        setattr(MyBitgetSync, _name, MyBitgetSync._wrap_iterator(_name, _method))
@@ -0,0 +1,122 @@
+from typing import Any, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+import os
+import asyncio
+
+if TYPE_CHECKING:
+    from .mybitget import MyBitget
+
+
+def new_client_oid() -> str:
+    """Returns a new unique client order id (used to match batch results to orders): 128 random bits as hex."""
+    return os.urandom(16).hex()
+
+
+class OrderBatcher:
+    """
+    Coalesces individual order submissions into batch requests.
+
+    Orders of the same symbol submitted within `window` seconds are sent together by a single `batch-orders` request
+    (at most `max_batch` orders, the exchange limit; a full batch is sent immediately). Every order gets its own result:
+    batch results are matched to orders by clientOid, which is generated for orders submitted without it.
+    """
+
+    def __init__(self, client: 'MyBitget', window: float = 0.02, max_batch: int = 50):
+        """
+        :param client: MyBitget instance used for requests.
+        :param window: Time in seconds during which orders of the same symbol are collected into a batch.
+        :param max_batch: Maximum number of orders per batch request (50 max).
+        """
+        self._client = client
+        self.window = window
+        self.max_batch = max(1, min(max_batch, 50))
+        self.submitted = 0
+        self.requests = 0
+        self._pending: Dict[str, List[Tuple[dict, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def pending(self, ) -> int:
+        return sum(len(orders) for orders in self._pending.values())
+
+    async def submit(self, ticker: str, order: dict) -> Tuple[int, Union[dict, Exception]]:
+        """
+        Queues the order (a Bitget order dict: side, orderType, force, price, size and optional clientOid)
+        for coin USDT pair and waits for its result: (0, {'orderId': ..., 'clientOid': ...}) or (-1, Exception).
+        """
+        order = dict(order)
+        if not order.get('clientOid'):
+            order['clientOid'] = new_client_oid()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        orders = self._pending.setdefault(ticker, [])
+        orders.append((order, future))
+        self.submitted += 1
+        if len(orders) >= self.max_batch:
+            self.flush(ticker)
+        elif len(orders) == 1:
+            self._timers[ticker] = loop.call_later(self.window, self.flush, ticker)
+        # Shielding keeps the batch alive when one of the waiting callers is cancelled
+        return await asyncio.shield(future)
+
+    def flush(self, ticker: Optional[str] = None) -> None:
+        """Sends the queued orders of the ticker (of all tickers by default) without waiting for the window."""
+        for key in ([ticker] if (ticker is not None) else list(self._pending)):
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            orders = self._pending.pop(key, None)
+            if orders:
+                task = asyncio.ensure_future(self._send(key, orders))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, ticker: str, orders: List[Tuple[dict, asyncio.Future]]) -> None:
+        self.requests += 1
+        try:
+            if len(orders) == 1:
+                order, future = orders[0]
+                result = await self._client.TRADE_place_order(
+                    ticker=ticker,
+                    side=order['side'],
+                    size=order['size'],
+                    price=order.get('price'),
+                    order_type=order.get('orderType'),
+                    force=order.get('force', 'gtc'),
+                    client_oid=order['clientOid'],
+                )
+                if not future.done():
+                    future.set_result(result)
+                return
+            status, result = await self._client.TRADE_place_orders(ticker, [order for order, _ in orders])
+        except Exception as e:
+            status, result = -1, Exception(f'OrderBatcher | {e}')
+        if status != 0:
+            for _, future in orders:
+                if not future.done():
+                    future.set_result((-1, result))
+            return
+        results: Dict[str, Tuple[int, Union[dict, Exception]]] = {}
+        for item in result.get('successList') or []:
+            results[item.get('clientOid')] = (0, item)
+        for item in result.get('failureList') or []:
+            results[item.get('clientOid')] = (-1, Exception(f'TRADE_submit_order | {item.get("errorMsg")} ({item.get("errorCode")})'))
+        for order, future in orders:
+            if not future.done():
+                future.set_result(results.get(order['clientOid'], (-1, Exception('TRADE_submit_order | No result for the order!'))))
+
+    async def close(self, ) -> None:
+        """Sends all queued orders and waits for their results."""
+        self.flush()
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    @property
+    def stats(self, ) -> Dict[str, Any]:
+        return {
+            'submitted': self.submitted,
+            'requests': self.requests,
+            'pending': self.pending,
+            'orders_per_request': (self.submitted - self.pending) / self.requests if self.requests else 0.0,
+        }
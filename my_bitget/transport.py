@@ -0,0 +1,44 @@
+from typing import Any, Optional, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ssl import SSLContext
+    from httpx import Client, AsyncClient
+
+_httpx: Any = None
+_ssl_context: Optional['SSLContext'] = None
+
+
+def get_httpx() -> Any:
+    """Returns the httpx module imported on the first call, so `import my_bitget` does not import the transport stack."""
+    global _httpx
+    if _httpx is None:
+        import httpx
+        _httpx = httpx
+    return _httpx
+
+
+def get_ssl_context() -> 'SSLContext':
+    """
+    Returns the default SSL context shared by all clients created by the library: loading the CA bundle takes tens
+    of milliseconds, so it is done once per process instead of once per client (the context holds no connections).
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = get_httpx().create_ssl_context()
+    return _ssl_context
+
+
+def create_httpx_client(asynchrony: bool, proxy: Optional[str] = None, **kwargs: Any) -> Union['Client', 'AsyncClient']:
+    """Creates an asynchronous or a blocking httpx client (kwargs are passed to the client, e.g., limits and timeout)."""
+    httpx = get_httpx()
+    kwargs.setdefault('verify', get_ssl_context())
+    if asynchrony:
+        return httpx.AsyncClient(proxy=proxy, **kwargs)
+    return httpx.Client(proxy=proxy, **kwargs)
+
+
+async def close_httpx_client(httpx_client: Union['Client', 'AsyncClient']) -> None:
+    if hasattr(httpx_client, 'aclose'):
+        await httpx_client.aclose()
+    else:
+        httpx_client.close()
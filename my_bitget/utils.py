@@ -1,7 +1,57 @@
-async def afh(func, asynchrony, *args, **kwargs):
-    """Async Function Handler"""
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+import asyncio
+import functools
+
+
+async def afh(func, asynchrony, *args, executor: Optional[Executor] = None, **kwargs):
+    """Async Function Handler (sync functions are run on the executor if specified, so they do not block the event loop)"""
     if asynchrony:
         result = await func(*args, **kwargs)
+    elif executor is not None:
+        result = await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args, **kwargs))
     else:
         result = func(*args, **kwargs)
     return result
+
+
+async def fan_out(
+        items: Iterable[Any],
+        process: Callable[[Any], AsyncIterator[Any]],
+        concurrency: int,
+        buffer: int = 0,
+) -> AsyncIterator[Any]:
+    """
+    Processes the items (a list or any iterator) by at most `concurrency` workers taking them one by one, and yields
+    the values of every `process(item)` async iterator as soon as they are ready (in no particular order between items).
+    At most `buffer` values wait for the caller (unlimited if 0), so slow consumers slow down the workers.
+    An exception raised by `process` is raised to the caller, and the workers are cancelled when the iteration stops.
+    """
+    pending = iter(items)
+    results: asyncio.Queue = asyncio.Queue(maxsize=max(0, buffer))
+
+    async def worker() -> None:
+        try:
+            for item in pending:
+                async for value in process(item):
+                    await results.put((True, value))
+        except Exception as e:
+            await results.put((False, e))
+        await results.put(None)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, concurrency))]
+    try:
+        running = len(workers)
+        while running:
+            item = await results.get()
+            if item is None:
+                running -= 1
+                continue
+            ok, value = item
+            if not ok:
+                raise value
+            yield value
+    finally:
+        for task in workers:
+            task.cancel()
@@ -0,0 +1,282 @@
+from decimal import Decimal, InvalidOperation, ROUND_DOWN, ROUND_HALF_EVEN
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import math
+import array
+
+from .candles import get_numpy
+from .records import BalanceRecord
+
+
+def format_units(units: int, scale: int) -> str:
+    """Formats an integer number of minimal units (10 ** -scale) as an exact decimal string (e.g., 2857143, 8 -> 0.02857143)."""
+    sign = '-' if units < 0 else ''
+    digits = str(abs(int(units)))
+    if scale <= 0:
+        return f'{sign}{digits}'
+    digits = digits.rjust(scale + 1, '0')
+    return f'{sign}{digits[:-scale]}.{digits[-scale:]}'
+
+
+def _broadcast(values: Union[str, Sequence[str]], size: int) -> List[str]:
+    return [values] * size if isinstance(values, str) else list(values)
+
+
+class Conversion:
+    """
+    Result of a batch USD to native conversion: arrays aligned with the input rows
+    (NumPy arrays if NumPy is installed, `array` objects otherwise) and a list of per-row errors (None for valid rows).
+    Native amounts are kept exactly as integer numbers of minimal units (`units`, 10 ** -scale each).
+    """
+
+    __slots__ = ('usd_amounts', 'tickers', 'chains', 'prices', 'scales', 'units', 'amounts', 'errors')
+
+    def __init__(
+            self,
+            usd_amounts: Any,
+            tickers: List[str],
+            chains: List[str],
+            prices: Any,
+            scales: Any,
+            units: Any,
+            amounts: Any,
+            errors: List[Optional[Exception]],
+    ):
+        self.usd_amounts = usd_amounts
+        self.tickers = tickers
+        self.chains = chains
+        self.prices = prices
+        self.scales = scales
+        self.units = units
+        self.amounts = amounts
+        self.errors = errors
+
+    def __len__(self, ) -> int:
+        return len(self.errors)
+
+    def __repr__(self, ) -> str:
+        return f'Conversion({len(self)} rows, {self.error_count} errors)'
+
+    @property
+    def error_count(self, ) -> int:
+        return sum(error is not None for error in self.errors)
+
+    def get_amount(self, index: int) -> Optional[str]:
+        """Returns the exact native amount of the row as a decimal string (None for invalid rows)."""
+        if self.errors[index] is not None:
+            return None
+        return format_units(int(self.units[index]), int(self.scales[index]))
+
+    def to_strings(self, ) -> List[Optional[str]]:
+        return [self.get_amount(i) for i in range(len(self))]
+
+
+class Valuation:
+    """
+    Result of a portfolio valuation: tickers, amounts, USDT prices and USDT values aligned with the input balances
+    (NumPy arrays if NumPy is installed, `array` objects otherwise) and a list of per-row errors (None for valued rows).
+    """
+
+    __slots__ = ('tickers', 'amounts', 'prices', 'values', 'errors')
+
+    def __init__(self, tickers: List[str], amounts: Any, prices: Any, values: Any, errors: List[Optional[Exception]]):
+        self.tickers = tickers
+        self.amounts = amounts
+        self.prices = prices
+        self.values = values
+        self.errors = errors
+
+    def __len__(self, ) -> int:
+        return len(self.errors)
+
+    def __repr__(self, ) -> str:
+        return f'Valuation({len(self)} rows, total={self.total:.2f})'
+
+    @property
+    def total(self, ) -> float:
+        """Total value (in USDT) of all valued rows."""
+        return math.fsum(value for value, error in zip(self.values, self.errors) if error is None)
+
+    def by_ticker(self, ) -> Dict[str, float]:
+        totals: Dict[str, List[float]] = {}
+        for ticker, value, error in zip(self.tickers, self.values, self.errors):
+            if error is None:
+                totals.setdefault(ticker, []).append(float(value))
+        return {ticker: math.fsum(values) for ticker, values in totals.items()}
+
+
+def convert_usd_to_native(
+        amounts: Sequence[Union[float, str]],
+        tickers: Union[str, Sequence[str]],
+        chains: Union[str, Sequence[str]],
+        prices: Dict[str, float],
+        coins: Dict[str, dict],
+        rounding: str = 'nearest',
+) -> Conversion:
+    """
+    Converts USD amounts to native chain coin amounts rounded to the chain's withdrawMinScale.
+    Prices (by ticker) and precisions (from coins info by ticker) are resolved once per distinct (ticker, chain),
+    and the arithmetic runs over whole arrays with NumPy (or with exact Decimal arithmetic without NumPy).
+
+    :param amounts: USD amounts.
+    :param tickers: Tickers aligned with amounts (or one ticker for all rows).
+    :param chains: Bitget chain names aligned with amounts (or one chain for all rows).
+    :param prices: USDT prices by ticker (e.g., `PriceSnapshot.get_prices()`).
+    :param coins: Coins info by ticker (e.g., from `MyBitget.PUBLIC_get_coins_info`).
+    :param rounding: nearest (round half to even, like `round`) or down (never more than the USD amount).
+    """
+    size = len(amounts)
+    tickers = _broadcast(tickers, size)
+    chains = _broadcast(chains, size)
+    if len(tickers) != size or len(chains) != size:
+        raise ValueError('amounts, tickers and chains must have the same length!')
+    # Resolves the price and the precision once for every distinct (ticker, chain)
+    keys: Dict[Tuple[str, str], int] = {}
+    inverse = array.array('q', bytes(8 * size))
+    for i, key in enumerate(zip(tickers, chains)):
+        index = keys.get(key)
+        if index is None:
+            index = keys[key] = len(keys)
+        inverse[i] = index
+    key_prices = array.array('d', bytes(8 * len(keys)))
+    key_scales = array.array('q', bytes(8 * len(keys)))
+    key_errors: List[Optional[Exception]] = [None] * len(keys)
+    for (ticker, chain), index in keys.items():
+        price = 1.0 if (ticker == 'USDT') else prices.get(ticker)
+        chain_info = next((item for item in (coins.get(ticker) or {}).get('chains') or [] if str(item['chain']) == chain), None)
+        if price is None or price <= 0:
+            key_errors[index] = Exception(f'No price for {ticker}!')
+        elif chain_info is None:
+            key_errors[index] = Exception(f'No such coin or chain: {ticker} {chain}!')
+        else:
+            key_prices[index] = price
+            key_scales[index] = int(chain_info.get('withdrawMinScale') or 0)
+    errors = [key_errors[index] for index in inverse]
+    numpy = get_numpy()
+    if numpy is not None:
+        return _convert_numpy(numpy, amounts, tickers, chains, numpy.asarray(key_prices), numpy.asarray(key_scales), numpy.asarray(inverse), errors, rounding)
+    return _convert_decimal(amounts, tickers, chains, key_prices, key_scales, inverse, errors, rounding)
+
+
+def _convert_numpy(
+        numpy: Any,
+        amounts: Sequence[Union[float, str]],
+        tickers: List[str],
+        chains: List[str],
+        key_prices: Any,
+        key_scales: Any,
+        inverse: Any,
+        errors: List[Optional[Exception]],
+        rounding: str,
+) -> Conversion:
+    try:
+        usd = numpy.asarray(amounts, dtype=numpy.float64)
+    except (TypeError, ValueError):
+        usd = numpy.array([_to_float(amount) for amount in amounts], dtype=numpy.float64)
+    prices = key_prices[inverse]
+    scales = key_scales[inverse]
+    invalid = ~numpy.isfinite(usd) | (usd < 0)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        scaled = usd / prices * numpy.power(10.0, scales)
+    units = numpy.floor(scaled) if (rounding == 'down') else numpy.rint(scaled)
+    for i in numpy.flatnonzero(invalid):
+        if errors[i] is None:
+            errors[i] = Exception(f'Invalid amount: {amounts[i]}!')
+    failed = numpy.array([error is not None for error in errors], dtype=bool)
+    # A float result within a few ulps of a rounding boundary (a whole unit for down, a half for nearest) may be on
+    # the wrong side of it (e.g., 2857142.9999999995 for exactly 2857143), so such rows are computed exactly in Decimal
+    with numpy.errstate(invalid='ignore'):
+        fraction = scaled - numpy.floor(scaled)
+        distance = numpy.minimum(fraction, 1 - fraction) if (rounding == 'down') else numpy.abs(fraction - 0.5)
+        near = numpy.isfinite(scaled) & ~failed & (distance <= 64 * numpy.spacing(numpy.abs(scaled)))
+    mode = ROUND_DOWN if (rounding == 'down') else ROUND_HALF_EVEN
+    for i in numpy.flatnonzero(near):
+        units[i] = _get_units(Decimal(str(amounts[i])), Decimal(repr(float(prices[i]))), int(scales[i]), mode)
+    units = numpy.where(failed, 0, units).astype(numpy.int64)
+    native = numpy.where(failed, numpy.nan, units / numpy.power(10.0, scales))
+    return Conversion(usd, tickers, chains, numpy.where(failed, numpy.nan, prices), scales, units, native, errors)
+
+
+def _convert_decimal(
+        amounts: Sequence[Union[float, str]],
+        tickers: List[str],
+        chains: List[str],
+        key_prices: array.array,
+        key_scales: array.array,
+        inverse: array.array,
+        errors: List[Optional[Exception]],
+        rounding: str,
+) -> Conversion:
+    size = len(amounts)
+    mode = ROUND_DOWN if (rounding == 'down') else ROUND_HALF_EVEN
+    usd = array.array('d', bytes(8 * size))
+    prices = array.array('d', [math.nan] * size)
+    scales = array.array('q', bytes(8 * size))
+    units = array.array('q', bytes(8 * size))
+    native = array.array('d', [math.nan] * size)
+    decimal_prices = [Decimal(repr(price)) for price in key_prices]
+    for i in range(size):
+        index = inverse[i]
+        scales[i] = key_scales[index]
+        usd[i] = _to_float(amounts[i])
+        if errors[i] is not None:
+            continue
+        try:
+            amount = Decimal(str(amounts[i]))
+        except InvalidOperation:
+            amount = Decimal('NaN')
+        if not amount.is_finite() or amount < 0:
+            errors[i] = Exception(f'Invalid amount: {amounts[i]}!')
+            continue
+        units[i] = _get_units(amount, decimal_prices[index], scales[i], mode)
+        prices[i] = key_prices[index]
+        native[i] = units[i] / 10 ** scales[i]
+    return Conversion(usd, tickers, chains, prices, scales, units, native, errors)
+
+
+def _get_units(amount: Decimal, price: Decimal, scale: int, mode: str) -> int:
+    return int((amount / price).scaleb(scale).to_integral_value(rounding=mode))
+
+
+def value_balances(
+        balances: Iterable[Union[dict, BalanceRecord]],
+        prices: Dict[str, float],
+        fields: Sequence[str] = ('available', 'frozen', 'locked'),
+) -> Valuation:
+    """
+    Values balances (dicts from `SPOT_get_balance`/`SUBACCOUNT_get_balance` or `BalanceRecord` objects) in USDT.
+
+    :param balances: Balances with a coin and amount fields.
+    :param prices: USDT prices by ticker (e.g., `PriceSnapshot.get_prices()`).
+    :param fields: Amount fields summed for every balance (e.g., only available).
+    """
+    tickers = []
+    amounts = []
+    for balance in balances:
+        if isinstance(balance, BalanceRecord):
+            tickers.append(balance.coin)
+            amounts.append(sum(float(getattr(balance, field, 0.0) or 0.0) for field in fields))
+        else:
+            tickers.append(balance['coin'])
+            amounts.append(sum(_to_float(balance.get(field) or 0) for field in fields))
+    errors: List[Optional[Exception]] = []
+    row_prices = []
+    for ticker in tickers:
+        price = 1.0 if (ticker == 'USDT') else prices.get(ticker)
+        row_prices.append(math.nan if (price is None) else price)
+        errors.append(None if (price is not None) else Exception(f'No price for {ticker}!'))
+    numpy = get_numpy()
+    if numpy is not None:
+        amounts = numpy.asarray(amounts, dtype=numpy.float64)
+        row_prices = numpy.asarray(row_prices, dtype=numpy.float64)
+        return Valuation(tickers, amounts, row_prices, amounts * row_prices, errors)
+    amounts = array.array('d', amounts)
+    row_prices = array.array('d', row_prices)
+    return Valuation(tickers, amounts, row_prices, array.array('d', [amount * price for amount, price in zip(amounts, row_prices)]), errors)
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
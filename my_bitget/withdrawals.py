@@ -0,0 +1,173 @@
+from logging import Logger
+from typing import Any, Callable, Dict, Optional, Tuple, Union, TYPE_CHECKING
+
+import asyncio
+
+if TYPE_CHECKING:
+    from .mybitget import MyBitget
+
+
+class WithdrawalTracker:
+    """
+    Tracks many withdrawals with a single background poller.
+
+    Withdrawals are registered by the (timestamp, order_id) tuples returned by `SPOT_post_withdrawal`.
+    Every poll cycle requests withdrawal records once for the whole time range of pending withdrawals
+    (walking through pages if needed) and resolves all tracked withdrawals found in the response.
+    Each tracked withdrawal gets a future resolving to (0, record) on success or (-1, Exception) on failure.
+    Errors of a poll cycle and of callbacks never stop the poller: failed cycles count toward `max_errors`,
+    and callback exceptions are logged.
+    """
+
+    success_statuses = ('success', )
+    failure_statuses = ('fail', 'failed', 'reject', 'rejected', 'cancel', 'canceled')
+
+    def __init__(
+            self,
+            client: 'MyBitget',
+            min_interval: float = 5.0,
+            max_interval: float = 60.0,
+            limit: int = 100,
+            max_errors: int = 10,
+            logger: Optional[Logger] = None,
+    ):
+        """
+        :param client: MyBitget instance used for requests.
+        :param min_interval: Poll interval in seconds while a single page covers all pending withdrawals.
+        :param max_interval: Maximum poll interval in seconds.
+        :param limit: Number of records per page (maximum is 100).
+        :param max_errors: Number of consecutive failed poll cycles after which all pending withdrawals are failed.
+        :param logger: Logger object (used to log callback errors).
+        """
+        self._client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.limit = limit
+        self.max_errors = max_errors
+        self.polls = 0
+        self.requests = 0
+        self.callback_errors = 0
+        self._logger = logger
+        self._pending: Dict[str, Tuple[int, asyncio.Future, Optional[Callable]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self, ) -> int:
+        return len(self._pending)
+
+    @property
+    def interval(self, ) -> float:
+        """Current poll interval: grows with the number of pages needed to cover all pending withdrawals."""
+        pages = 1 + len(self._pending) // self.limit
+        return min(self.max_interval, self.min_interval * pages)
+
+    def track(
+            self,
+            withdrawal: Tuple[str, str],
+            callback: Optional[Callable[[str, int, Union[dict, Exception]], Any]] = None,
+    ) -> asyncio.Future:
+        """
+        Starts tracking the withdrawal by the (timestamp, order_id) tuple and returns the future of its result.
+        The optional callback is called with (order_id, status, result) when the withdrawal is completed.
+        """
+        timestamp, order_id = withdrawal
+        order_id = str(order_id)
+        if order_id in self._pending:
+            return self._pending[order_id][1]
+        future = asyncio.get_running_loop().create_future()
+        self._pending[order_id] = (int(timestamp), future, callback)
+        self._ensure_running()
+        return future
+
+    async def wait(self, withdrawal: Tuple[str, str], timeout: Optional[float] = None) -> Tuple[int, Union[dict, Exception]]:
+        """Tracks the withdrawal and waits for its result."""
+        try:
+            return await asyncio.wait_for(asyncio.shield(self.track(withdrawal)), timeout)
+        except asyncio.TimeoutError:
+            return -1, Exception(f'Withdrawal {withdrawal[1]} is not completed in {timeout}s!')
+
+    def untrack(self, order_id: str) -> None:
+        entry = self._pending.pop(str(order_id), None)
+        if entry is not None and not entry[1].done():
+            entry[1].cancel()
+
+    async def stop(self, ) -> None:
+        """Stops the poller and cancels all pending futures."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for order_id in list(self._pending):
+            self.untrack(order_id)
+
+    def _ensure_running(self, ) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self, ) -> None:
+        errors = 0
+        while self._pending:
+            try:
+                status, result = await self._poll()
+            except Exception as e:
+                # An unexpected response must not kill the poller: the cycle counts as failed
+                status, result = -1, Exception(f'WithdrawalTracker | {e}')
+            if status == 0:
+                errors = 0
+            else:
+                errors += 1
+                if errors >= self.max_errors:
+                    for order_id in list(self._pending):
+                        self._resolve(order_id, -1, Exception(f'Withdrawal tracking failed: {result}'))
+                    return
+            if not self._pending:
+                return
+            await asyncio.sleep(self.interval)
+
+    async def _poll(self, ) -> Tuple[int, Union[int, Exception]]:
+        """Requests records for the time range of all pending withdrawals and resolves the found ones."""
+        self.polls += 1
+        time_start = str(min(timestamp for timestamp, _, _ in self._pending.values()) - 1000)
+        time_end = self._client.time
+        id_less_than = None
+        resolved = 0
+        while self._pending:
+            self.requests += 1
+            status, result = await self._client.SPOT_get_withdrawal_records(
+                time_start=time_start,
+                time_end=time_end,
+                id_less_than=id_less_than,
+                limit=self.limit,
+            )
+            if status != 0:
+                return status, result
+            for record in result:
+                order_id = str(record.get('orderId'))
+                if order_id not in self._pending:
+                    continue
+                record_status = str(record.get('status')).lower()
+                if record_status in self.success_statuses:
+                    self._resolve(order_id, 0, record)
+                    resolved += 1
+                elif record_status in self.failure_statuses:
+                    self._resolve(order_id, -1, Exception(f'Withdrawal {order_id} failed with status {record_status}!'))
+                    resolved += 1
+            if len(result) < self.limit:
+                break
+            id_less_than = result[-1]['orderId']
+        return 0, resolved
+
+    def _resolve(self, order_id: str, status: int, result: Union[dict, Exception]) -> None:
+        _, future, callback = self._pending.pop(order_id)
+        if not future.done():
+            future.set_result((status, result))
+        if callback is not None:
+            try:
+                callback(order_id, status, result)
+            except Exception:
+                self.callback_errors += 1
+                if self._logger is not None:
+                    self._logger.exception(f'WithdrawalTracker | Callback for withdrawal {order_id} failed')